@@ -0,0 +1,72 @@
+from django.utils.translation import gettext_lazy as _
+
+from connection.models import Attachment, Counterparty
+from credit.models import Credit
+from medical.models import MedCard, Medicine, MedicalVisit, HealthTestResult
+from payment.models import Payment
+from planner.models import ExpenseList, ToDoList
+from renovation.models import Renovation
+from trip.models import Trip
+
+# Sections of shared data page (see load_shared_data)
+SECTIONS = ("payments", "planner", "medical")
+
+# Related records shown together with shared records (prefetched in one
+# query for all records instead of one query for each record)
+PREFETCHED = {
+    Trip: ("tripbasicchecklist_set", "tripadvancedchecklist_set",
+           "tripcost_set", "tripreport_set"),
+    Renovation: ("renovationcost_set",),
+    ExpenseList: ("expenseitem_set",),
+    ToDoList: ("todoitem_set",),
+}
+
+
+def shared(model, user):
+    """Records of model shared by user (the most recently updated first)
+    with prefetched related records."""
+    return (model.objects.filter(user=user, access_granted=_("Udostępnij dane"))
+            .prefetch_related(*PREFETCHED.get(model, ()))
+            .order_by("-updated"))
+
+
+def load_shared_data(user, sections=SECTIONS) -> dict:
+    """Returns data shared by user in given sections of shared data page.
+
+    Number of queries does not depend on number of shared records: medical
+    card is loaded with all its access flags in one query, other models in
+    one query each (plus one query for each prefetched relation). Querysets
+    are not evaluated here, so when they are paginated only records of
+    current page are loaded (and related records prefetched for them)."""
+    data = {}
+    if "payments" in sections:
+        data["credits"] = shared(Credit, user)
+        data["credit_schedules"] = (
+            Credit.objects.filter(user=user,
+                                  access_granted_for_schedule=_("Udostępnij dane"))
+            .order_by("-updated"))
+        data["payments"] = shared(Payment, user)
+        data["counterparties"] = shared(Counterparty, user)
+        data["attachments"] = shared(Attachment, user)
+
+    if "planner" in sections:
+        data["trips"] = shared(Trip, user)
+        data["renovations"] = shared(Renovation, user)
+        data["expense_lists"] = shared(ExpenseList, user)
+        data["todo_lists"] = shared(ToDoList, user)
+
+    if "medical" in sections:
+        # Medical records are shared by access flags of medical card
+        medcard = MedCard.objects.filter(user=user).first()
+
+        def granted(flag):
+            return medcard is not None and getattr(medcard, flag) == _("Udostępnij dane")
+
+        data["medcard"] = medcard if granted("access_granted") else None
+        data["medicines"] = (Medicine.objects.filter(user=user)
+                             if granted("access_granted_medicines") else None)
+        data["med_visits"] = (MedicalVisit.objects.filter(user=user)
+                              if granted("access_granted_visits") else None)
+        data["med_results"] = (HealthTestResult.objects.filter(user=user)
+                               if granted("access_granted_test_results") else None)
+    return data
@@ -1,7 +1,9 @@
 import logging
 
 from django.contrib.auth import get_user_model
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from django.utils.translation import gettext_lazy as _
 
@@ -950,3 +952,97 @@ class AccessTests(TestCase):
         self.assertNotIn(str(self.user),
                          response_redirect.content.decode())
         self.assertNotIn("_auth_user_id", self.client.session)
+
+
+class SharedDataQueriesTests(TestCase):
+    """Test if number of queries of shared data pages does not depend on
+    number of shared records."""
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="johndoe123", email="user@example.com", password="testpass456")
+        self.profile = Profile.objects.get(user=self.user)
+        self.profile.access_granted_to = "test@example.com"
+        self.profile.save()
+        self.test_user = User.objects.create_user(
+            username="testuser123", email="test@example.com", password="testpass456")
+        MedCardFactory(
+            user=self.user,
+            access_granted=Access.ACCESS_GRANTED,
+            access_granted_medicines=Access.ACCESS_GRANTED,
+            access_granted_test_results=Access.ACCESS_GRANTED,
+            access_granted_visits=Access.NO_ACCESS_GRANTED,
+        )
+        self.records = 0
+
+    def add_shared_records(self):
+        self.records += 1
+        number = self.records
+        CreditFactory(user=self.user, name=f"Credit {number}",
+                      access_granted=Access.ACCESS_GRANTED,
+                      access_granted_for_schedule=Access.ACCESS_GRANTED)
+        PaymentFactory(user=self.user, name=f"Payment {number}",
+                       access_granted=Access.ACCESS_GRANTED)
+        trip = TripFactory(user=self.user, name=f"Trip {number}",
+                           access_granted=Access.ACCESS_GRANTED)
+        TripBasicFactory(user=self.user, trip=trip)
+        TripAdvancedFactory(user=self.user, trip=trip)
+        renovation = RenovationFactory(user=self.user, name=f"Renovation {number}",
+                                       access_granted=Access.ACCESS_GRANTED)
+        RenovationCostFactory(user=self.user, renovation=renovation)
+        expense_list = ExpenseListFactory(user=self.user, name=f"Expenses {number}",
+                                          access_granted=Access.ACCESS_GRANTED)
+        ExpenseItemFactory(user=self.user, expense_list=expense_list)
+        todo_list = ToDoListFactory(user=self.user, name=f"To do {number}",
+                                    access_granted=Access.ACCESS_GRANTED)
+        ToDoItemFactory(user=self.user, todo_list=todo_list)
+        MedicineFactory(user=self.user, drug_name_and_dose=f"Medicine {number}")
+
+    def count_queries(self, page):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse(page, kwargs={"slug": self.profile.slug,
+                                                             "page": 1}))
+        self.assertEqual(response.status_code, 200)
+        return len(queries)
+
+    def test_number_of_queries_fixed(self):
+        """Test if each page runs the same number of queries for one and
+        for many shared records of each model."""
+        self.client.force_login(self.test_user)
+        pages = ("access:data-access", "access:data-access-payments",
+                 "access:data-access-planner", "access:data-access-medical")
+        self.add_shared_records()
+        queries = {page: self.count_queries(page) for page in pages}
+        for n in range(3):
+            self.add_shared_records()
+        for page in pages:
+            self.assertEqual(self.count_queries(page), queries[page], page)
+
+    def test_only_records_of_current_page_loaded(self):
+        """Test if shared credits are paginated in database query."""
+        for n in range(4):
+            self.add_shared_records()
+        self.client.force_login(self.test_user)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse("access:data-access-payments",
+                                               kwargs={"slug": self.profile.slug,
+                                                       "page": 2}))
+        self.assertEqual(len(response.context["page_object_credits"]), 1)
+        credit_queries = [query["sql"] for query in queries
+                          if 'FROM "credit_credit"' in query["sql"]]
+        self.assertTrue(credit_queries)
+        for sql in credit_queries:
+            self.assertTrue("COUNT(" in sql or "LIMIT" in sql, sql)
+
+    def test_shared_data_of_medical_card(self):
+        """Test if medical records are shared according to flags of
+        medical card."""
+        self.add_shared_records()
+        MedicalVisitFactory(user=self.user)
+        self.client.force_login(self.test_user)
+        response = self.client.get(reverse("access:data-access-medical",
+                                           kwargs={"slug": self.profile.slug, "page": 1}))
+        self.assertIsNotNone(response.context["medcard"])
+        self.assertEqual(len(response.context["page_object_medicines"]), 1)
+        self.assertIsNotNone(response.context["page_object_med_results"])
+        self.assertIsNone(response.context["page_object_med_visits"])
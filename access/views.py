@@ -8,14 +8,7 @@ from django.shortcuts import render, redirect, get_object_or_404
 from django.utils.translation import gettext_lazy as _
 
 from user.models import Profile
-from payment.models import Payment
-from connection.models import Attachment, Counterparty
-from credit.models import Credit
-from trip.models import (Trip, TripReport, TripBasicChecklist, TripAdvancedChecklist,
-                         TripAdditionalInfo, TripCost, TripPersonalChecklist)
-from renovation.models import Renovation, RenovationCost
-from planner.models import ExpenseList, ExpenseItem, ToDoList, ToDoItem
-from medical.models import MedCard, Medicine, MedicalVisit, HealthTestResult
+from .shared_data import load_shared_data
 
 logger = logging.getLogger("all")
 
@@ -53,61 +46,24 @@ def access_to_models(request, slug, page):
         logout(request)
         return redirect("login")
 
-    credits = Credit.objects.filter(user=profile.user).filter(
-        access_granted=_("Udostępnij dane")).order_by("-updated")
-    credit_schedules = Credit.objects.filter(user=profile.user).filter(
-        access_granted_for_schedule=_("Udostępnij dane")).order_by("-updated")
-    payments = Payment.objects.filter(user=profile.user).filter(
-        access_granted=_("Udostępnij dane")).order_by("-updated")
-    counterparties = Counterparty.objects.filter(user=profile.user).filter(
-        access_granted=_("Udostępnij dane")).order_by("-updated")
-    attachments = Attachment.objects.filter(user=profile.user).filter(
-        access_granted=_("Udostępnij dane")).order_by("-updated")
-    trips = Trip.objects.filter(user=profile.user).filter(
-        access_granted=_("Udostępnij dane")).order_by("-updated")
-    renovations = Renovation.objects.filter(user=profile.user).filter(
-        access_granted=_("Udostępnij dane")).order_by("-updated")
-    expense_lists = ExpenseList.objects.filter(user=profile.user).filter(
-        access_granted=_("Udostępnij dane")).order_by("-updated")
-    todo_lists = ToDoList.objects.filter(user=profile.user).filter(
-        access_granted=_("Udostępnij dane")).order_by("-updated")
-
-    try:
-        medcard = MedCard.objects.get(user=profile.user, access_granted=_("Udostępnij dane"))
-    except MedCard.DoesNotExist:
-        medcard = None
-    try:
-        MedCard.objects.get(user=profile.user, access_granted_medicines=_("Udostępnij dane"))
-        medicines = Medicine.objects.filter(user=profile.user)
-    except MedCard.DoesNotExist or Medicine.DoesNotExist:
-        medicines = None
-    try:
-        MedCard.objects.get(user=profile.user, access_granted_visits=_("Udostępnij dane"))
-        med_visits = MedicalVisit.objects.filter(user=profile.user)
-    except MedCard.DoesNotExist or MedicalVisit.DoesNotExist:
-        med_visits = None
-    try:
-        MedCard.objects.get(user=profile.user, access_granted_test_results=_("Udostępnij dane"))
-        med_results = HealthTestResult.objects.filter(user=profile.user)
-    except MedCard.DoesNotExist or HealthTestResult.DoesNotExist:
-        med_results = None
+    data = load_shared_data(profile.user)
 
     context = {
         "page_name": page_name,
         "slug": profile.slug,
-        "page_object_credits": credits,
-        "credit_schedules": credit_schedules,
-        "page_object_payments": payments,
-        "page_object_counterparties": counterparties,
-        "page_object_attachments": attachments,
-        "page_object_trips": trips,
-        "page_object_renovations": renovations,
-        "page_object_expense_lists": expense_lists,
-        "page_object_todo_lists": todo_lists,
-        "medcard": medcard,
-        "page_object_medicines": medicines,
-        "page_object_med_visits": med_visits,
-        "page_object_med_results": med_results,
+        "page_object_credits": data["credits"],
+        "credit_schedules": data["credit_schedules"],
+        "page_object_payments": data["payments"],
+        "page_object_counterparties": data["counterparties"],
+        "page_object_attachments": data["attachments"],
+        "page_object_trips": data["trips"],
+        "page_object_renovations": data["renovations"],
+        "page_object_expense_lists": data["expense_lists"],
+        "page_object_todo_lists": data["todo_lists"],
+        "medcard": data["medcard"],
+        "page_object_medicines": data["medicines"],
+        "page_object_med_visits": data["med_visits"],
+        "page_object_med_results": data["med_results"],
     }
     return render(request, "access/data_access.html", context)
 
@@ -127,21 +83,12 @@ def access_to_payments(request, slug, page):
         logout(request)
         return redirect("login")
 
-    credits = Credit.objects.filter(user=profile.user).filter(
-        access_granted=_("Udostępnij dane")).order_by("-updated")
-    credit_schedules = Credit.objects.filter(user=profile.user).filter(
-        access_granted_for_schedule=_("Udostępnij dane")).order_by("-updated")
-    payments = Payment.objects.filter(user=profile.user).filter(
-        access_granted=_("Udostępnij dane")).order_by("-updated")
-    counterparties = Counterparty.objects.filter(user=profile.user).filter(
-        access_granted=_("Udostępnij dane")).order_by("-updated")
-    attachments = Attachment.objects.filter(user=profile.user).filter(
-        access_granted=_("Udostępnij dane")).order_by("-updated")
-
-    paginator_credits = Paginator(credits, per_page=3)
-    paginator_payments = Paginator(payments, per_page=3)
-    paginator_counterparties = Paginator(counterparties, per_page=3)
-    paginator_attachments = Paginator(attachments, per_page=3)
+    data = load_shared_data(profile.user, sections=("payments",))
+
+    paginator_credits = Paginator(data["credits"], per_page=3)
+    paginator_payments = Paginator(data["payments"], per_page=3)
+    paginator_counterparties = Paginator(data["counterparties"], per_page=3)
+    paginator_attachments = Paginator(data["attachments"], per_page=3)
     page_object_credits = paginator_credits.get_page(page)
     page_object_payments = paginator_payments.get_page(page)
     page_object_counterparties = paginator_counterparties.get_page(page)
@@ -173,24 +120,15 @@ def access_to_planner(request, slug, page):
         logout(request)
         return redirect("login")
 
-    trips = Trip.objects.filter(user=profile.user).filter(
-        access_granted=_("Udostępnij dane")).order_by("-updated")
-    renovations = Renovation.objects.filter(user=profile.user).filter(
-        access_granted=_("Udostępnij dane")).order_by("-updated")
-    expense_lists = ExpenseList.objects.filter(user=profile.user).filter(
-        access_granted=_("Udostępnij dane")).order_by(
-        "-updated")
-    todo_lists = ToDoList.objects.filter(user=profile.user).filter(
-        access_granted=_("Udostępnij dane")).order_by(
-        "-updated")
+    data = load_shared_data(profile.user, sections=("planner",))
 
     context = {
         "page_name": page_name,
         "slug": profile.slug,
-        "page_object_trips": trips,
-        "page_object_renovations": renovations,
-        "page_object_expense_lists": expense_lists,
-        "page_object_todo_lists": todo_lists,
+        "page_object_trips": data["trips"],
+        "page_object_renovations": data["renovations"],
+        "page_object_expense_lists": data["expense_lists"],
+        "page_object_todo_lists": data["todo_lists"],
     }
     return render(request, "access/data_access.html", context)
 
@@ -210,36 +148,14 @@ def access_to_medical(request, slug, page):
         logout(request)
         return redirect("login")
 
-    try:
-        medcard = MedCard.objects.get(user=profile.user,
-                                      access_granted=_("Udostępnij dane"))
-    except MedCard.DoesNotExist:
-        medcard = None
-    try:
-        MedCard.objects.get(user=profile.user,
-                            access_granted_medicines=_("Udostępnij dane"))
-        medicines = Medicine.objects.filter(user=profile.user)
-    except MedCard.DoesNotExist or Medicine.DoesNotExist:
-        medicines = None
-    try:
-        MedCard.objects.get(user=profile.user,
-                            access_granted_visits=_("Udostępnij dane"))
-        med_visits = MedicalVisit.objects.filter(user=profile.user)
-    except MedCard.DoesNotExist or MedicalVisit.DoesNotExist:
-        med_visits = None
-    try:
-        MedCard.objects.get(user=profile.user,
-                            access_granted_test_results=_("Udostępnij dane"))
-        med_results = HealthTestResult.objects.filter(user=profile.user)
-    except MedCard.DoesNotExist or HealthTestResult.DoesNotExist:
-        med_results = None
+    data = load_shared_data(profile.user, sections=("medical",))
 
     context = {
         "page_name": page_name,
         "slug": profile.slug,
-        "medcard": medcard,
-        "page_object_medicines": medicines,
-        "page_object_med_visits": med_visits,
-        "page_object_med_results": med_results,
+        "medcard": data["medcard"],
+        "page_object_medicines": data["medicines"],
+        "page_object_med_visits": data["med_visits"],
+        "page_object_med_results": data["med_results"],
     }
     return render(request, "access/data_access.html", context)
@@ -4,6 +4,8 @@ import shutil
 import uuid
 
 from django.conf import settings
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVector
 from django.core.exceptions import ValidationError
 from django.core.validators import FileExtensionValidator, RegexValidator
 from django.db import models
@@ -112,6 +114,13 @@ class Counterparty(models.Model):
         constraints = [
             models.UniqueConstraint(fields=["user", "name"], name="unique_cp_name")
         ]
+        indexes = [
+            models.Index(fields=["user", "-updated"], name="counterparty_user_updated_idx"),
+            models.Index(fields=["user", "access_granted", "-updated"],
+                         name="counterparty_user_access_idx"),
+            GinIndex(SearchVector("name", config=settings.SEARCH_CONFIG),
+                     name="counterparty_search_idx"),
+        ]
 
     @classmethod
     def field_names(cls) -> list:
@@ -241,6 +250,11 @@ class Attachment(models.Model):
                 fields=["user", "attachment_name"], name="unique_attachment_name"
             )
         ]
+        indexes = [
+            models.Index(fields=["user", "-updated"], name="attachment_user_updated_idx"),
+            models.Index(fields=["user", "access_granted", "-updated"],
+                         name="attachment_user_access_idx"),
+        ]
 
     @classmethod
     def field_names(cls) -> list:
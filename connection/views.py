@@ -19,6 +19,7 @@ from .handlers import (
     is_number_of_attachments_valid
 )
 from user.models import Profile
+from search.engine import search
 
 logger = logging.getLogger("all")
 User = get_user_model()
@@ -45,12 +46,12 @@ def counterparties(request):
     except Counterparty.DoesNotExist:
         all_counterparties = None
 
-    # Searching engine - search by name or value of estimated cost (gte)
+    # Searching engine - search by name
     # If search engine is empty, queryset data is displayed in full
     search_query = request.GET.get("q")
     if search_query:
-        counterparties = Counterparty.objects.filter(
-            user=request.user).filter(name__icontains=search_query).order_by(order)
+        counterparties = search(all_counterparties, search_query,
+                                ordered_by_user="sort_data" in request.GET)
     else:
         counterparties = None
     if not counterparties:
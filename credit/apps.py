@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class CreditConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "credit"
+
+    def ready(self):
+        import credit.signals
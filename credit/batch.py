@@ -0,0 +1,105 @@
+from __future__ import annotations
+import dataclasses
+from concurrent.futures import ProcessPoolExecutor
+
+import django
+
+from .models import Credit
+from .schedule_cache import CACHED_SCHEDULE_RESULTS, schedule_version
+from .snapshot import credit_snapshot_queryset, snapshot_from_credit
+
+
+@dataclasses.dataclass(frozen=True)
+class PortfolioSchedule:
+    """Repayment schedules of many credits (credit id: CreditSchedule) with
+    portfolio totals calculated separately for each currency."""
+    schedules: dict
+    totals: dict
+
+    def tables(self) -> dict:
+        """Schedule table of each credit (credit id: table)."""
+        return {credit_id: schedule.credit_table()
+                for credit_id, schedule in self.schedules.items()}
+
+
+def _schedule_results(snapshot, cache_version) -> dict:
+    """Calculates results of single schedule (run in worker process)."""
+    from .views import CreditSchedule
+
+    schedule = CreditSchedule(None, snapshot.credit.id, snapshot=snapshot,
+                              cache_version=cache_version)
+    return {name: getattr(schedule, name)() for name in CACHED_SCHEDULE_RESULTS}
+
+
+TOTAL_COLUMNS = ("Otrzymana kwota kredytu", "Łączna rata odsetkowa",
+                 "Razem płatność", "Razem poniesione koszty")
+
+
+def portfolio_totals(schedules) -> dict:
+    """Returns totals of schedules for each currency (currency: totals).
+    XIRR is weighted by credit amount received, credits without XIRR
+    are omitted."""
+    totals = {}
+    xirr_weights = {}
+    for schedule in schedules:
+        currency = schedule.credit.currency
+        columns = schedule.sum_for_table_columns()
+        currency_totals = totals.setdefault(
+            currency, {"Liczba kredytów": 0, **dict.fromkeys(TOTAL_COLUMNS, 0)})
+        currency_totals["Liczba kredytów"] += 1
+        for column in TOTAL_COLUMNS:
+            currency_totals[column] += columns[column]
+        if schedule.xirr() is not None:
+            weight, weighted_xirr = xirr_weights.get(currency, (0, 0))
+            amount = columns["Otrzymana kwota kredytu"]
+            xirr_weights[currency] = (weight + amount,
+                                      weighted_xirr + schedule.xirr() * amount)
+
+    for currency, currency_totals in totals.items():
+        for column in TOTAL_COLUMNS:
+            currency_totals[column] = round(currency_totals[column], 2)
+        weight, weighted_xirr = xirr_weights.get(currency, (0, 0))
+        currency_totals["Ważony XIRR (%)"] = (round(weighted_xirr / weight * 100, 2)
+                                              if weight else "n/a")
+    return totals
+
+
+def calculate_credit_schedules(credits, processes=None) -> PortfolioSchedule:
+    """Calculates repayment schedules of all credits from given queryset
+    (e.g. all credits of user or credits shared by profile).
+
+    Credits with all related records are loaded in fixed number of queries.
+    Schedules found in cache are not calculated again, the remaining ones
+    are calculated in current process or - if processes > 1 - spread over
+    pool of processes, and then stored in cache."""
+    from .views import CreditSchedule
+
+    credit_ids = list(credits.values_list("id", flat=True))
+    # Versions read before credit data (see CreditSchedule)
+    versions = {credit_id: schedule_version(credit_id) for credit_id in credit_ids}
+    loaded = {credit.id: credit for credit in credit_snapshot_queryset(
+        Credit.objects.filter(id__in=credit_ids))}
+    schedules = {
+        credit_id: CreditSchedule(None, credit_id,
+                                  snapshot=snapshot_from_credit(loaded[credit_id]),
+                                  cache_version=versions[credit_id])
+        for credit_id in credit_ids if credit_id in loaded
+    }
+
+    pending = [schedule for schedule in schedules.values() if not schedule.from_cache]
+    if processes and processes > 1 and len(pending) > 1:
+        with ProcessPoolExecutor(max_workers=min(processes, len(pending)),
+                                 initializer=django.setup) as executor:
+            results = executor.map(
+                _schedule_results,
+                [schedule.snapshot for schedule in pending],
+                [schedule.cache_version for schedule in pending])
+            for schedule, result in zip(pending, results):
+                schedule.set_results(result)
+    for schedule in pending:
+        schedule.cache_schedule()
+
+    return PortfolioSchedule(
+        schedules=schedules,
+        totals=portfolio_totals(schedules.values()),
+    )
@@ -0,0 +1,406 @@
+from __future__ import annotations
+import datetime
+import functools
+import math
+
+import numpy as np
+
+EPOCH_ORDINAL = datetime.date(1970, 1, 1).toordinal()
+
+# Limits of XIRR solver (see solve_xirr)
+XIRR_MAX_ITERATIONS = 100
+XIRR_TOLERANCE = 1e-9
+
+# Columns of amortization_kernel results
+KERNEL_RESULTS = ("interest installment", "capital installment",
+                  "total installment", "credit balance", "early repayment")
+
+
+# Money amounts are calculated by amortization_kernel in whole grosze
+# (hundredths of currency unit) - exact and deterministic sums of integers,
+# rounding only when interest of period is calculated
+MONEY_SCALE = 100
+
+
+def round_grosze(amount: float) -> int:
+    """Rounds amount (in grosze) to whole grosze, half away from zero."""
+    if amount < 0:
+        return -math.floor(-amount + 0.5)
+    return math.floor(amount + 0.5)
+
+
+def to_grosze(values) -> np.ndarray:
+    """Converts money amounts (floats, Decimals) to int64 array of grosze
+    (rounded half away from zero)."""
+    amounts = np.asarray(values, dtype=float) * MONEY_SCALE
+    return (np.sign(amounts) * np.floor(np.abs(amounts) + 0.5)).astype(np.int64)
+
+
+def from_grosze(values) -> list:
+    """Converts amounts in grosze to money amounts (None values kept)."""
+    return [None if value is None else value / MONEY_SCALE for value in values]
+
+
+def is_leap_year(years: np.ndarray) -> np.ndarray:
+    """Vectorized calendar.isleap."""
+    return (years % 4 == 0) & ((years % 100 != 0) | (years % 400 == 0))
+
+
+@functools.lru_cache(maxsize=1024)
+def payment_calendar(start: datetime.date, months: int, periods: int,
+                     day: int) -> np.ndarray:
+    """Returns read-only datetime64[D] array of payment dates of periods
+    following start date (start date excluded), every given number of months:
+    - for day 1-31 - at given day of month (last day of month if month is
+      shorter), the same as start + relativedelta(months=months*i, day=day),
+    - for day 0 - at the last day of month preceding the month of
+      start + months*i (the last day of month in which period ends).
+    Calendars are cached, so credits and insurances with the same terms
+    share them."""
+    offsets = np.arange(1, periods + 1, dtype=np.int64) * months
+    start_month = np.datetime64(start.replace(day=1).isoformat(), "M")
+    if day == 0:
+        calendar = (start_month + offsets).astype("datetime64[D]") - 1
+    else:
+        month_starts = (start_month + offsets).astype("datetime64[D]")
+        month_lengths = ((start_month + offsets + 1).astype("datetime64[D]")
+                         - month_starts).astype(np.int64)
+        calendar = month_starts + (np.minimum(day, month_lengths) - 1)
+    calendar.flags.writeable = False
+    return calendar
+
+
+def day_count_periods(dates: list) -> dict:
+    """Returns arrays describing periods between consecutive cash flow dates
+    (ACT/ACT day count convention).
+    For each date (except for the first one) the period since previous date
+    is split at the turn of the year into:
+    - "days" - all days in period,
+    - "previous year days" - days from previous date till the end of its year
+       (including the last day of the year),
+    - "current year days" - days from the beginning of the following year
+       till the current date,
+    - "previous leap", "current leap" - leap year flags of both dates."""
+    # Conversion through ordinals is much faster than parsing date objects
+    days = np.array([date.toordinal() - EPOCH_ORDINAL for date in dates],
+                    dtype=np.int64).astype("datetime64[D]")
+    years = days.astype("datetime64[Y]").astype(np.int64) + 1970
+    previous_days = np.roll(days, 1)
+    previous_years = np.roll(years, 1)
+    # First date has no previous period
+    previous_days[:1] = days[:1]
+    previous_years[:1] = years[:1]
+    next_year_start = (previous_years + 1 - 1970).astype("datetime64[Y]").astype("datetime64[D]")
+
+    period = (days - previous_days).astype(np.int64)
+    previous_year_days = (next_year_start - previous_days).astype(np.int64)
+    current_year_days = (days - next_year_start).astype(np.int64)
+    return {
+        "days": period,
+        "previous year days": previous_year_days,
+        "current year days": current_year_days,
+        "previous leap": is_leap_year(previous_years),
+        "current leap": is_leap_year(years),
+    }
+
+
+def amortization_kernel(
+        dates: list,
+        payments_from_bank: list,
+        early_repayments: list,
+        interest_rates: list,
+        capital_installments: list,
+        total_installments: list,
+        installment_dates: set,
+        initial_date: datetime.date,
+        initial_balance: float,
+        start_of_credit: datetime.date,
+        decreasing_installments: bool,
+        trace: list | None = None,
+        checkpoints: list | None = None,
+        resume: dict | None = None) -> dict:
+    """Calculates interest installments, capital installments and credit
+    balance for sorted cash flow dates (ACT/ACT day count convention).
+
+    Day counts of all periods are calculated at once (day_count_periods),
+    only the balance recurrence is calculated row by row - in whole grosze,
+    interest of each period rounded once (round_grosze), results converted
+    back to money amounts.
+    Returns dictionary of lists: "interest installment" (None if interest is
+    not paid at given date), "capital installment", "total installment",
+    "credit balance" and "early repayment" (corrected to the value of unpaid
+    debt if necessary).
+    If trace list is given, state of calculation after each date is appended
+    to it (see trace_record).
+    If checkpoints list is given, state of calculation before each installment
+    date is appended to it as (index, state) tuple.
+    Calculation may be resumed from one of checkpoints of previous calculation
+    (see resume_point) - results before checkpoint are copied, only the
+    remaining dates are calculated."""
+    n = len(dates)
+    periods = day_count_periods(dates)
+    days = periods["days"].tolist()
+    previous_year_days = periods["previous year days"].tolist()
+    current_year_days = periods["current year days"].tolist()
+    previous_leap = periods["previous leap"].tolist()
+    current_leap = periods["current leap"].tolist()
+    is_installment_date = [date in installment_dates for date in dates]
+
+    payments_from_bank = to_grosze(payments_from_bank).tolist()
+    initial_balance = round_grosze(float(initial_balance) * MONEY_SCALE)
+    interest = [0] * n
+    capital = to_grosze(capital_installments).tolist()
+    total = to_grosze(total_installments).tolist()
+    balance = [0] * n
+    repayments = to_grosze(early_repayments).tolist()
+
+    # Auxiliary variables (for calculating changes inbetween installment payment days)
+    changes = False
+    interest_installment_changes = 0
+    interest_rate = 0
+    additional_days = False
+    normal_days = 0
+    leap_days = 0
+
+    start = 0
+    if resume is not None:
+        start = resume["index"]
+        previous = {name: [None if value is None else round_grosze(value * MONEY_SCALE)
+                           for value in values[:start]]
+                    for name, values in resume["results"].items()}
+        interest[:start] = previous["interest installment"]
+        capital[:start] = previous["capital installment"]
+        total[:start] = previous["total installment"]
+        balance[:start] = previous["credit balance"]
+        repayments[:start] = previous["early repayment"]
+        (changes, interest_installment_changes, interest_rate,
+         additional_days, normal_days, leap_days) = resume["state"]
+        if checkpoints is not None:
+            checkpoints.extend(checkpoint for checkpoint in resume["checkpoints"]
+                               if checkpoint[0] < start)
+
+    def year_split(k):
+        """Returns (regular year days, leap year days) of period ending at k."""
+        if not previous_leap[k] and current_leap[k]:
+            return previous_year_days[k], current_year_days[k]
+        if previous_leap[k] and not current_leap[k]:
+            return current_year_days[k], previous_year_days[k]
+        return None
+
+    def interest_installment(k, previous_balance):
+        split = year_split(k)
+        extra = interest_installment_changes if changes is True else 0
+        if split:
+            regular_year_days = split[0] + (normal_days if additional_days is True else 0)
+            leap_year_days = split[1] + (leap_days if additional_days is True else 0)
+            return (round_grosze(previous_balance * (interest_rate * regular_year_days / 365))
+                    + round_grosze(previous_balance * (interest_rate * leap_year_days / 366))
+                    + extra)
+        if additional_days:
+            regular_year_days = normal_days + days[k]
+            return (round_grosze(previous_balance * (interest_rate * leap_days / 366))
+                    + round_grosze(previous_balance * (interest_rate * regular_year_days / 365))
+                    + extra)
+        days_in_year = 366 if current_leap[k] else 365
+        return round_grosze(previous_balance * (interest_rate * days[k] / days_in_year)) + extra
+
+    def trace_record(k, scenario):
+        return {
+            "date": dates[k],
+            "scenario": scenario,
+            "interest rate": interest_rate,
+            "changes": changes,
+            "interest installment changes": interest_installment_changes / MONEY_SCALE,
+            "additional days": additional_days,
+            "normal days": normal_days,
+            "leap days": leap_days,
+            "interest installment": (None if interest[k] is None
+                                     else interest[k] / MONEY_SCALE),
+            "capital installment": capital[k] / MONEY_SCALE,
+            "credit balance": balance[k] / MONEY_SCALE,
+        }
+
+    def interest_between_installments(k, previous_balance):
+        if additional_days:
+            return (round_grosze(previous_balance * (interest_rate * leap_days / 366))
+                    + round_grosze(previous_balance * (interest_rate * (normal_days + days[k]) / 365)))
+        days_in_year = 366 if current_leap[k] else 365
+        return round_grosze(previous_balance * (interest_rate * days[k] / days_in_year))
+
+    for k in range(start, n):
+        if checkpoints is not None and is_installment_date[k]:
+            checkpoints.append((k, (changes, interest_installment_changes, interest_rate,
+                                    additional_days, normal_days, leap_days)))
+        date = dates[k]
+        from_bank = payments_from_bank[k]
+        repayment = repayments[k]
+
+        # Initial balance
+        if date == initial_date:
+            interest[k] = 0
+            if not decreasing_installments:
+                capital[k] = 0
+            balance[k] = initial_balance
+            if trace is not None:
+                trace.append(trace_record(k, "initial balance"))
+            continue
+
+        # Cash flows before start of credit do not carry any balance
+        previous_balance = balance[k - 1] if k > 0 else 0
+        scenario = None
+        if not decreasing_installments:
+            interest[k] = 0
+            balance[k] = previous_balance
+
+        # All debt is paid scenario (balance rounds to zero)
+        if abs(previous_balance) <= MONEY_SCALE // 2:
+            scenario = "debt paid"
+            interest[k] = 0
+            capital[k] = 0
+            total[k] = 0
+            balance[k] = 0
+
+        # Last installment payment scenario (decreasing installments)
+        elif decreasing_installments and capital[k] >= (previous_balance + from_bank):
+            scenario = "last installment"
+            interest_rate = interest_rates[k] / 100
+            interest[k] = interest_installment(k, previous_balance)
+            capital[k] = previous_balance
+            total[k] = interest[k] + previous_balance
+            balance[k] = 0
+            additional_days = False
+
+        # Last installment payment scenario (fixed installments)
+        elif (not decreasing_installments
+              and from_bank == 0
+              and total[k] > 0
+              and (previous_balance - repayment - capital[k - 1] <= 0)):
+            scenario = "last installment"
+            interest[k] = interest_installment(k, previous_balance)
+            capital[k] = total[k] - interest[k]
+            balance[k] = 0
+            # Correcting amount of early repayment to value of unpaid debt
+            if (capital[k] + repayment) > previous_balance:
+                repayments[k] = previous_balance - (total[k] - interest[k])
+            additional_days = False
+
+        # No credit changes (other payments related to credit but not with credit balance)
+        elif from_bank == 0 and repayment == 0 and not is_installment_date[k]:
+            scenario = "no credit changes"
+            additional_days = True
+            balance[k] = previous_balance
+            interest[k] = None
+            split = year_split(k)
+            if split:
+                normal_days, leap_days = split
+            else:
+                normal_days, leap_days = days[k], 0
+
+        # Changes in credit between installment dates scenario
+        elif ((from_bank > 0 or repayment > 0)
+              and not is_installment_date[k] and date > start_of_credit):
+            scenario = "changes between installment dates"
+            changes = True
+            # If rate of interest changes after tranche payment or early repayment date,
+            # interest should be calculated at new interest rate
+            if k + 1 < n and interest_rates[k] != interest_rates[k + 1]:
+                interest_rate = interest_rates[k + 1] / 100
+            balance[k] = previous_balance - capital[k] + from_bank - repayment
+            interest_installment_changes = interest_between_installments(k, previous_balance)
+            additional_days = False
+            interest[k] = None
+            if not decreasing_installments:
+                capital[k] = 0
+
+        # Changes in credit at installment dates scenario
+        elif from_bank > 0 or repayment > 0 or is_installment_date[k]:
+            scenario = "installment date"
+            interest_rate = interest_rates[k] / 100
+            interest[k] = interest_installment(k, previous_balance)
+            if decreasing_installments:
+                total[k] = interest[k] + capital[k]
+            else:
+                capital[k] = total[k] - interest[k]
+            balance[k] = previous_balance - capital[k] + from_bank - repayment
+            changes = False
+            additional_days = False
+            interest_installment_changes = 0
+
+        if trace is not None:
+            trace.append(trace_record(k, scenario))
+
+    return {
+        "interest installment": from_grosze(interest),
+        "capital installment": from_grosze(capital),
+        "total installment": from_grosze(total),
+        "credit balance": from_grosze(balance),
+        "early repayment": from_grosze(repayments),
+    }
+
+
+def kernel_inputs(dates: list, installment_dates: set, **columns) -> dict:
+    """Returns inputs of amortization_kernel in form comparable between
+    calculations (see resume_point)."""
+    return {"dates": list(dates),
+            "installment date": [date in installment_dates for date in dates],
+            **{name: list(value) if isinstance(value, (list, tuple)) else value
+               for name, value in columns.items()}}
+
+
+def resume_point(previous: dict | None, inputs: dict) -> dict | None:
+    """Returns resume argument of amortization_kernel: the last checkpoint of
+    previous calculation ({"inputs", "results", "checkpoints"}) which is not
+    affected by differences in inputs, or None if calculation must start
+    from the beginning.
+    Result at date k depends on inputs at date k, interest rate at date k+1
+    (interest rate of following period) and results at date k-1, therefore
+    all dates before the first changed date (or before the date preceding
+    the first changed interest rate) remain valid."""
+    if not previous or previous["inputs"].keys() != inputs.keys():
+        return None
+    first_invalid = len(inputs["dates"])
+    for name, value in inputs.items():
+        previous_value = previous["inputs"][name]
+        if not isinstance(value, list):
+            if value != previous_value:
+                return None
+            continue
+        changed = next((k for k, (old, new) in enumerate(zip(previous_value, value))
+                        if old != new), min(len(previous_value), len(value)))
+        if len(previous_value) == len(value) and changed == len(value):
+            continue
+        first_invalid = min(first_invalid, changed - 1 if name == "interest_rates" else changed)
+    index, state = None, None
+    for checkpoint_index, checkpoint_state in previous["checkpoints"]:
+        if checkpoint_index > first_invalid:
+            break
+        index, state = checkpoint_index, checkpoint_state
+    if index is None:
+        return None
+    return {"index": index, "state": state, "results": previous["results"],
+            "checkpoints": previous["checkpoints"]}
+
+
+def solve_xirr(dates: list, amounts, max_iterations: int = XIRR_MAX_ITERATIONS,
+               tolerance: float = XIRR_TOLERANCE) -> float | None:
+    """Returns XIRR of cash flows (years of 365 days) found by Newton's method
+    in calling thread - None if change of rate does not fall below tolerance
+    within max_iterations steps (e.g. all amounts have the same sign)."""
+    amounts = np.asarray(amounts, dtype=float)
+    ordinals = np.array([date.toordinal() for date in dates], dtype=float)
+    years = (ordinals - ordinals.min()) / 365
+    rate = 0.1
+    for iteration in range(max_iterations):
+        with np.errstate(all="ignore"):
+            discount = (1 + rate) ** -years
+            npv = amounts @ discount
+            derivative = -(amounts * years) @ (discount / (1 + rate))
+            step = npv / derivative if derivative else math.nan
+        if not math.isfinite(step):
+            return None
+        # Rate below -100% is moved halfway between previous rate and -100%
+        new_rate = rate - step if rate - step > -1 else (rate - 1) / 2
+        if abs(new_rate - rate) < tolerance:
+            return float(new_rate)
+        rate = new_rate
+    return None
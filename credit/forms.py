@@ -660,3 +660,42 @@ class CreditEarlyRepaymentForm(forms.ModelForm):
     def clean(self):
         cleaned_data = super().clean()
         return cleaned_data  # noqa: RET504
+
+
+class CreditSimulationForm(forms.Form):
+    """Hypothetical changes of credit for what-if simulation
+    (early repayment and/or change of interest rate at the same date)."""
+    change_date = forms.DateField(
+        label=_("Data zmiany"),
+        help_text=_("Pole wymagane. Format: YYYY-MM-DD (np. 2020-07-21).")
+    )
+    repayment_amount = forms.FloatField(
+        label=_("Wartość wcześniejszej spłaty"), required=False, min_value=0,
+    )
+    interest_rate = forms.FloatField(
+        label=_("Wysokość oprocentowania"), required=False, min_value=0,
+        help_text=_("Pełna wysokość (z marżą banku i oprocentowaniem pomostowym).")
+    )
+
+    def __init__(self, *args, **kwargs):
+        self.credit = kwargs.pop("credit")
+        super(CreditSimulationForm, self).__init__(*args, **kwargs)
+
+    def clean_change_date(self):
+        change_date = self.cleaned_data.get("change_date", None)
+        if self.credit.start_of_payment > change_date:
+            self.add_error(
+                "change_date",
+                _("Data zmiany nie może przypadać wcześniej niż data pierwszej "
+                  "płatności raty (%s)." % self.credit.start_of_payment)
+            )
+        else:
+            return change_date
+
+    def clean(self):
+        cleaned_data = super().clean()
+        if (not cleaned_data.get("repayment_amount")
+                and cleaned_data.get("interest_rate") is None):
+            raise forms.ValidationError(
+                _("Podaj wartość wcześniejszej spłaty lub nowe oprocentowanie."))
+        return cleaned_data
@@ -0,0 +1,96 @@
+from __future__ import annotations
+import concurrent.futures
+import logging
+import os
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections
+
+from .schedule_cache import get_cached_schedule, schedule_version
+
+logger = logging.getLogger("all")
+
+# Status of job is kept only for a limited time, so that job lost together
+# with its process (e.g. restarted worker) is enqueued again
+JOB_TIMEOUT = 10 * 60
+
+PENDING = "pending"
+READY = "ready"
+ERROR = "error"
+
+_executor = None
+
+
+def _reset_executor():
+    # Threads of executor are not copied to forked process
+    global _executor
+    _executor = None
+
+
+os.register_at_fork(after_in_child=_reset_executor)
+
+
+def executor() -> concurrent.futures.Executor:
+    """Local pool of threads calculating credit schedules (no external broker)."""
+    global _executor
+    if _executor is None:
+        _executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=getattr(settings, "CREDIT_SCHEDULE_ASYNC_WORKERS", 2),
+            thread_name_prefix="credit-schedule")
+    return _executor
+
+
+def job_key(credit_id, version) -> str:
+    return f"credit_schedule_job_{credit_id}_{version}"
+
+
+def calculate_schedule(credit_id, version) -> None:
+    """Calculates schedule of credit and stores it in cache
+    (on failure status of job is set to error)."""
+    from .views import CreditSchedule
+
+    try:
+        CreditSchedule(None, credit_id).cache_schedule()
+    except Exception:
+        logger.exception("credit: %s - 🛑 calculation of credit schedule failed" % credit_id)
+        cache.set(job_key(credit_id, version), ERROR, JOB_TIMEOUT)
+
+
+def run_job(credit_id, version) -> None:
+    try:
+        calculate_schedule(credit_id, version)
+    finally:
+        # Database connections of worker thread are not closed by request cycle
+        connections.close_all()
+
+
+def enqueue_schedule(credit_id, version) -> None:
+    """Enqueues calculation of schedule in given version (only once)."""
+    if cache.add(job_key(credit_id, version), PENDING, JOB_TIMEOUT):
+        executor().submit(run_job, credit_id, version)
+
+
+def calculate_in_background(schedule) -> bool:
+    """Enqueues calculation of schedule if asynchronous mode is on
+    (CREDIT_SCHEDULE_ASYNC setting) and schedule is not in cache.
+    Returns True if schedule is calculated in background."""
+    if (not getattr(settings, "CREDIT_SCHEDULE_ASYNC", False)
+            or schedule.from_cache or schedule.trace is not None):
+        return False
+    enqueue_schedule(schedule.credit.id, schedule.cache_version)
+    return True
+
+
+def schedule_status(credit_id) -> str:
+    """Returns status of calculation of current schedule of credit: ready
+    (schedule in cache), pending or error. Calculation is enqueued if
+    there is no job (e.g. job expired or was enqueued by another process)."""
+    version = schedule_version(credit_id)
+    if get_cached_schedule(credit_id, version) is not None:
+        return READY
+    status = cache.get(job_key(credit_id, version))
+    if status is None:
+        enqueue_schedule(credit_id, version)
+        return PENDING
+    return status
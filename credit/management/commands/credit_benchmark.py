@@ -0,0 +1,177 @@
+import datetime
+import itertools
+import json
+import platform
+import statistics
+import time
+
+from dateutil.relativedelta import relativedelta
+from django.db import connection, transaction
+from django.core.management.base import BaseCommand
+from django.test.utils import CaptureQueriesContext
+
+from credit.enums import Frequency, InstallmentType, RepaymentAction
+from credit.factories import (CreditFactory, CreditAdditionalCostFactory,
+                              CreditCollateralFactory, CreditEarlyRepaymentFactory,
+                              CreditInsuranceFactory, CreditInterestRateFactory,
+                              CreditTrancheFactory)
+from credit.simulation import annuity_installment, periodic_rate
+from credit.views import CreditSchedule
+from user.factories import UserFactory
+
+# CreditSchedule methods timed by benchmark
+BENCHMARKED_METHODS = ("credit_table", "to_html", "sum_for_table_columns",
+                       "xirr", "to_excel")
+
+FREQUENCY_MONTHS = {
+    Frequency.MONTHLY: 1,
+    Frequency.QUARTERLY: 3,
+    Frequency.SEMI_ANNUALLY: 6,
+    Frequency.ANNUALLY: 12,
+}
+
+CREDIT_AMOUNT = 500000
+INTEREST_RATE = 6
+
+
+def synthetic_credit(user, years, frequency, installment_type, tranches,
+                     rate_changes, insurances, repayments):
+    """Creates credit with given number of related records spread over the
+    whole credit period (tranches paid monthly from start of credit)."""
+    months = FREQUENCY_MONTHS[frequency]
+    installments = years * 12 // months
+    start_of_credit = datetime.date(2020, 1, 15)
+    start_of_payment = datetime.date(2020, 2, 1) + relativedelta(months=months - 1)
+    installment = (CREDIT_AMOUNT / installments
+                   if installment_type == InstallmentType.DECREASING_INSTALLMENTS
+                   else annuity_installment(CREDIT_AMOUNT,
+                                            periodic_rate(INTEREST_RATE, months),
+                                            installments))
+    credit = CreditFactory(
+        user=user, name=f"Benchmark {years}y {frequency} {installment_type}",
+        credit_amount=CREDIT_AMOUNT, market_value=CREDIT_AMOUNT * 1.25,
+        credit_period=years * 12, installment_type=installment_type,
+        installment_frequency=frequency,
+        total_installment=(0 if installment_type == InstallmentType.DECREASING_INSTALLMENTS
+                           else round(installment, 2)),
+        capital_installment=(round(installment, 2)
+                             if installment_type == InstallmentType.DECREASING_INSTALLMENTS
+                             else 0),
+        fixed_interest_rate=INTEREST_RATE, date_of_agreement=datetime.date(2020, 1, 1),
+        start_of_credit=start_of_credit, start_of_payment=start_of_payment,
+        tranches_in_credit="Tak" if tranches else "Nie",
+    )
+
+    def spread(count):
+        """Dates of count events spread evenly over credit period."""
+        step = max(years * 12 // (count + 1), 1)
+        return [start_of_payment + relativedelta(months=step * i, day=10)
+                for i in range(1, count + 1)]
+
+    for i in range(tranches):
+        amount = round(CREDIT_AMOUNT / tranches, 2)
+        if i == tranches - 1:
+            amount = round(CREDIT_AMOUNT - amount * (tranches - 1), 2)
+        CreditTrancheFactory(user=user, credit=credit, tranche_amount=amount,
+                             tranche_date=start_of_credit + relativedelta(months=i))
+    for i, date in enumerate(spread(rate_changes)):
+        CreditInterestRateFactory(user=user, credit=credit,
+                                  interest_rate=INTEREST_RATE + (i % 5) - 2,
+                                  interest_rate_start_date=date)
+    for i in range(insurances):
+        CreditInsuranceFactory(user=user, credit=credit, amount=100 + i,
+                               frequency=Frequency.MONTHLY,
+                               start_date=start_of_credit + relativedelta(days=i + 1),
+                               end_date=None, payment_period=years * 12)
+    actions = itertools.cycle(RepaymentAction.values)
+    for date in spread(repayments):
+        CreditEarlyRepaymentFactory(user=user, credit=credit,
+                                    repayment_amount=CREDIT_AMOUNT / 100,
+                                    repayment_date=date, repayment_action=next(actions))
+    CreditCollateralFactory(user=user, credit=credit,
+                            collateral_set_date=start_of_credit + relativedelta(years=1))
+    CreditAdditionalCostFactory(user=user, credit=credit,
+                                cost_payment_date=start_of_credit + relativedelta(months=1))
+    return credit
+
+
+def time_method(credit_id, method, runs) -> dict:
+    """Times method of new CreditSchedule instance (loading of credit data
+    included, cache not used) and counts database queries."""
+    seconds = []
+    for _ in range(runs):
+        with CaptureQueriesContext(connection) as queries:
+            start = time.perf_counter()
+            result = getattr(CreditSchedule(None, credit_id, use_cache=False), method)()
+            seconds.append(time.perf_counter() - start)
+        if method == "to_excel":
+            result.close()
+    return {
+        "runs": seconds,
+        "median": statistics.median(seconds),
+        "min": min(seconds),
+        "queries": len(queries),
+    }
+
+
+class Command(BaseCommand):
+    help = ("Times credit schedule methods (and counts database queries) for "
+            "synthetic credits with many tranches, interest rate changes, "
+            "insurances and early repayments. Credits are created in transaction "
+            "rolled back at the end. Results in JSON.")
+
+    def add_arguments(self, parser):
+        parser.add_argument("--years", type=int, nargs="+", default=[5, 20, 35],
+                            help="Credit periods (in years).")
+        parser.add_argument("--frequencies", nargs="+", default=list(FREQUENCY_MONTHS),
+                            choices=list(FREQUENCY_MONTHS),
+                            help="Installment frequencies.")
+        parser.add_argument("--installment-types", nargs="+",
+                            default=InstallmentType.values, choices=InstallmentType.values,
+                            help="Installment types.")
+        parser.add_argument("--tranches", type=int, default=24)
+        parser.add_argument("--rate-changes", type=int, default=24)
+        parser.add_argument("--insurances", type=int, default=2)
+        parser.add_argument("--repayments", type=int, default=12)
+        parser.add_argument("--runs", type=int, default=3,
+                            help="Number of timed runs of each method.")
+        parser.add_argument("--output", help="Path of JSON file (standard output if not given).")
+
+    def handle(self, *args, **options):
+        scenarios = []
+        with transaction.atomic():
+            user = UserFactory(username="benchmarkuser", email="benchmark@example.com")
+            for years, frequency, installment_type in itertools.product(
+                    options["years"], options["frequencies"], options["installment_types"]):
+                parameters = {
+                    "years": years,
+                    "frequency": frequency,
+                    "installment type": installment_type,
+                    "tranches": options["tranches"],
+                    "rate changes": options["rate_changes"],
+                    "insurances": options["insurances"],
+                    "repayments": options["repayments"],
+                }
+                credit = synthetic_credit(
+                    user, years, frequency, installment_type, options["tranches"],
+                    options["rate_changes"], options["insurances"], options["repayments"])
+                scenarios.append({
+                    "parameters": parameters,
+                    "rows": len(CreditSchedule(None, credit.id, use_cache=False).credit_table()),
+                    "methods": {method: time_method(credit.id, method, options["runs"])
+                                for method in BENCHMARKED_METHODS},
+                })
+            transaction.set_rollback(True)
+
+        report = {
+            "python": platform.python_version(),
+            "database": connection.vendor,
+            "created": datetime.datetime.now().isoformat(timespec="seconds"),
+            "scenarios": scenarios,
+        }
+        output = json.dumps(report, indent=2, ensure_ascii=False)
+        if options["output"]:
+            with open(options["output"], "w", encoding="utf-8") as file:
+                file.write(output)
+        else:
+            self.stdout.write(output)
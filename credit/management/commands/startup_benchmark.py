@@ -0,0 +1,63 @@
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+HEAVY_MODULES = ("pandas", "numpy", "openpyxl")
+
+# Executed in fresh interpreter: loads project with all URLs (and views)
+URLCONF_LOAD = """
+import json, sys, time
+start = time.perf_counter()
+import django
+django.setup()
+from django.urls import get_resolver
+get_resolver().url_patterns
+print(json.dumps({"seconds": time.perf_counter() - start,
+                  "loaded": [name for name in %r if name in sys.modules]}))
+""" % (HEAVY_MODULES,)
+
+# Executed in fresh interpreter: cost of numeric stack used by credit schedule
+NUMERIC_STACK_LOAD = """
+import json, time
+start = time.perf_counter()
+import pandas, numpy, openpyxl
+print(json.dumps({"seconds": time.perf_counter() - start, "loaded": []}))
+"""
+
+
+class Command(BaseCommand):
+    help = ("Measures cold start of the project (loading settings, apps, URLs "
+            "and views in fresh interpreter) and cost of loading numeric "
+            "libraries used only by credit schedule. Results in JSON.")
+
+    def add_arguments(self, parser):
+        parser.add_argument("--runs", type=int, default=5,
+                            help="Number of fresh interpreters for each measurement.")
+
+    def measure(self, code, runs):
+        environment = dict(os.environ, DJANGO_SETTINGS_MODULE=settings.SETTINGS_MODULE)
+        results = []
+        for _ in range(runs):
+            output = subprocess.run(
+                [sys.executable, "-c", code], env=environment, cwd=settings.BASE_DIR,
+                capture_output=True, text=True, check=True).stdout
+            results.append(json.loads(output.strip().splitlines()[-1]))
+        seconds = [result["seconds"] for result in results]
+        return {
+            "runs": seconds,
+            "median": statistics.median(seconds),
+            "heavy modules loaded": results[-1]["loaded"],
+        }
+
+    def handle(self, *args, **options):
+        runs = options["runs"]
+        report = {
+            "urlconf load": self.measure(URLCONF_LOAD, runs),
+            "numeric stack load": self.measure(NUMERIC_STACK_LOAD, runs),
+        }
+        self.stdout.write(json.dumps(report, indent=2))
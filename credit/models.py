@@ -3,6 +3,8 @@ import decimal
 import uuid
 
 from django.conf import settings
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVector
 from django.core.exceptions import ValidationError
 from django.core.validators import MinValueValidator
 from django.db import models
@@ -226,6 +228,16 @@ class Credit(models.Model):
             models.UniqueConstraint(fields=["user", "name"],
                                     name="unique_credit_name"),
         ]
+        indexes = [
+            models.Index(fields=["user", "-updated"], name="credit_user_updated_idx"),
+            models.Index(fields=["user", "access_granted", "-updated"],
+                         name="credit_user_access_idx"),
+            models.Index(fields=["user", "access_granted_for_schedule", "-updated"],
+                         name="credit_user_schedule_idx"),
+            GinIndex(SearchVector("name", "type", "installment_type", "type_of_interest",
+                                  config=settings.SEARCH_CONFIG),
+                     name="credit_search_idx"),
+        ]
 
     @classmethod
     def field_names(cls) -> list:
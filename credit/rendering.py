@@ -0,0 +1,105 @@
+from __future__ import annotations
+import datetime
+import html
+import math
+import numbers
+
+# Swaps separators of python format ("1,234.50") to polish ones ("1.234,50")
+SEPARATORS = str.maketrans({",": ".", ".": ","})
+
+
+def format_value(value, precision: int = 2) -> str:
+    """Formats value of table cell: numbers with given precision, "." as
+    thousands and "," as decimal separator, other values as strings."""
+    # Exact type checks first (most of cells), abstract types only for other
+    # numeric types (e.g. numpy scalars)
+    value_type = type(value)
+    if value_type is float:
+        if value != value:
+            return "nan"
+        return f"{value:,.{precision}f}".translate(SEPARATORS)
+    if value_type is int:
+        return f"{value:,}".translate(SEPARATORS)
+    if value_type is str:
+        return html.escape(value)
+    if isinstance(value, bool):
+        return str(value)
+    if isinstance(value, numbers.Integral):
+        return f"{value:,}".translate(SEPARATORS)
+    if isinstance(value, numbers.Real):
+        if math.isnan(value):
+            return "nan"
+        return f"{value:,.{precision}f}".translate(SEPARATORS)
+    return html.escape(str(value))
+
+
+def format_column(values: list, precision: int = 2) -> list:
+    """Formats all values of table column (see format_value)."""
+    if all(type(value) is float and value == value for value in values):
+        spec = f",.{precision}f"
+        return [format(value, spec).translate(SEPARATORS) for value in values]
+    return [format_value(value, precision) for value in values]
+
+
+def table_to_html(columns: list, index: list, values: list,
+                  column_styles: dict | None = None,
+                  heading_style: str | None = None,
+                  table_class: str = "credit_schedule") -> str:
+    """Returns html table with given column names, row index and columns of
+    values (list of lists, one for each column).
+    Styles are set per column (column name: css properties), cells refer to
+    them only by class of column."""
+    column_styles = column_styles or {}
+    css = []
+    for number, column in enumerate(columns):
+        if column in column_styles:
+            css.append(f".{table_class} th.col{number}, .{table_class} td.col{number} "
+                       f"{{{column_styles[column]}}}")
+    if heading_style:
+        css.append(f".{table_class} th.col_heading {{{heading_style}}}")
+
+    parts = [f'<style type="text/css">\n{chr(10).join(css)}\n</style>\n',
+             f'<table class="{table_class}">\n<thead>\n<tr><th class="blank">&nbsp;</th>']
+    for number, column in enumerate(columns):
+        parts.append(f'<th class="col_heading col{number}">{html.escape(str(column))}</th>')
+    parts.append("</tr>\n</thead>\n<tbody>\n")
+
+    formatted_columns = [format_column(column) for column in values]
+    cell_starts = [f'<td class="col{number}">' for number in range(len(columns))]
+    for row, label in enumerate(index):
+        cells = "".join([cell_start + column[row] + "</td>"
+                         for cell_start, column in zip(cell_starts, formatted_columns)])
+        parts.append(f'<tr><th class="row_heading">{html.escape(str(label))}</th>{cells}</tr>\n')
+    parts.append("</tbody>\n</table>\n")
+    return "".join(parts)
+
+
+def export_value(value):
+    """Converts value of table cell for machine-readable export (JSON, CSV):
+    numeric types to python numbers (nan to None), dates to ISO format,
+    other values unchanged."""
+    if value is None or type(value) in (str, int, bool):
+        return value
+    if isinstance(value, datetime.date):
+        return value.isoformat()
+    if isinstance(value, numbers.Integral):
+        return int(value)
+    if isinstance(value, numbers.Real):
+        value = float(value)
+        return None if math.isnan(value) else value
+    return str(value)
+
+
+def export_column(values: list) -> list:
+    """Converts all values of table column (see export_value)."""
+    if all(type(value) is float and value == value for value in values):
+        return values
+    return [export_value(value) for value in values]
+
+
+class Echo:
+    """Pseudo-buffer returning written value instead of storing it (csv
+    writer writing to it returns formatted line ready for streaming)."""
+
+    def write(self, value):
+        return value
@@ -0,0 +1,61 @@
+from __future__ import annotations
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+
+# Names of CreditSchedule methods which results are stored in cache
+CACHED_SCHEDULE_RESULTS = ("credit_table", "sum_for_table_columns", "xirr")
+
+
+def schedule_version_key(credit_id) -> str:
+    return f"credit_schedule_version_{credit_id}"
+
+
+def schedule_key(credit_id, version) -> str:
+    return f"credit_schedule_{credit_id}_{version}"
+
+
+def schedule_version(credit_id) -> str:
+    """Returns current content version of credit schedule.
+    Version is a random value (not a counter) so that schedules cached before
+    eviction of version from cache can never be read again."""
+    key = schedule_version_key(credit_id)
+    version = cache.get(key)
+    if version is None:
+        version = uuid.uuid4().hex
+        if not cache.add(key, version, None):
+            version = cache.get(key, version)
+    return version
+
+
+def bump_schedule_version(credit_id) -> None:
+    """Invalidates all cached schedules of credit."""
+    cache.set(schedule_version_key(credit_id), uuid.uuid4().hex, None)
+
+
+def get_cached_schedule(credit_id, version) -> dict | None:
+    """Returns dictionary of cached CreditSchedule results (method name: result)
+    or None if schedule in given version is not cached."""
+    return cache.get(schedule_key(credit_id, version))
+
+
+def set_cached_schedule(credit_id, version, results: dict) -> None:
+    cache.set(schedule_key(credit_id, version), results,
+              getattr(settings, "CREDIT_SCHEDULE_CACHE_TIMEOUT", None))
+
+
+def checkpoints_key(credit_id) -> str:
+    return f"credit_schedule_checkpoints_{credit_id}"
+
+
+def get_kernel_checkpoints(credit_id) -> dict | None:
+    """Returns inputs, results and checkpoints of the last credit balance
+    calculation of credit (kept regardless of schedule version - validity
+    is checked by comparing inputs, see engine.resume_point)."""
+    return cache.get(checkpoints_key(credit_id))
+
+
+def set_kernel_checkpoints(credit_id, calculation: dict) -> None:
+    cache.set(checkpoints_key(credit_id), calculation,
+              getattr(settings, "CREDIT_SCHEDULE_CACHE_TIMEOUT", None))
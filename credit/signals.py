@@ -0,0 +1,25 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import (Credit, CreditTranche, CreditInterestRate,
+                     CreditInsurance, CreditCollateral, CreditAdditionalCost,
+                     CreditEarlyRepayment)
+from .schedule_cache import bump_schedule_version
+
+
+@receiver([post_save, post_delete], sender=Credit)
+def credit_changed(sender, instance, **kwargs):
+    """Invalidates cached repayment schedule of changed credit."""
+    bump_schedule_version(instance.id)
+
+
+@receiver([post_save, post_delete], sender=CreditTranche)
+@receiver([post_save, post_delete], sender=CreditInterestRate)
+@receiver([post_save, post_delete], sender=CreditInsurance)
+@receiver([post_save, post_delete], sender=CreditCollateral)
+@receiver([post_save, post_delete], sender=CreditAdditionalCost)
+@receiver([post_save, post_delete], sender=CreditEarlyRepayment)
+def credit_related_record_changed(sender, instance, **kwargs):
+    """Invalidates cached repayment schedule of credit which related record
+    (tranche, interest rate, insurance etc.) has changed."""
+    bump_schedule_version(instance.credit_id)
@@ -0,0 +1,283 @@
+from __future__ import annotations
+import dataclasses
+import datetime
+import math
+
+from dateutil.relativedelta import relativedelta
+from django.utils.translation import gettext_lazy as _
+
+from .enums import RepaymentAction
+from .models import CreditEarlyRepayment, CreditInterestRate
+
+# Columns of simulated schedule (the same as in CreditSchedule.credit_table)
+SIMULATION_COLUMNS = ("Data", "Rata odsetkowa", "Rata kapitałowa",
+                      "Rata całkowita", "Saldo")
+
+
+def periodic_rate(annual_rate, months) -> float:
+    """Interest rate (as fraction) for period of given number of months."""
+    return annual_rate / 100 * months / 12
+
+
+def annuity_installment(balance, rate, periods) -> float:
+    """Equal (total) installment repaying balance in given number of periods
+    with periodic rate."""
+    if rate == 0:
+        return balance / periods
+    return balance * rate / (1 - (1 + rate) ** -periods)
+
+
+def annuity_periods(balance, rate, installment) -> int:
+    """Number of equal installments needed to repay balance with periodic rate.
+    Raises ValueError if installment does not cover interest."""
+    if installment <= 0:
+        raise ValueError(_("Rata musi być większa od zera."))
+    if rate == 0:
+        return math.ceil(round(balance / installment, 8))
+    if installment <= balance * rate:
+        raise ValueError(_("Rata nie pokrywa odsetek - kredyt nie zostanie spłacony."))
+    periods = -math.log(1 - balance * rate / installment) / math.log(1 + rate)
+    return math.ceil(round(periods, 8))
+
+
+def decreasing_installment(balance, periods) -> float:
+    """Capital installment repaying balance in given number of periods."""
+    return balance / periods
+
+
+def decreasing_periods(balance, capital_installment) -> int:
+    """Number of capital installments needed to repay balance.
+    Raises ValueError if installment is not positive."""
+    if capital_installment <= 0:
+        raise ValueError(_("Rata musi być większa od zera."))
+    return math.ceil(round(balance / capital_installment, 8))
+
+
+def closed_form_schedule(dates, balance, rate, installment, periods,
+                         decreasing_installments) -> list:
+    """Returns rows of schedule (see SIMULATION_COLUMNS) of credit without
+    irregular cash flows. Last installment covers the remaining balance."""
+    rows = []
+    for period, date in enumerate(dates[:periods], start=1):
+        interest = round(balance * rate, 2)
+        if decreasing_installments:
+            capital = min(round(installment, 2), round(balance, 2))
+        else:
+            capital = min(round(installment - interest, 2), round(balance, 2))
+        if period == periods:
+            capital = round(balance, 2)
+        balance = round(balance - capital, 2)
+        rows.append(dict(zip(SIMULATION_COLUMNS,
+                             (date, interest, capital, round(interest + capital, 2),
+                              balance))))
+    return rows
+
+
+@dataclasses.dataclass(frozen=True)
+class CreditSimulation:
+    """What-if simulation of early repayment and/or change of interest rate
+    at change_date, calculated from the schedule of saved credit data
+    (nothing is stored in database or cache).
+
+    Remaining schedule is calculated in closed form (periodic rate equal to
+    annual rate divided by number of installments per year) if there are
+    no irregular cash flows (tranches, early repayments, interest rate
+    changes, collateral set, grace period) after change_date. Otherwise the
+    full credit engine is used with hypothetical records added to credit data
+    (new installment amount still solved in closed form)."""
+    schedule: object  # CreditSchedule of saved credit data
+    change_date: datetime.date
+    repayment_amount: float = 0
+    interest_rate: float | None = None
+
+    @property
+    def credit(self):
+        return self.schedule.credit
+
+    @property
+    def decreasing_installments(self) -> bool:
+        return self.credit.installment_type == _("Raty malejące")
+
+    def months(self) -> int:
+        months = self.schedule.frequency(self.credit.installment_frequency)
+        if not months:
+            raise ValueError(_("Symulacja niedostępna dla kredytu spłacanego jednorazowo."))
+        return months
+
+    def remaining_dates(self) -> list:
+        """Installment dates after change date."""
+        return [date for date in self.schedule.basic_installment_dates_list()
+                if date > self.change_date]
+
+    def extended_dates(self, periods) -> list:
+        """Installment dates after change date extended to given number of
+        periods (if simulated credit period is longer than the one from
+        credit agreement)."""
+        dates = self.remaining_dates()
+        while len(dates) < periods:
+            dates.append(dates[-1] + relativedelta(months=self.months(),
+                                                   day=self.credit.payment_day or 31))
+        return dates
+
+    def balance_before_change(self) -> float:
+        """Credit balance at the end of change date before any changes."""
+        table = self.schedule.credit_table()
+        balance = 0
+        for date, value in zip(table["Data"], table["Saldo"]):
+            if date > self.change_date:
+                break
+            balance = value
+        return float(balance)
+
+    def rate_before_change(self) -> float:
+        rate = 0
+        for date, value in sorted(self.schedule.interest_rates_schedule().items()):
+            if date > self.change_date:
+                break
+            rate = value
+        return rate
+
+    def current_installment(self) -> float:
+        """Installment (total for equal installments, capital for decreasing
+        installments) due at the first installment date after change date.
+        If not set by user, installment calculated in closed form from balance
+        before change."""
+        dates = self.remaining_dates()
+        if self.decreasing_installments:
+            installments = self.schedule.capital_installments_schedule_for_decreasing_installments()
+        else:
+            installments = self.schedule.total_installments_schedule_for_fixed_installments()
+        installment = installments.get(dates[0], 0) if dates else 0
+        if installment and installment > 0:
+            return installment
+        balance = self.balance_before_change()
+        if self.decreasing_installments:
+            return decreasing_installment(balance, len(dates))
+        return annuity_installment(
+            balance, periodic_rate(self.rate_before_change(), self.months()), len(dates))
+
+    def has_irregular_cash_flows(self) -> bool:
+        """Checks if balance after change date depends on anything else than
+        regular installments."""
+        snapshot = self.schedule.snapshot
+        change_date = self.change_date
+        collateral_set_date = self.schedule.collateral_set_date()
+        first_remaining = len(self.schedule.basic_installment_dates_list()) - len(self.remaining_dates())
+        return (any(tranche.tranche_date > change_date for tranche in snapshot.tranches)
+                or any(repayment.repayment_date >= change_date
+                       for repayment in snapshot.early_repayments)
+                or any(rate.interest_rate_start_date > change_date
+                       for rate in snapshot.interest_rates)
+                or bool(self.schedule.collateral_rate and collateral_set_date
+                        and collateral_set_date > change_date)
+                or first_remaining < self.schedule.grace_period)
+
+    def solve(self, action) -> dict:
+        """Returns new installment and number of installments after change for
+        given RepaymentAction."""
+        dates = self.remaining_dates()
+        if not dates:
+            raise ValueError(_("Data zmiany przypada po terminie ostatniej raty."))
+        balance = max(self.balance_before_change() - self.repayment_amount, 0)
+        rate = periodic_rate(self.interest_rate if self.interest_rate is not None
+                             else self.rate_before_change(), self.months())
+        if balance == 0:
+            # Credit repaid (before change date or by early repayment)
+            return {"balance": 0, "rate": rate, "installment": 0, "periods": 0}
+        if action == RepaymentAction.LOWER_PAYMENT:
+            periods = len(dates)
+            installment = (decreasing_installment(balance, periods)
+                           if self.decreasing_installments
+                           else annuity_installment(balance, rate, periods))
+        else:
+            installment = self.current_installment()
+            periods = (decreasing_periods(balance, installment)
+                       if self.decreasing_installments
+                       else annuity_periods(balance, rate, installment))
+        return {"balance": balance, "rate": rate, "installment": installment,
+                "periods": periods}
+
+    def engine_schedule(self, action, installment) -> list:
+        """Returns rows of schedule after change date calculated by the full
+        credit engine from credit data with hypothetical records added."""
+        from .views import CreditSchedule
+
+        new_installment = ({"capital_installment": installment}
+                           if self.decreasing_installments
+                           else {"total_installment": installment}
+                           ) if action == RepaymentAction.LOWER_PAYMENT else {}
+        snapshot = self.schedule.snapshot
+        changes = {}
+        if self.repayment_amount:
+            repayment = CreditEarlyRepayment(
+                user=self.credit.user, credit=self.credit,
+                repayment_amount=self.repayment_amount,
+                repayment_date=self.change_date, repayment_action=action,
+                **new_installment)
+            changes["early_repayments"] = tuple(sorted(
+                snapshot.early_repayments + (repayment,),
+                key=lambda record: record.repayment_date))
+        if self.interest_rate is not None:
+            interest_rate = CreditInterestRate(
+                user=self.credit.user, credit=self.credit,
+                interest_rate=self.interest_rate,
+                interest_rate_start_date=self.change_date, **new_installment)
+            changes["interest_rates"] = tuple(sorted(
+                snapshot.interest_rates + (interest_rate,),
+                key=lambda record: record.interest_rate_start_date))
+        simulated = CreditSchedule(None, self.credit.id,
+                                   snapshot=dataclasses.replace(snapshot, **changes),
+                                   cache_version=self.schedule.cache_version,
+                                   use_cache=False)
+        table = simulated.credit_table()
+        return [dict(zip(SIMULATION_COLUMNS, row))
+                for row in zip(*(table[column].tolist() for column in SIMULATION_COLUMNS))
+                if row[0] > self.change_date]
+
+    def closed_form_rows(self, action) -> tuple:
+        """Returns solution (see solve) and rows of schedule after change
+        date calculated in closed form for given RepaymentAction."""
+        solution = self.solve(action)
+        rows = closed_form_schedule(
+            self.extended_dates(solution["periods"]), solution["balance"],
+            solution["rate"], solution["installment"], solution["periods"],
+            self.decreasing_installments)
+        return solution, rows
+
+    def simulate(self, action) -> dict:
+        """Returns simulated schedule after change date and its totals
+        (compared with schedule of saved credit data) for given RepaymentAction.
+
+        Interest savings are compared with schedule calculated the same way
+        (in closed form without changes or by the credit engine), so that
+        both use the same day count."""
+        closed_form = not self.has_irregular_cash_flows()
+        if closed_form:
+            solution, rows = self.closed_form_rows(action)
+            base_rows = dataclasses.replace(
+                self, repayment_amount=0, interest_rate=None).closed_form_rows(action)[1]
+            base_interest = sum(row["Rata odsetkowa"] for row in base_rows)
+        else:
+            solution = self.solve(action)
+            rows = self.engine_schedule(action, round(solution["installment"], 2))
+            table = self.schedule.credit_table()
+            base_interest = sum(interest for date, interest
+                                in zip(table["Data"], table["Rata odsetkowa"])
+                                if date > self.change_date)
+        interest = sum(row["Rata odsetkowa"] for row in rows)
+        installments = [row for row in rows if row["Rata całkowita"] > 0]
+        totals = {
+            "Wysokość raty": round(solution["installment"], 2),
+            "Liczba rat": len(installments),
+            "Data ostatniej raty": installments[-1]["Data"] if installments else None,
+            "Łączna rata odsetkowa": round(interest, 2),
+            "Razem płatność": round(sum(row["Rata całkowita"] for row in rows)
+                                    + self.repayment_amount, 2),
+            "Oszczędność odsetek": round(base_interest - interest, 2),
+            "Obliczenia analityczne": closed_form,
+        }
+        return {"schedule": rows, "totals": totals}
+
+    def compare(self) -> dict:
+        """Returns simulations for all repayment actions (action: simulation)."""
+        return {str(action): self.simulate(action) for action in RepaymentAction}
@@ -0,0 +1,68 @@
+from __future__ import annotations
+import dataclasses
+
+from django.db.models import Prefetch
+
+from .models import (Credit, CreditTranche, CreditInterestRate,
+                     CreditInsurance, CreditCollateral, CreditAdditionalCost,
+                     CreditEarlyRepayment)
+
+
+@dataclasses.dataclass(frozen=True)
+class CreditSnapshot:
+    """Read-only copy of credit and all its related records.
+    Related records are sorted by date and stored as tuples so that credit
+    engine (CreditSchedule) never has to query database again."""
+    credit: Credit
+    tranches: tuple = ()
+    interest_rates: tuple = ()
+    insurances: tuple = ()
+    collaterals: tuple = ()
+    additional_costs: tuple = ()
+    early_repayments: tuple = ()
+
+    @property
+    def collateral(self) -> CreditCollateral | None:
+        """First collateral set for the credit (if any)."""
+        return self.collaterals[0] if self.collaterals else None
+
+
+def credit_snapshot_queryset(queryset=None):
+    """Returns queryset of credits with all related records prefetched
+    (one query for credits and one query for each related model)."""
+    if queryset is None:
+        queryset = Credit.objects.all()
+    return queryset.select_related("user").prefetch_related(
+        Prefetch("credittranche_set",
+                 queryset=CreditTranche.objects.order_by("tranche_date")),
+        Prefetch("creditinterestrate_set",
+                 queryset=CreditInterestRate.objects.order_by("interest_rate_start_date")),
+        Prefetch("creditinsurance_set",
+                 queryset=CreditInsurance.objects.order_by("start_date")),
+        Prefetch("creditcollateral_set",
+                 queryset=CreditCollateral.objects.order_by("collateral_set_date")),
+        Prefetch("creditadditionalcost_set",
+                 queryset=CreditAdditionalCost.objects.order_by("cost_payment_date")),
+        Prefetch("creditearlyrepayment_set",
+                 queryset=CreditEarlyRepayment.objects.order_by("repayment_date")),
+    )
+
+
+def snapshot_from_credit(credit: Credit) -> CreditSnapshot:
+    """Builds snapshot from credit fetched with credit_snapshot_queryset."""
+    return CreditSnapshot(
+        credit=credit,
+        tranches=tuple(credit.credittranche_set.all()),
+        interest_rates=tuple(credit.creditinterestrate_set.all()),
+        insurances=tuple(credit.creditinsurance_set.all()),
+        collaterals=tuple(credit.creditcollateral_set.all()),
+        additional_costs=tuple(credit.creditadditionalcost_set.all()),
+        early_repayments=tuple(credit.creditearlyrepayment_set.all()),
+    )
+
+
+def load_credit_snapshot(pk) -> CreditSnapshot:
+    """Returns snapshot of credit with given id.
+    Raises Credit.DoesNotExist if there is no such credit."""
+    credit = credit_snapshot_queryset().get(id=pk)
+    return snapshot_from_credit(credit)
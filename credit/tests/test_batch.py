@@ -0,0 +1,98 @@
+from django.core.cache import cache
+from django.test import TestCase
+
+from credit.batch import calculate_credit_schedules
+from credit.enums import Currency
+from credit.factories import (CreditFactory, CreditInterestRateFactory,
+                              CreditTrancheFactory)
+from credit.models import Credit
+from credit.views import CreditSchedule
+from user.factories import UserFactory
+
+
+class CalculateCreditSchedulesTests(TestCase):
+    """Test batch calculation of credit schedules."""
+
+    def setUp(self):
+        cache.clear()
+        self.user = UserFactory(
+            username="johndoe123", email="jd@example.com", password="testpass456")
+        self.credit = CreditFactory(user=self.user, name="Credit 1")
+        CreditTrancheFactory(user=self.user, credit=self.credit,
+                             tranche_amount=self.credit.credit_amount)
+        CreditInterestRateFactory(user=self.user, credit=self.credit)
+        self.credit_2 = CreditFactory(
+            user=self.user, name="Credit 2", credit_amount=30000,
+            tranches_in_credit="Nie", collateral_rate=0)
+        self.credit_eur = CreditFactory(
+            user=self.user, name="Credit 3", currency=Currency.EUR,
+            tranches_in_credit="Nie", collateral_rate=0)
+
+    def tearDown(self):
+        cache.clear()
+
+    def test_schedules_equal_to_schedules_calculated_one_by_one(self):
+        """Test if schedule of each credit is the same as calculated
+        separately."""
+        portfolio = calculate_credit_schedules(Credit.objects.filter(user=self.user))
+        self.assertEqual(len(portfolio.schedules), 3)
+        cache.clear()
+        for credit in (self.credit, self.credit_2, self.credit_eur):
+            expected = CreditSchedule(None, credit.id)
+            self.assertTrue(
+                portfolio.tables()[credit.id].equals(expected.credit_table()))
+            self.assertEqual(portfolio.schedules[credit.id].sum_for_table_columns(),
+                             expected.sum_for_table_columns())
+
+    def test_credits_loaded_in_constant_number_of_queries(self):
+        """Test if number of queries does not depend on number of credits
+        (credit ids, credits with users and one query for each related model)."""
+        with self.assertNumQueries(8):
+            calculate_credit_schedules(Credit.objects.filter(user=self.user))
+
+    def test_schedules_stored_in_cache(self):
+        """Test if calculated schedules are stored in cache and reused."""
+        calculate_credit_schedules(Credit.objects.filter(user=self.user))
+        portfolio = calculate_credit_schedules(Credit.objects.filter(user=self.user))
+        self.assertTrue(all(schedule.from_cache
+                            for schedule in portfolio.schedules.values()))
+
+    def test_totals_calculated_for_each_currency(self):
+        """Test if portfolio totals are summed separately for each currency
+        and XIRR is weighted by credit amount received."""
+        portfolio = calculate_credit_schedules(Credit.objects.filter(user=self.user))
+        pln = [portfolio.schedules[credit.id].sum_for_table_columns()
+               for credit in (self.credit, self.credit_2)]
+        self.assertEqual(set(portfolio.totals), {Currency.PLN, Currency.EUR})
+        self.assertEqual(portfolio.totals[Currency.PLN]["Liczba kredytów"], 2)
+        self.assertEqual(portfolio.totals[Currency.EUR]["Liczba kredytów"], 1)
+        self.assertEqual(
+            portfolio.totals[Currency.PLN]["Łączna rata odsetkowa"],
+            round(sum(totals["Łączna rata odsetkowa"] for totals in pln), 2))
+        self.assertEqual(
+            portfolio.totals[Currency.PLN]["Razem poniesione koszty"],
+            round(sum(totals["Razem poniesione koszty"] for totals in pln), 2))
+        xirrs = [portfolio.schedules[credit.id].xirr()
+                 for credit in (self.credit, self.credit_2)]
+        amounts = [totals["Otrzymana kwota kredytu"] for totals in pln]
+        self.assertAlmostEqual(
+            portfolio.totals[Currency.PLN]["Ważony XIRR (%)"],
+            sum(x * a for x, a in zip(xirrs, amounts)) / sum(amounts) * 100,
+            places=2)
+
+    def test_schedules_calculated_in_process_pool(self):
+        """Test if schedules calculated in pool of processes are the same as
+        calculated in current process."""
+        expected = calculate_credit_schedules(Credit.objects.filter(user=self.user))
+        cache.clear()
+        portfolio = calculate_credit_schedules(
+            Credit.objects.filter(user=self.user), processes=2)
+        self.assertEqual(portfolio.totals, expected.totals)
+        for credit_id, table in expected.tables().items():
+            self.assertTrue(portfolio.tables()[credit_id].equals(table))
+
+    def test_empty_queryset(self):
+        """Test if no credits give empty portfolio."""
+        portfolio = calculate_credit_schedules(Credit.objects.none())
+        self.assertEqual(portfolio.schedules, {})
+        self.assertEqual(portfolio.totals, {})
@@ -0,0 +1,232 @@
+import datetime
+
+from django.test import SimpleTestCase
+
+from dateutil.relativedelta import relativedelta
+
+from credit.engine import (amortization_kernel, day_count_periods,
+                           from_grosze, kernel_inputs, payment_calendar,
+                           resume_point, round_grosze, solve_xirr, to_grosze)
+
+
+class DayCountPeriodsTests(SimpleTestCase):
+    """Test day count periods used by amortization kernel."""
+
+    def test_period_split_at_turn_of_the_leap_year(self):
+        """Test if period is split into days of regular and leap year."""
+        dates = [datetime.date(2019, 12, 15), datetime.date(2020, 1, 15)]
+        periods = day_count_periods(dates)
+        self.assertEqual(periods["days"].tolist(), [0, 31])
+        self.assertEqual(periods["previous year days"][1], 17)
+        self.assertEqual(periods["current year days"][1], 14)
+        self.assertFalse(periods["previous leap"][1])
+        self.assertTrue(periods["current leap"][1])
+
+    def test_period_within_one_year(self):
+        """Test if period within one year is counted in actual days."""
+        dates = [datetime.date(2020, 2, 15), datetime.date(2020, 3, 15)]
+        periods = day_count_periods(dates)
+        self.assertEqual(periods["days"][1], 29)
+        self.assertTrue(periods["previous leap"][1])
+        self.assertTrue(periods["current leap"][1])
+
+
+class AmortizationKernelTests(SimpleTestCase):
+    """Test amortization kernel."""
+
+    def setUp(self):
+        self.dates = [datetime.date(2021, 1, 1), datetime.date(2021, 2, 1),
+                      datetime.date(2021, 3, 1), datetime.date(2021, 4, 1)]
+        self.kwargs = {
+            "installment_dates": set(self.dates[1:]),
+            "initial_date": self.dates[0],
+            "initial_balance": 3000,
+            "start_of_credit": self.dates[0],
+            "decreasing_installments": True,
+        }
+
+    def test_decreasing_installments(self):
+        """Test if interest is calculated on balance for actual number of days."""
+        results = amortization_kernel(
+            dates=self.dates,
+            payments_from_bank=[3000, 0, 0, 0],
+            early_repayments=[0, 0, 0, 0],
+            interest_rates=[3.65, 3.65, 3.65, 3.65],
+            capital_installments=[0, 1000, 1000, 1000],
+            total_installments=[0, 0, 0, 0],
+            **self.kwargs)
+        self.assertEqual(results["interest installment"], [0, 9.3, 5.6, 3.1])
+        self.assertEqual(results["total installment"], [0, 1009.3, 1005.6, 1003.1])
+        self.assertEqual(results["credit balance"], [3000, 2000, 1000, 0])
+
+    def test_days_of_additional_cash_flow_added_to_next_installment(self):
+        """Test if cash flow not related to credit balance (e.g. insurance)
+        does not change interest installments."""
+        dates = self.dates[:2] + [datetime.date(2021, 2, 10)] + self.dates[2:]
+        results = amortization_kernel(
+            dates=dates,
+            payments_from_bank=[3000, 0, 0, 0, 0],
+            early_repayments=[0, 0, 0, 0, 0],
+            interest_rates=[3.65, 3.65, 0, 3.65, 3.65],
+            capital_installments=[0, 1000, 0, 1000, 1000],
+            total_installments=[0, 0, 0, 0, 0],
+            **self.kwargs)
+        self.assertEqual(results["interest installment"], [0, 9.3, None, 5.6, 3.1])
+        self.assertEqual(results["credit balance"], [3000, 2000, 2000, 1000, 0])
+
+    def test_balance_of_fractional_amounts_is_exact(self):
+        """Test if amounts not representable in binary floating point
+        (e.g. 0.1) are summed without rounding errors."""
+        results = amortization_kernel(
+            dates=self.dates,
+            payments_from_bank=[3000.3, 0, 0, 0],
+            early_repayments=[0, 0.1, 0.1, 0],
+            interest_rates=[0, 0, 0, 0],
+            capital_installments=[0, 1000.1, 1000.1, 1000.1],
+            total_installments=[0, 0, 0, 0],
+            **{**self.kwargs, "initial_balance": 3000.3})
+        self.assertEqual(results["credit balance"], [3000.3, 2000.1, 999.9, 0])
+        self.assertEqual(results["capital installment"][-1], 999.9)
+
+
+class MoneyTests(SimpleTestCase):
+    """Test conversion of money amounts to grosze."""
+
+    def test_amounts_rounded_half_away_from_zero(self):
+        """Test if amounts are rounded to whole grosze half away from zero."""
+        self.assertEqual(to_grosze([1.15, 0.125, -0.125, 2.675]).tolist(),
+                         [115, 13, -13, 268])
+        self.assertEqual(round_grosze(12.5), 13)
+        self.assertEqual(round_grosze(-12.5), -13)
+        self.assertEqual(round_grosze(12.49), 12)
+
+    def test_grosze_converted_back_to_amounts(self):
+        """Test if conversion back gives amounts rounded to 2 decimal places."""
+        amounts = [0.1, 0.2, 1234.56, None]
+        self.assertEqual(from_grosze([10, 20, 123456, None]), amounts)
+        self.assertEqual(from_grosze(to_grosze(amounts[:3]).tolist()), amounts[:3])
+
+
+class ResumeCalculationTests(SimpleTestCase):
+    """Test amortization kernel resumed from checkpoint of previous calculation."""
+
+    def setUp(self):
+        dates = [datetime.date(2021, 1, 1) + relativedelta(months=i) for i in range(25)]
+        self.arguments = {
+            "dates": dates,
+            "payments_from_bank": [24000] + [0] * 24,
+            "early_repayments": [0] * 25,
+            "interest_rates": [5] * 25,
+            "capital_installments": [0] + [1000] * 24,
+            "total_installments": [0] * 25,
+            "installment_dates": set(dates[1:]),
+            "initial_date": dates[0],
+            "initial_balance": 24000,
+            "start_of_credit": dates[0],
+            "decreasing_installments": True,
+        }
+
+    def previous_calculation(self):
+        checkpoints = []
+        results = amortization_kernel(**self.arguments, checkpoints=checkpoints)
+        return {"inputs": kernel_inputs(**self.arguments), "results": results,
+                "checkpoints": checkpoints}
+
+    def assert_resumed_equal_to_full(self, arguments, expected_index):
+        previous = self.previous_calculation()
+        resume = resume_point(previous, kernel_inputs(**arguments))
+        self.assertEqual(resume["index"], expected_index)
+        checkpoints = []
+        resumed = amortization_kernel(**arguments, checkpoints=checkpoints,
+                                      resume=resume)
+        full_checkpoints = []
+        full = amortization_kernel(**arguments, checkpoints=full_checkpoints)
+        self.assertEqual(resumed, full)
+        self.assertEqual(checkpoints, full_checkpoints)
+
+    def test_resumed_before_changed_early_repayment(self):
+        """Test if calculation is resumed at the date of changed early
+        repayment and gives the same results as full calculation."""
+        arguments = dict(self.arguments, early_repayments=[0] * 20 + [3000] + [0] * 4)
+        self.assert_resumed_equal_to_full(arguments, 20)
+
+    def test_resumed_before_period_preceding_changed_interest_rate(self):
+        """Test if period preceding changed interest rate is recalculated
+        (interest rate of following period is used between installments)."""
+        arguments = dict(self.arguments, interest_rates=[5] * 18 + [7] * 7)
+        self.assert_resumed_equal_to_full(arguments, 17)
+
+    def test_resumed_before_added_date(self):
+        """Test if calculation is resumed at the position of cash flow at
+        new date."""
+        dates = list(self.arguments["dates"])
+        dates.insert(11, datetime.date(2021, 11, 15))
+        arguments = dict(
+            self.arguments, dates=dates,
+            payments_from_bank=self.arguments["payments_from_bank"] + [0],
+            early_repayments=[0] * 11 + [2000] + [0] * 14,
+            interest_rates=[5] * 26,
+            capital_installments=[0] + [1000] * 10 + [0] + [1000] * 14,
+            total_installments=[0] * 26)
+        self.assert_resumed_equal_to_full(arguments, 11)
+
+    def test_not_resumed_if_initial_balance_changed(self):
+        """Test if calculation starts from the beginning when initial
+        conditions changed."""
+        previous = self.previous_calculation()
+        arguments = dict(self.arguments, initial_balance=25000)
+        self.assertIsNone(resume_point(previous, kernel_inputs(**arguments)))
+        self.assertIsNone(resume_point(None, kernel_inputs(**arguments)))
+
+
+class SolveXirrTests(SimpleTestCase):
+    """Test XIRR solver."""
+
+    def test_xirr_of_cash_flows(self):
+        dates = [datetime.date(2021, 1, 1), datetime.date(2022, 1, 1),
+                 datetime.date(2023, 1, 1)]
+        self.assertAlmostEqual(solve_xirr(dates[:2], [1000, -1100]), 0.1)
+        self.assertAlmostEqual(solve_xirr(dates, [1000, -50, -1050]), 0.05)
+
+    def test_xirr_not_found(self):
+        """Test if None is returned when solution does not exist or is not
+        found within iteration limit."""
+        dates = [datetime.date(2021, 1, 1), datetime.date(2022, 1, 1)]
+        self.assertIsNone(solve_xirr(dates, [1000, 1100]))
+        self.assertIsNone(solve_xirr(dates, [1000, -1200], max_iterations=1))
+
+
+class PaymentCalendarTests(SimpleTestCase):
+    """Test calendar of installment and insurance payment dates."""
+
+    def test_payment_at_day_of_month(self):
+        """Test if payment day is moved to the last day of shorter month."""
+        calendar = payment_calendar(datetime.date(2020, 1, 31), 1, 3, 31)
+        self.assertEqual(calendar.tolist(), [datetime.date(2020, 2, 29),
+                                             datetime.date(2020, 3, 31),
+                                             datetime.date(2020, 4, 30)])
+
+    def test_payment_at_last_day_of_month(self):
+        """Test if payment day 0 gives the last day of month in which
+        period ends."""
+        calendar = payment_calendar(datetime.date(2021, 1, 1), 3, 2, 0)
+        self.assertEqual(calendar.tolist(), [datetime.date(2021, 3, 31),
+                                             datetime.date(2021, 6, 30)])
+
+    def test_calendar_equal_to_relativedelta(self):
+        """Test if calendar gives the same dates as relativedelta for all
+        frequencies and payment days."""
+        start = datetime.date(2019, 11, 30)
+        for months in (1, 3, 6, 12):
+            for day in range(1, 32):
+                self.assertEqual(
+                    payment_calendar(start, months, 40, day).tolist(),
+                    [start + relativedelta(months=months * i, day=day)
+                     for i in range(1, 41)])
+
+    def test_calendar_cached_and_read_only(self):
+        """Test if calendar with the same terms is calculated once."""
+        calendar = payment_calendar(datetime.date(2022, 5, 1), 1, 360, 10)
+        self.assertIs(payment_calendar(datetime.date(2022, 5, 1), 1, 360, 10), calendar)
+        with self.assertRaises(ValueError):
+            calendar[0] = calendar[1]
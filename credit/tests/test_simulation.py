@@ -0,0 +1,197 @@
+import datetime
+
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase
+from django.urls import reverse
+
+from credit.enums import RepaymentAction
+from credit.factories import (CreditEarlyRepaymentFactory, CreditFactory,
+                              CreditTrancheFactory)
+from credit.models import CreditEarlyRepayment, CreditInterestRate
+from credit.simulation import (CreditSimulation, annuity_installment,
+                               annuity_periods, closed_form_schedule,
+                               decreasing_periods, periodic_rate)
+from credit.views import CreditSchedule
+from user.factories import UserFactory
+
+
+class ClosedFormTests(SimpleTestCase):
+    """Test closed-form annuity and decreasing installment formulas."""
+
+    def test_annuity_installment_and_periods_are_inverse(self):
+        """Test if number of periods calculated for annuity installment
+        equals number of periods used to calculate installment."""
+        rate = periodic_rate(6, 1)
+        installment = annuity_installment(100000, rate, 120)
+        self.assertAlmostEqual(installment, 1110.21, places=2)
+        self.assertEqual(annuity_periods(100000, rate, installment), 120)
+
+    def test_annuity_without_interest(self):
+        """Test if balance is divided equally when interest rate is zero."""
+        self.assertEqual(annuity_installment(1200, 0, 12), 100)
+        self.assertEqual(annuity_periods(1200, 0, 100), 12)
+
+    def test_installment_not_covering_interest(self):
+        """Test if error is raised when credit would never be repaid."""
+        with self.assertRaises(ValueError):
+            annuity_periods(100000, periodic_rate(12, 1), 1000)
+
+    def test_decreasing_periods(self):
+        """Test if last (lower) capital installment counts as period."""
+        self.assertEqual(decreasing_periods(1000, 300), 4)
+
+    def test_periods_of_zero_installment(self):
+        """Test if error is raised when installment is not positive."""
+        with self.assertRaises(ValueError):
+            decreasing_periods(1000, 0)
+        with self.assertRaises(ValueError):
+            annuity_periods(1000, 0, 0)
+
+    def test_closed_form_schedule_repays_balance(self):
+        """Test if balance is fully repaid with last installment."""
+        dates = [datetime.date(2021, month, 1) for month in range(1, 13)]
+        rate = periodic_rate(6, 1)
+        installment = annuity_installment(12000, rate, 12)
+        rows = closed_form_schedule(dates, 12000, rate, installment, 12, False)
+        self.assertEqual(len(rows), 12)
+        self.assertEqual(rows[0]["Rata odsetkowa"], 60)
+        self.assertEqual(rows[-1]["Saldo"], 0)
+        self.assertAlmostEqual(sum(row["Rata kapitałowa"] for row in rows), 12000)
+
+
+class CreditSimulationTests(TestCase):
+    """Test what-if simulation of credit changes."""
+
+    def setUp(self):
+        cache.clear()
+        self.user = UserFactory(
+            username="johndoe123", email="jd@example.com", password="testpass456")
+        self.credit = CreditFactory(
+            user=self.user, tranches_in_credit="Nie", collateral_required="Nie",
+            collateral_rate=0)
+        self.change_date = datetime.date(2021, 6, 15)
+
+    def tearDown(self):
+        cache.clear()
+
+    def simulation(self, **kwargs):
+        return CreditSimulation(schedule=CreditSchedule(None, self.credit.id),
+                                change_date=self.change_date, **kwargs)
+
+    def test_closed_form_close_to_credit_engine(self):
+        """Test if closed-form schedule gives the same installments as the
+        full credit engine (interest within 1% due to day count)."""
+        for installment_type, total_installment in (("Raty malejące", 0),
+                                                    ("Raty równe", 1200)):
+            self.credit.installment_type = installment_type
+            self.credit.total_installment = total_installment
+            self.credit.save()
+            simulation = self.simulation(repayment_amount=10000)
+            for action in RepaymentAction:
+                results = simulation.simulate(action)
+                self.assertTrue(results["totals"]["Obliczenia analityczne"])
+                engine_rows = simulation.engine_schedule(
+                    action, results["totals"]["Wysokość raty"])
+                installments = [row for row in engine_rows if row["Rata całkowita"] > 0]
+                self.assertEqual(results["totals"]["Liczba rat"], len(installments))
+                self.assertEqual(results["totals"]["Data ostatniej raty"],
+                                 installments[-1]["Data"])
+                engine_interest = sum(row["Rata odsetkowa"] for row in engine_rows)
+                self.assertLess(
+                    abs(results["totals"]["Łączna rata odsetkowa"] - engine_interest),
+                    engine_interest * 0.01)
+
+    def test_shorter_payment_and_lower_payment(self):
+        """Test if shortening keeps installment and lowering keeps period."""
+        simulation = self.simulation(repayment_amount=10000)
+        shorter = simulation.simulate(RepaymentAction.SHORTER_PAYMENT)["totals"]
+        lower = simulation.simulate(RepaymentAction.LOWER_PAYMENT)["totals"]
+        self.assertEqual(shorter["Wysokość raty"], self.credit.capital_installment)
+        self.assertLess(lower["Wysokość raty"], self.credit.capital_installment)
+        self.assertLess(shorter["Liczba rat"], lower["Liczba rat"])
+        self.assertGreater(shorter["Oszczędność odsetek"], lower["Oszczędność odsetek"])
+
+    def test_no_change_saves_no_interest(self):
+        """Test if simulation without changes shows no interest savings
+        (closed form compared with closed form)."""
+        for installment_type, total_installment in (("Raty malejące", 0),
+                                                    ("Raty równe", 1200)):
+            self.credit.installment_type = installment_type
+            self.credit.total_installment = total_installment
+            self.credit.save()
+            results = self.simulation(repayment_amount=0).compare()
+            for action in RepaymentAction:
+                totals = results[str(action)]["totals"]
+                self.assertTrue(totals["Obliczenia analityczne"])
+                self.assertEqual(totals["Oszczędność odsetek"], 0)
+
+    def test_simulation_of_repaid_credit(self):
+        """Test if credit fully repaid before change date (installment
+        calculated automatically) has no remaining installments."""
+        self.credit.capital_installment = 0
+        self.credit.save()
+        repayment_date = datetime.date(2021, 2, 1)
+        table = CreditSchedule(None, self.credit.id).credit_table()
+        balance = [balance for date, balance in zip(table["Data"], table["Saldo"])
+                   if date <= repayment_date][-1]
+        CreditEarlyRepaymentFactory(user=self.user, credit=self.credit,
+                                    repayment_amount=balance,
+                                    repayment_date=repayment_date)
+        cache.clear()
+        results = self.simulation().compare()
+        for action in RepaymentAction:
+            totals = results[str(action)]["totals"]
+            self.assertEqual(totals["Wysokość raty"], 0)
+            self.assertEqual(totals["Liczba rat"], 0)
+            self.assertEqual(totals["Oszczędność odsetek"], 0)
+
+    def test_irregular_cash_flows_calculated_by_credit_engine(self):
+        """Test if full credit engine is used when credit has cash flows
+        after change date."""
+        self.credit.tranches_in_credit = "Tak"
+        self.credit.save()
+        CreditTrancheFactory(user=self.user, credit=self.credit, tranche_amount=30000,
+                             tranche_date=datetime.date(2020, 2, 1))
+        CreditTrancheFactory(user=self.user, credit=self.credit, tranche_amount=30000,
+                             tranche_date=datetime.date(2021, 9, 1))
+        results = self.simulation(interest_rate=8).compare()
+        for action in RepaymentAction:
+            self.assertFalse(results[str(action)]["totals"]["Obliczenia analityczne"])
+
+    def test_simulation_does_not_change_database(self):
+        """Test if hypothetical records are not saved."""
+        self.simulation(repayment_amount=5000, interest_rate=3).compare()
+        self.assertEqual(CreditEarlyRepayment.objects.count(), 0)
+        self.assertEqual(CreditInterestRate.objects.count(), 0)
+
+    def test_simulate_credit_view(self):
+        """Test if simulation is returned as JSON for each repayment action."""
+        self.client.force_login(self.user)
+        response = self.client.get(
+            reverse("credit:simulate-credit", args=[str(self.credit.id)]),
+            {"change_date": "2021-06-15", "repayment_amount": 10000})
+        self.assertEqual(response.status_code, 200)
+        results = response.json()
+        self.assertEqual(set(results), set(RepaymentAction.values))
+        self.assertEqual(
+            results[RepaymentAction.SHORTER_PAYMENT]["schedule"][0]["Data"],
+            "2021-07-01")
+
+    def test_simulate_credit_view_with_invalid_data(self):
+        """Test if missing changes are reported as errors."""
+        self.client.force_login(self.user)
+        response = self.client.get(
+            reverse("credit:simulate-credit", args=[str(self.credit.id)]),
+            {"change_date": "2021-06-15"})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("__all__", response.json()["errors"])
+
+    def test_simulate_credit_view_of_another_user(self):
+        """Test if user cannot simulate credit of another user."""
+        other_user = UserFactory(
+            username="janedoe123", email="jane@example.com", password="testpass789")
+        self.client.force_login(other_user)
+        response = self.client.get(
+            reverse("credit:simulate-credit", args=[str(self.credit.id)]),
+            {"change_date": "2021-06-15", "repayment_amount": 10000})
+        self.assertRedirects(response, reverse("login"), status_code=302)
@@ -1,13 +1,21 @@
+import dataclasses
 import datetime
+import io
+import json
 import logging
+import re
 import shutil
 import time
 import os
+from unittest import mock
 
 from django.conf import settings
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
 from django.test import TestCase, override_settings
 from django.urls import reverse
+import openpyxl
 from parameterized import parameterized
 from reportlab.pdfgen.canvas import Canvas
 
@@ -15,6 +23,7 @@ from reportlab.pdfgen.canvas import Canvas
 from access.enums import Access
 from connection.factories import AttachmentFactory, CounterpartyFactory
 from connection.models import Attachment, Counterparty
+from credit import jobs
 from credit.factories import (CreditFactory, CreditAdditionalCostFactory,
                               CreditCollateralFactory, CreditInsuranceFactory,
                               CreditInterestRateFactory, CreditTrancheFactory,
@@ -26,6 +35,8 @@ from credit.forms import (CreditForm, CreditInsuranceForm,
 from credit.models import (Credit, CreditAdditionalCost, CreditCollateral,
                            CreditInsurance, CreditInterestRate, CreditTranche,
                            CreditEarlyRepayment)
+from credit.snapshot import load_credit_snapshot
+from credit.views import CreditSchedule
 from user.factories import UserFactory, ProfileFactory
 from user.models import Profile
 
@@ -514,6 +525,25 @@ class DownloadCreditTests(TestCase):
                     args=[self.credit.id]))
         self.assertEqual(response_get.status_code, 200)
 
+    @override_settings(MEDIA_ROOT=settings.TEST_ROOT)
+    def test_download_credit_streams_schedule_table(self):
+        """Test if excel file with credit schedule is streamed without saving
+        it in MEDIA_ROOT."""
+        self.client.force_login(self.user)
+        response_get = self.client.get(
+            reverse("credit:download-credit",
+                    args=[self.credit.id]))
+        self.assertTrue(response_get.streaming)
+        workbook = openpyxl.load_workbook(
+            io.BytesIO(b"".join(response_get.streaming_content)))
+        rows = list(workbook.active.values)
+        table = CreditSchedule(None, self.credit.id).credit_table()
+        self.assertEqual(list(rows[0][1:]), list(table.columns))
+        self.assertEqual(len(rows), len(table) + 1)
+        self.assertEqual(rows[1][2].date(), table["Data"][0])
+        self.assertFalse(os.path.exists(
+            os.path.join(settings.MEDIA_ROOT, f"{self.user.id}_credit")))
+
     @override_settings(MEDIA_ROOT=settings.TEST_ROOT)
     def test_download_credit_forced_logout_if_security_breach(self):
         """Attempt to download credit of another user is forbidden and triggers logout."""
@@ -526,8 +556,10 @@ class DownloadCreditTests(TestCase):
                     args=[self.test_credit.id]),
             follow=True)
         self.assertEqual(response_get.status_code, 200)
+        self.assertEqual(response_get["Content-Disposition"],
+                         "inline; filename=credit.xlsx")
         path = os.path.join(settings.MEDIA_ROOT, str(str(self.test_user.id) +"_credit"), "credit.xlsx")
-        self.assertTrue(os.path.exists(path))
+        self.assertFalse(os.path.exists(path))
         self.client.logout()
 
         # Attempt to download credit of self.test_user by self.user (forbidden -> logout)
@@ -4617,3 +4649,483 @@ class CreditEarlyRepaymentTests(TestCase):
 
         self.assertNotIn("_auth_user_id", self.client.session)
         self.assertEqual(CreditEarlyRepayment.objects.count(), 2)
+
+
+class CreditScheduleTests(TestCase):
+    """Test calculation engine of credit repayment schedule."""
+
+    @override_settings(MEDIA_ROOT=settings.TEST_ROOT)
+    def setUp(self):
+        if not os.path.exists(settings.TEST_ROOT):
+            os.mkdir(settings.TEST_ROOT)
+
+        self.user = UserFactory(
+            username="johndoe123", email="jd@example.com", password="testpass456")
+        self.credit = CreditFactory(user=self.user)
+        self.tranche = CreditTrancheFactory(user=self.user, credit=self.credit)
+        additional_tranche = self.credit.credit_amount - self.tranche.tranche_amount
+        self.tranche_2 = CreditTrancheFactory(
+            user=self.user, credit=self.credit, tranche_amount=additional_tranche,
+            tranche_date=datetime.date(2020, 7, 15))
+        self.interest_rate = CreditInterestRateFactory(user=self.user, credit=self.credit)
+        self.insurance = CreditInsuranceFactory(user=self.user, credit=self.credit)
+        self.collateral = CreditCollateralFactory(user=self.user, credit=self.credit)
+        self.cost = CreditAdditionalCostFactory(user=self.user, credit=self.credit)
+        self.repayment = CreditEarlyRepaymentFactory(user=self.user, credit=self.credit)
+
+    @override_settings(MEDIA_ROOT=settings.TEST_ROOT)
+    def tearDown(self):
+        if os.path.exists(settings.TEST_ROOT):
+            shutil.rmtree(settings.TEST_ROOT)
+
+    @override_settings(MEDIA_ROOT=settings.TEST_ROOT)
+    def test_cash_flows_calculated_once_per_schedule(self):
+        """Test if cash flows of credit are calculated only once regardless
+        of number of schedule methods called."""
+        schedule = CreditSchedule(None, self.credit.id)
+        with mock.patch.object(
+                CreditSchedule, "credit_cash_flows_without_interest",
+                autospec=True,
+                side_effect=CreditSchedule.credit_cash_flows_without_interest
+        ) as cash_flows:
+            schedule.credit_table()
+            schedule.to_html()
+            schedule.sum_for_table_columns()
+            schedule.xirr()
+            schedule.credit_balance_schedule()
+            schedule.total_installments_schedule()
+        self.assertEqual(cash_flows.call_count, 1)
+
+    @override_settings(MEDIA_ROOT=settings.TEST_ROOT)
+    def test_credit_table_reused_by_schedule_methods(self):
+        """Test if the same table is returned on subsequent calls."""
+        schedule = CreditSchedule(None, self.credit.id)
+        table = schedule.credit_table()
+        self.assertIs(schedule.credit_table(), table)
+        self.assertEqual(
+            schedule.sum_for_table_columns()["Łączna rata kapitałowa"],
+            round(table["Rata kapitałowa"].sum(), 2))
+
+    @override_settings(MEDIA_ROOT=settings.TEST_ROOT)
+    def test_schedule_loads_credit_data_in_constant_number_of_queries(self):
+        """Test if credit with all related records is fetched in fixed number
+        of queries (credit with user and one query for each related model)
+        and schedule calculation does not query database."""
+        with self.assertNumQueries(7):
+            schedule = CreditSchedule(None, self.credit.id)
+        with self.assertNumQueries(0):
+            schedule.credit_table()
+            schedule.to_html()
+            schedule.sum_for_table_columns()
+
+        CreditInterestRateFactory(
+            user=self.user, credit=self.credit, interest_rate=7,
+            interest_rate_start_date=datetime.date(2022, 8, 1))
+        CreditEarlyRepaymentFactory(
+            user=self.user, credit=self.credit, repayment_amount=500,
+            repayment_date=datetime.date(2022, 2, 1))
+        with self.assertNumQueries(7):
+            schedule = CreditSchedule(None, self.credit.id)
+            schedule.sum_for_table_columns()
+
+    def test_snapshot_records_sorted_by_date(self):
+        """Test if related records in credit snapshot are sorted by date."""
+        CreditTrancheFactory(
+            user=self.user, credit=self.credit, tranche_amount=10,
+            tranche_date=datetime.date(2020, 2, 1))
+        snapshot = load_credit_snapshot(self.credit.id)
+        self.assertEqual(snapshot.credit, self.credit)
+        self.assertEqual(len(snapshot.tranches), 3)
+        self.assertEqual(
+            [tranche.tranche_date for tranche in snapshot.tranches],
+            sorted(tranche.tranche_date for tranche in snapshot.tranches))
+        self.assertEqual(snapshot.collateral, self.collateral)
+        self.assertEqual(snapshot.early_repayments, (self.repayment,))
+        with self.assertRaises(dataclasses.FrozenInstanceError):
+            snapshot.tranches = ()
+
+    @override_settings(MEDIA_ROOT=settings.TEST_ROOT)
+    def test_cash_flows_merged_into_columns_by_date(self):
+        """Test if each schedule is merged into its cash flow column at
+        position of its date."""
+        schedule = CreditSchedule(None, self.credit.id)
+        cash_flows = schedule.credit_cash_flows_without_interest()
+        dates = cash_flows["date"]
+        self.assertEqual(dates, schedule.dates_set())
+        for column in cash_flows.values():
+            self.assertEqual(len(column), len(dates))
+        position = dates.index(self.tranche_2.tranche_date)
+        self.assertEqual(cash_flows["payment from bank"][position],
+                         self.tranche_2.tranche_amount)
+        self.assertEqual(sum(cash_flows["payment from bank"]),
+                         sum(schedule.payments_from_bank_schedule().values()))
+
+    @override_settings(MEDIA_ROOT=settings.TEST_ROOT)
+    def test_cached_schedule_used_until_credit_changes(self):
+        """Test if cached schedule is used by new schedule instances and
+        invalidated after change of credit related record."""
+        cache.clear()
+        schedule = CreditSchedule(None, self.credit.id)
+        self.assertFalse(schedule.from_cache)
+        schedule.cache_schedule()
+        totals = schedule.sum_for_table_columns()
+
+        cached_schedule = CreditSchedule(None, self.credit.id)
+        self.assertTrue(cached_schedule.from_cache)
+        with mock.patch.object(
+                CreditSchedule, "credit_cash_flows_without_interest") as cash_flows:
+            self.assertEqual(cached_schedule.sum_for_table_columns(), totals)
+            self.assertEqual(len(cached_schedule.credit_table()),
+                             len(schedule.credit_table()))
+        cash_flows.assert_not_called()
+
+        self.repayment.repayment_amount = 2000
+        self.repayment.save()
+        changed_schedule = CreditSchedule(None, self.credit.id)
+        self.assertFalse(changed_schedule.from_cache)
+        self.assertNotEqual(changed_schedule.sum_for_table_columns(), totals)
+
+        changed_schedule.cache_schedule()
+        self.repayment.delete()
+        self.assertFalse(CreditSchedule(None, self.credit.id).from_cache)
+
+    @override_settings(MEDIA_ROOT=settings.TEST_ROOT)
+    def test_schedule_recalculated_from_changed_date(self):
+        """Test if after change of late early repayment credit balance is
+        recalculated only from the last checkpoint before the change and
+        equals full recalculation."""
+        cache.clear()
+        CreditSchedule(None, self.credit.id).credit_table()
+        late_repayment = CreditEarlyRepaymentFactory(
+            user=self.user, credit=self.credit, repayment_amount=5000,
+            repayment_date=datetime.date(2023, 6, 1))
+        schedule = CreditSchedule(None, self.credit.id)
+        table = schedule.credit_table()
+        dates = schedule.credit_balance_calculation()["date"]
+        self.assertEqual(dates[schedule.resumed_from], datetime.date(2023, 6, 1))
+
+        cache.clear()
+        full_schedule = CreditSchedule(None, self.credit.id)
+        self.assertTrue(full_schedule.credit_table().equals(table))
+        self.assertIsNone(full_schedule.resumed_from)
+
+        late_repayment.repayment_amount = 3000
+        late_repayment.save()
+        changed_schedule = CreditSchedule(None, self.credit.id)
+        self.assertEqual(
+            changed_schedule.credit_balance_calculation()["date"][changed_schedule.resumed_from],
+            datetime.date(2023, 6, 1))
+
+        uncached_schedule = CreditSchedule(None, self.credit.id, use_cache=False)
+        uncached_schedule.credit_balance_calculation()
+        self.assertIsNone(uncached_schedule.resumed_from)
+
+    @override_settings(MEDIA_ROOT=settings.TEST_ROOT)
+    def test_xirr_calculated_once_per_schedule(self):
+        """Test if XIRR is solved once and reused by totals and excel export."""
+        schedule = CreditSchedule(None, self.credit.id)
+        with mock.patch("credit.engine.solve_xirr", return_value=0.0734) as solve_xirr:
+            totals = schedule.sum_for_table_columns()
+            workbook = openpyxl.load_workbook(io.BytesIO(schedule.to_excel().read()))
+            schedule.xirr()
+        self.assertEqual(solve_xirr.call_count, 1)
+        self.assertEqual(totals["Szacunkowy XIRR (%)"], 7.34)
+        self.assertIn(("Szacunkowy XIRR (%)", 7.34),
+                      list(workbook["Podsumowanie"].values))
+
+    @override_settings(MEDIA_ROOT=settings.TEST_ROOT, CREDIT_SCHEDULE_XIRR_MAX_ITERATIONS=1)
+    def test_xirr_not_found_in_iteration_limit(self):
+        """Test if XIRR not found within iteration limit is reported as "n/a"."""
+        schedule = CreditSchedule(None, self.credit.id)
+        self.assertIsNone(schedule.xirr())
+        self.assertEqual(schedule.sum_for_table_columns()["Szacunkowy XIRR (%)"], "n/a")
+
+    @override_settings(MEDIA_ROOT=settings.TEST_ROOT)
+    def test_schedule_calculation_does_not_write_files(self):
+        """Test if calculation of schedule does not create any files."""
+        schedule = CreditSchedule(None, self.credit.id)
+        schedule.credit_table()
+        schedule.sum_for_table_columns()
+        self.assertFalse(os.path.exists(
+            os.path.join(settings.TEST_ROOT, f"{self.user.id}_credit")))
+        self.assertIsNone(schedule.trace)
+        self.assertIsNone(schedule.export_trace())
+
+    @override_settings(MEDIA_ROOT=settings.TEST_ROOT)
+    def test_calculation_trace_recorded_on_demand(self):
+        """Test if trace of calculation is recorded for each cash flow date
+        when tracing is enabled."""
+        schedule = CreditSchedule(None, self.credit.id, trace=True)
+        trace = json.loads(schedule.export_trace())
+        dates = schedule.dates_set()
+        self.assertEqual(len(trace["calculation"]), len(dates))
+        self.assertEqual(trace["calculation"][0]["date"], str(dates[0]))
+        self.assertEqual(trace["calculation"][0]["scenario"], "initial balance")
+        self.assertEqual(trace["cash flows"]["date"], [str(date) for date in dates])
+        self.assertEqual(
+            [row["credit balance"] for row in trace["calculation"]],
+            list(schedule.credit_balance_schedule().values()))
+
+    @override_settings(MEDIA_ROOT=settings.TEST_ROOT, CREDIT_SCHEDULE_TRACE=True)
+    def test_calculation_trace_enabled_by_setting(self):
+        """Test if tracing is enabled with CREDIT_SCHEDULE_TRACE setting."""
+        schedule = CreditSchedule(None, self.credit.id)
+        schedule.credit_table()
+        self.assertTrue(schedule.trace["calculation"])
+
+    @override_settings(MEDIA_ROOT=settings.TEST_ROOT)
+    def test_schedule_table_html_formatted_as_styler(self):
+        """Test if html table of schedule contains the same cell values as
+        pandas Styler table (precision 2, "." thousands, "," decimal) and
+        uses only per-column css."""
+        schedule = CreditSchedule(None, self.credit.id)
+        table = schedule.credit_table()
+        styler_html = table.style.format(
+            precision=2, thousands=".", decimal=",").to_html()
+        html = schedule.to_html()
+        cell = re.compile(r"<t[hd][^>]*>(.*?)</t[hd]>")
+        self.assertEqual(cell.findall(html), cell.findall(styler_html))
+        self.assertNotIn(" id=", html)
+        self.assertEqual(html.count("<tr>"), len(table) + 1)
+        self.assertIn("th.col13, .credit_schedule td.col13 "
+                      "{border-left: 2px solid white}", html)
+
+    @override_settings(MEDIA_ROOT=settings.TEST_ROOT)
+    def test_schedule_page_of_single_year(self):
+        """Test if only rows of selected year are rendered (numbered as in
+        the whole table) while totals are calculated for the whole schedule."""
+        self.client.force_login(self.user)
+        url = reverse("credit:credit-repayment-schedule", args=[str(self.credit.id)])
+        response = self.client.get(url, {"year": 2021})
+        self.assertEqual(response.status_code, 200)
+        schedule = CreditSchedule(None, self.credit.id)
+        table = schedule.credit_table()
+        rows = [number for number, date in enumerate(table["Data"]) if date.year == 2021]
+        self.assertEqual(response.context["schedule_year"], 2021)
+        self.assertEqual(response.context["schedule_years"], schedule.schedule_years())
+        html = response.context["schedule_html"]
+        self.assertEqual(html.count('<th class="row_heading">'), len(rows))
+        self.assertIn(f'<th class="row_heading">{rows[0]}</th>', html)
+        self.assertEqual(response.context["credit_schedule"].sum_for_table_columns(),
+                         schedule.sum_for_table_columns())
+
+    @override_settings(MEDIA_ROOT=settings.TEST_ROOT)
+    def test_schedule_page_of_whole_table_and_default_year(self):
+        """Test if whole table is rendered on request and year out of
+        schedule is replaced by default one."""
+        self.client.force_login(self.user)
+        url = reverse("credit:credit-repayment-schedule", args=[str(self.credit.id)])
+        table = CreditSchedule(None, self.credit.id).credit_table()
+        response = self.client.get(url, {"year": "all"})
+        self.assertIsNone(response.context["schedule_year"])
+        self.assertEqual(response.context["schedule_html"].count('<th class="row_heading">'),
+                         len(table))
+        response = self.client.get(url, {"year": "1900"})
+        self.assertIn(response.context["schedule_year"], response.context["schedule_years"])
+
+
+class StartupBenchmarkTests(TestCase):
+    """Test if numeric libraries are not loaded with project URLs."""
+
+    def test_urlconf_load_does_not_import_numeric_libraries(self):
+        """Test if loading all views does not import pandas, numpy and
+        openpyxl (loaded only by credit schedule)."""
+        output = io.StringIO()
+        call_command("startup_benchmark", runs=1, stdout=output)
+        report = json.loads(output.getvalue())
+        self.assertEqual(report["urlconf load"]["heavy modules loaded"], [])
+        self.assertEqual(len(report["numeric stack load"]["runs"]), 1)
+
+
+class CreditBenchmarkTests(TestCase):
+    """Test benchmark of credit schedule methods."""
+
+    def test_benchmark_of_synthetic_credits(self):
+        """Test if all methods are timed for each scenario, queries are
+        counted and synthetic credits are not saved."""
+        output = io.StringIO()
+        call_command("credit_benchmark", years=[5], frequencies=["Kwartalne"],
+                     tranches=3, rate_changes=2, insurances=1, repayments=2,
+                     runs=1, stdout=output)
+        report = json.loads(output.getvalue())
+        self.assertEqual(len(report["scenarios"]), 2)
+        for scenario in report["scenarios"]:
+            self.assertGreater(scenario["rows"], 20)
+            self.assertEqual(set(scenario["methods"]),
+                             {"credit_table", "to_html", "sum_for_table_columns",
+                              "xirr", "to_excel"})
+            for result in scenario["methods"].values():
+                self.assertEqual(len(result["runs"]), 1)
+                self.assertEqual(result["queries"], 7)
+        self.assertFalse(Credit.objects.exists())
+        self.assertFalse(User.objects.filter(username="benchmarkuser").exists())
+
+
+@override_settings(CREDIT_SCHEDULE_ASYNC=True)
+class CreditScheduleAsyncTests(TestCase):
+    """Test calculation of credit schedule in background."""
+
+    def setUp(self):
+        cache.clear()
+        self.user = UserFactory(
+            username="johndoe123", email="jd@example.com", password="testpass456")
+        self.credit = CreditFactory(
+            user=self.user, tranches_in_credit="Nie", collateral_required="Nie",
+            collateral_rate=0)
+        self.executor = mock.Mock()
+        patcher = mock.patch("credit.jobs.executor", return_value=self.executor)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        cache.clear()
+
+    def run_enqueued_job(self):
+        # Job run in test thread (worker thread would not see test transaction)
+        function, credit_id, version = self.executor.submit.call_args.args
+        self.assertEqual(function, jobs.run_job)
+        jobs.calculate_schedule(credit_id, version)
+
+    def test_schedule_calculated_in_background(self):
+        """Test if page polling status is returned until schedule is
+        calculated and then schedule is rendered from cache."""
+        self.client.force_login(self.user)
+        url = reverse("credit:credit-repayment-schedule", args=[str(self.credit.id)])
+        status_url = reverse("credit:credit-schedule-status", args=[self.credit.slug])
+        response = self.client.get(url)
+        self.assertTemplateUsed(response, "credit/credit_schedule_pending.html")
+        self.assertContains(response, status_url)
+        self.assertEqual(self.client.get(status_url).json(), {"status": "pending"})
+        self.executor.submit.assert_called_once()
+
+        self.run_enqueued_job()
+        self.assertEqual(self.client.get(status_url).json(), {"status": "ready"})
+        with mock.patch.object(CreditSchedule,
+                               "credit_cash_flows_without_interest") as cash_flows:
+            response = self.client.get(url)
+        self.assertTemplateUsed(response, "credit/credit_repayment_schedule.html")
+        cash_flows.assert_not_called()
+
+    def test_schedule_enqueued_once(self):
+        """Test if calculation is enqueued only once for the same version
+        of credit data and again after credit is changed."""
+        self.client.force_login(self.user)
+        url = reverse("credit:credit-repayment-schedule", args=[str(self.credit.id)])
+        self.client.get(url)
+        self.client.get(url)
+        self.assertEqual(self.executor.submit.call_count, 1)
+        self.credit.save()
+        self.client.get(url)
+        self.assertEqual(self.executor.submit.call_count, 2)
+
+    def test_status_of_failed_calculation(self):
+        """Test if error is reported when calculation fails."""
+        self.client.force_login(self.user)
+        self.client.get(reverse("credit:credit-repayment-schedule",
+                                args=[str(self.credit.id)]))
+        with mock.patch.object(CreditSchedule, "credit_table", side_effect=ValueError), \
+                self.assertLogs("all", level="ERROR"):
+            self.run_enqueued_job()
+        response = self.client.get(
+            reverse("credit:credit-schedule-status", args=[self.credit.slug]))
+        self.assertEqual(response.json(), {"status": "error"})
+
+    @override_settings(CREDIT_SCHEDULE_ASYNC=False)
+    def test_schedule_calculated_in_request_by_default(self):
+        """Test if schedule is rendered directly when asynchronous mode is off."""
+        self.client.force_login(self.user)
+        response = self.client.get(reverse("credit:credit-repayment-schedule",
+                                           args=[str(self.credit.id)]))
+        self.assertTemplateUsed(response, "credit/credit_repayment_schedule.html")
+        self.executor.submit.assert_not_called()
+
+    def test_status_for_user_with_access(self):
+        """Test if status is available to user with granted access to schedule."""
+        other_user = UserFactory(
+            username="janedoe123", email="jane@example.com", password="testpass789")
+        self.user.profile.access_granted_to = other_user.email
+        self.user.profile.save()
+        self.client.force_login(other_user)
+        response = self.client.get(
+            reverse("credit:credit-schedule-status", args=[self.credit.slug]))
+        self.assertEqual(response.json(), {"status": "pending"})
+
+    def test_status_of_credit_of_another_user(self):
+        """Test if user without access cannot check status of schedule."""
+        other_user = UserFactory(
+            username="janedoe123", email="jane@example.com", password="testpass789")
+        self.client.force_login(other_user)
+        response = self.client.get(
+            reverse("credit:credit-schedule-status", args=[self.credit.slug]))
+        self.assertRedirects(response, reverse("login"), status_code=302)
+        self.executor.submit.assert_not_called()
+
+
+class CreditScheduleExportTests(TestCase):
+    """Test export of credit schedule in JSON and CSV format."""
+
+    def setUp(self):
+        cache.clear()
+        self.user = UserFactory(
+            username="johndoe123", email="jd@example.com", password="testpass456")
+        self.credit = CreditFactory(
+            user=self.user, tranches_in_credit="Nie", collateral_required="Nie",
+            collateral_rate=0)
+        self.other_user = UserFactory(
+            username="janedoe123", email="jane@example.com", password="testpass789")
+
+    def tearDown(self):
+        cache.clear()
+
+    def test_schedule_data_in_columns(self):
+        """Test if schedule table is returned as columns of equal length
+        together with column totals."""
+        self.client.force_login(self.user)
+        response = self.client.get(
+            reverse("credit:credit-schedule-data", args=[self.credit.slug]))
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        schedule = CreditSchedule(None, self.credit.id)
+        table = schedule.credit_table()
+        self.assertEqual(data["columns"], list(table.columns))
+        self.assertEqual(set(data["data"]), set(table.columns))
+        self.assertEqual({len(values) for values in data["data"].values()}, {len(table)})
+        self.assertEqual(data["data"]["Data"][0], table["Data"].iloc[0].isoformat())
+        self.assertEqual(data["data"]["Saldo"], table["Saldo"].tolist())
+        self.assertEqual(data["totals"]["Łączna rata odsetkowa"],
+                         schedule.sum_for_table_columns()["Łączna rata odsetkowa"])
+
+    def test_schedule_csv(self):
+        """Test if CSV contains header, row for each date and column totals."""
+        self.client.force_login(self.user)
+        response = self.client.get(
+            reverse("credit:credit-schedule-csv", args=[self.credit.slug]))
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        lines = b"".join(response.streaming_content).decode().splitlines()
+        table = CreditSchedule(None, self.credit.id).credit_table()
+        self.assertEqual(lines[0].split(",")[:2], ["Liczba dni", "Data"])
+        self.assertEqual(lines[len(table) + 1], "")
+        self.assertTrue(lines[len(table) + 2].startswith("Otrzymana kwota kredytu,"))
+        self.assertTrue(lines[-1].startswith("Szacunkowy XIRR (%),"))
+
+    def test_export_for_user_with_access(self):
+        """Test if user with granted access to schedule can export it."""
+        self.user.profile.access_granted_to = self.other_user.email
+        self.user.profile.save()
+        self.client.force_login(self.other_user)
+        for name in ("credit:credit-schedule-data", "credit:credit-schedule-csv"):
+            response = self.client.get(reverse(name, args=[self.credit.slug]))
+            self.assertEqual(response.status_code, 200)
+
+    def test_export_without_access(self):
+        """Test if user without access (or with access to other data than
+        schedule) cannot export schedule."""
+        self.user.profile.access_granted_to = self.other_user.email
+        self.user.profile.save()
+        self.credit.access_granted_for_schedule = Access.NO_ACCESS_GRANTED
+        self.credit.save()
+        for name in ("credit:credit-schedule-data", "credit:credit-schedule-csv"):
+            self.client.force_login(self.other_user)
+            response = self.client.get(reverse(name, args=[self.credit.slug]))
+            self.assertRedirects(response, reverse("login"), status_code=302)
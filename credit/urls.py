@@ -59,9 +59,17 @@ urlpatterns = [
          name="credit-repayment-schedule"),
     path("access-to-credit-schedule/<slug:slug>/", views.access_to_credit_schedule,
          name="access-to-credit-schedule"),
+    path("credit-schedule-status/<slug:slug>/", views.credit_schedule_status,
+         name="credit-schedule-status"),
+    path("credit-schedule-data/<slug:slug>/", views.credit_schedule_data,
+         name="credit-schedule-data"),
+    path("credit-schedule-csv/<slug:slug>/", views.credit_schedule_csv,
+         name="credit-schedule-csv"),
 
     path("download-credit/<str:pk>/",
          views.download_credit, name="download-credit"),
+    path("simulate-credit/<str:pk>/",
+         views.simulate_credit, name="simulate-credit"),
 
 ]
 
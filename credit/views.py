@@ -1,23 +1,23 @@
-import calendar
+import csv
 import datetime
 import decimal
+import functools
+import json
 import logging
+import math
 import os
 import shutil
+import tempfile
 
-from pyxirr import xirr
 from dateutil.relativedelta import relativedelta
 
-import pandas as pd
-import numpy as np
-
 from django.conf import settings
 from django.contrib import messages
 from django.contrib.auth import logout
 from django.contrib.auth.decorators import login_required
 from django.core.exceptions import ValidationError
-from django.db.models import Q
-from django.http import Http404, HttpResponse
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import FileResponse, HttpResponse, JsonResponse, StreamingHttpResponse
 from django.utils.translation import gettext_lazy as _
 from django.shortcuts import redirect, render, get_object_or_404
 
@@ -25,19 +25,29 @@ from django.shortcuts import redirect, render, get_object_or_404
 from .forms import (CreditForm, CreditInsuranceForm,
                     CreditCollateralForm, CreditTrancheForm,
                     CreditInterestRateForm, CreditAdditionalCostForm,
-                    CreditEarlyRepaymentForm)
+                    CreditEarlyRepaymentForm, CreditSimulationForm)
+from .jobs import calculate_in_background, schedule_status
 from .models import (Credit, CreditInsurance, CreditCollateral,
                      CreditTranche, CreditInterestRate,
                      CreditAdditionalCost, CreditEarlyRepayment)
+from .rendering import Echo, export_column, export_value, table_to_html
+from .schedule_cache import (CACHED_SCHEDULE_RESULTS, get_cached_schedule,
+                             get_kernel_checkpoints, schedule_version,
+                             set_cached_schedule, set_kernel_checkpoints)
+from .simulation import CreditSimulation
+from .snapshot import load_credit_snapshot
 from connection.models import Attachment
+from search.engine import search
 
-desired_width = 320
-pd.set_option('display.width', desired_width)
-np.set_printoptions(linewidth=desired_width)
-pd.set_option('display.max_columns', 15)
+# Note: pandas, numpy and openpyxl (and credit engine using numpy) are
+# imported inside CreditSchedule methods, so that they are loaded only when
+# credit schedule is used and not by each process loading project URLs.
 
 logger = logging.getLogger("all")
 
+# Size of excel file (in bytes) above which it is moved from memory to temporary file on disk
+EXCEL_MEMORY_LIMIT = 5 * 1024 * 1024
+
 
 def credits(request):
     if not request.user.is_authenticated:
@@ -61,17 +71,9 @@ def credits(request):
     # Searching engine - search through selected fields
     # If search engine is empty, queryset data is displayed in full
     search_query = request.GET.get("q")
-    if search_query and (search_query.isdigit() or search_query.isdecimal()):
-        search_query = float(search_query)
-    if isinstance(search_query, float):
-        credits = Credit.objects.filter(
-            user=request.user).filter(credit_amount__gte=search_query).order_by(order)
-    elif search_query:
-        credits = Credit.objects.filter(
-            user=request.user).filter(Q(name__icontains=search_query) |
-                                      Q(type__icontains=search_query) |
-                                      Q(installment_type__icontains=search_query) |
-                                      Q(type_of_interest__icontains=search_query)).order_by(order)
+    if search_query:
+        credits = search(all_credits, search_query, number_field="credit_amount",
+                         ordered_by_user="sort_data" in request.GET)
     else:
         credits = None
     if not credits:
@@ -1259,7 +1261,7 @@ def credit_repayment_schedule(request, pk):
         return redirect("login")
 
     credit_schedule = CreditSchedule(request, pk)
-    credit_tranches = CreditTranche.objects.filter(credit=credit)
+    credit_tranches = credit_schedule.snapshot.tranches
     sum_of_tranches = CreditTranche.total_tranche(credit_tranches)
 
     context = {
@@ -1269,7 +1271,7 @@ def credit_repayment_schedule(request, pk):
         "tranches": sum_of_tranches,
     }
     if credit.tranches_in_credit == _("Tak"):
-        if not CreditTranche.objects.filter(credit=credit):
+        if not credit_tranches:
             messages.error(request, _("Uzupełnij wpierw transze kredytu. "
                                       "Wymagana wpłata inicjalna."))
             return redirect("credit:single-credit", pk=str(credit.id))
@@ -1279,6 +1281,10 @@ def credit_repayment_schedule(request, pk):
                              f"wartości kredytu ({credit.credit_amount}). "
                              f"Uzupełnij warunki kredytu by uzyskać prawidłowy "
                              f"harmonogram."))
+    if calculate_in_background(credit_schedule):
+        return render(request, "credit/credit_schedule_pending.html", context)
+    credit_schedule.cache_schedule()
+    context.update(schedule_page(request, credit_schedule))
     return render(request, "credit/credit_repayment_schedule.html", context)
 
 
@@ -1287,7 +1293,7 @@ def access_to_credit_schedule(request, slug):
     # Function used to get access to credit schedule from user with granted access
     # (without passing the id of that credit in url address to user with access)
     page = "access_granted"
-    credit = get_object_or_404(Credit, slug=slug)
+    credit = get_object_or_404(Credit.objects.select_related("user__profile"), slug=slug)
 
     if (credit.user.profile.access_granted_to != request.user.email or
             credit.access_granted_for_schedule == _("Brak dostępu")):
@@ -1300,11 +1306,12 @@ def access_to_credit_schedule(request, slug):
         logout(request)
         return redirect("login")
 
-    credit_tranches = CreditTranche.objects.filter(credit=credit)
+    credit_schedule = CreditSchedule(request, credit.id)
+    credit_tranches = credit_schedule.snapshot.tranches
     sum_of_tranches = CreditTranche.total_tranche(credit_tranches)
 
     if credit.tranches_in_credit == _("Tak"):
-        if not CreditTranche.objects.filter(credit=credit):
+        if not credit_tranches:
             messages.error(request, _("Harmonogram niedostępny - nieprawidłowe "
                                       "dane dotyczące kredytu. Wymagana wpłata "
                                       "inicjalna."))
@@ -1317,8 +1324,6 @@ def access_to_credit_schedule(request, slug):
                              f"({round(credit.credit_amount, 2)}). "
                              f"Wymagane uzupełnienie kredytu celem wygenerowania "
                              f"prawidłowego harmonogramu."))
-    pk = credit.id
-    credit_schedule = CreditSchedule(request, pk)
 
     context = {
         "page": page,
@@ -1326,9 +1331,100 @@ def access_to_credit_schedule(request, slug):
         "credit_schedule": credit_schedule,
         "tranches": sum_of_tranches,
     }
+    if calculate_in_background(credit_schedule):
+        return render(request, "credit/credit_schedule_pending.html", context)
+    credit_schedule.cache_schedule()
+    context.update(schedule_page(request, credit_schedule))
 
     return render(request, "credit/credit_repayment_schedule.html", context)
 
+
+def schedule_page(request, credit_schedule) -> dict:
+    """Returns context of schedule table page - year given in GET parameter
+    "year" ("all" - the whole table), by default current year (or first
+    year of schedule if current year is out of schedule)."""
+    years = credit_schedule.schedule_years()
+    year = request.GET.get("year")
+    if year == "all":
+        year = None
+    else:
+        try:
+            year = int(year)
+        except (TypeError, ValueError):
+            year = None
+        if year not in years:
+            today = datetime.date.today()
+            year = today.year if today.year in years else years[0] if years else None
+    return {
+        "schedule_html": credit_schedule.to_html(year=year),
+        "schedule_years": years,
+        "schedule_year": year,
+    }
+
+
+@login_required(login_url="login")
+def credit_schedule_status(request, slug):
+    # Status of credit schedule calculated in background (polled by page
+    # returned when schedule is not in cache, see CREDIT_SCHEDULE_ASYNC)
+    credit = get_object_or_404(Credit.objects.select_related("user__profile"), slug=slug)
+
+    if not has_access_to_schedule(request.user, credit):
+        return schedule_safety_breach(request, credit, "credit-schedule-status")
+
+    return JsonResponse({"status": schedule_status(credit.id)})
+
+
+@login_required(login_url="login")
+def credit_schedule_data(request, slug):
+    # Schedule table as columns with column totals in JSON (owner of credit
+    # or user with granted access to schedule)
+    credit = get_object_or_404(Credit.objects.select_related("user__profile"), slug=slug)
+
+    if not has_access_to_schedule(request.user, credit):
+        return schedule_safety_breach(request, credit, "credit-schedule-data")
+
+    credit_schedule = CreditSchedule(request, credit.id)
+    data = credit_schedule.to_columns()
+    credit_schedule.cache_schedule()
+    return JsonResponse({"credit": credit.name, "currency": credit.currency, **data},
+                        json_dumps_params={"ensure_ascii": False})
+
+
+@login_required(login_url="login")
+def credit_schedule_csv(request, slug):
+    # Schedule table with column totals streamed in CSV format (owner of
+    # credit or user with granted access to schedule)
+    credit = get_object_or_404(Credit.objects.select_related("user__profile"), slug=slug)
+
+    if not has_access_to_schedule(request.user, credit):
+        return schedule_safety_breach(request, credit, "credit-schedule-csv")
+
+    credit_schedule = CreditSchedule(request, credit.id)
+    lines = credit_schedule.to_csv()
+    credit_schedule.cache_schedule()
+    response = StreamingHttpResponse(lines, content_type="text/csv; charset=utf-8")
+    response["Content-Disposition"] = 'attachment; filename="credit.csv"'
+    return response
+
+
+def has_access_to_schedule(user, credit) -> bool:
+    """Checks if user is owner of credit or has granted access to its schedule."""
+    return credit.user_id == user.id or (
+            credit.user.profile.access_granted_to == user.email and
+            credit.access_granted_for_schedule != _("Brak dostępu"))
+
+
+def schedule_safety_breach(request, credit, page):
+    logger.critical(
+        "user: %s - enter page: %s - 🛑 SAFETY BREACH - "
+        "attempt to access credit schedule of another user (id: %s)!"
+        % (request.user.id, page, credit.user.id))
+    messages.error(
+        request, _("Nie masz uprawnień do tych danych."))
+    logout(request)
+    return redirect("login")
+
+
 @login_required(login_url="login")
 def download_credit(request, pk):
     credit = get_object_or_404(Credit, id=pk)
@@ -1343,19 +1439,99 @@ def download_credit(request, pk):
         logout(request)
         return redirect("login")
 
-    credit_path = CreditSchedule(request, credit.id).to_excel()
-    if os.path.exists(credit_path):
-        with open(credit_path, "rb") as file:
-            response = HttpResponse(file.read(), content_type="application/force-download")
-            response["Content-Disposition"] = "inline; filename=credit.xlsx"
-            return response
-    raise Http404
+    credit_schedule = CreditSchedule(request, credit.id)
+    credit_schedule.cache_schedule()
+    response = FileResponse(credit_schedule.to_excel(),
+                            content_type="application/force-download")
+    response["Content-Disposition"] = "inline; filename=credit.xlsx"
+    return response
+
+
+@login_required(login_url="login")
+def simulate_credit(request, pk):
+    # What-if simulation (GET parameters: change_date, repayment_amount,
+    # interest_rate) - returns schedule and totals after change for each
+    # repayment action, nothing is saved
+    credit = get_object_or_404(Credit, id=pk)
+
+    if credit.user != request.user:
+        logger.critical(
+            "user: %s - enter page: simulate-credit - "
+            "🛑 SAFETY BREACH - attempt to access credit simulation of "
+            "another user (id: %s)!" % (request.user.id, credit.user.id))
+        messages.error(
+            request, _("Nie masz uprawnień do tych danych."))
+        logout(request)
+        return redirect("login")
+
+    form = CreditSimulationForm(request.GET, credit=credit)
+    if not form.is_valid():
+        return JsonResponse(
+            {"errors": {field: list(errors) for field, errors in form.errors.items()}},
+            status=400)
+
+    credit_schedule = CreditSchedule(request, credit.id)
+    simulation = CreditSimulation(
+        schedule=credit_schedule,
+        change_date=form.cleaned_data["change_date"],
+        repayment_amount=form.cleaned_data.get("repayment_amount") or 0,
+        interest_rate=form.cleaned_data.get("interest_rate"),
+    )
+    try:
+        results = simulation.compare()
+    except ValueError as error:
+        return JsonResponse({"errors": {"__all__": [str(error)]}}, status=400)
+    credit_schedule.cache_schedule()
+    return JsonResponse(results, json_dumps_params={"ensure_ascii": False})
+
+
+def memoized(method):
+    """Cache result of CreditSchedule method (without arguments) for the
+    lifetime of the instance."""
+    @functools.wraps(method)
+    def wrapper(self):
+        cache = self.__dict__.setdefault("_memoized", {})
+        if method.__name__ not in cache:
+            cache[method.__name__] = method(self)
+        return cache[method.__name__]
+    return wrapper
 
 
 class CreditSchedule():
-    def __init__(self, request, pk):
+    """Credit repayment schedule. Cash flows and the schedule table are
+    calculated once per instance and reused by all other methods.
+    Schedule table, column totals and XIRR are additionally kept in cache
+    (see cache_schedule) until credit or any of its related records changes.
+
+    With trace=True (or CREDIT_SCHEDULE_TRACE setting) state of calculation
+    is recorded in memory (trace attribute, see export_trace) and cached
+    schedule is not used."""
+
+    def __init__(self, request, pk, trace=None, snapshot=None, cache_version=None,
+                 use_cache=True):
+        """Snapshot of credit data may be given (e.g. loaded in bulk for many
+        credits, see credit.batch) together with schedule version read
+        before loading it - then database is not queried.
+        With use_cache=False (e.g. snapshot with hypothetical changes, see
+        credit.simulation) schedule is neither read from nor stored in cache."""
+        if trace is None:
+            trace = getattr(settings, "CREDIT_SCHEDULE_TRACE", False)
+        self.trace = {} if trace else None
+        self.use_cache = use_cache
+        # Index of date from which credit balance was recalculated (None if
+        # calculated from the beginning)
+        self.resumed_from = None
         try:
-            self.credit = Credit.objects.get(id=pk)
+            if snapshot is None:
+                # Version read before credit data so that schedule calculated
+                # from data changed in the meantime is never stored as current one
+                self.cache_version = schedule_version(pk)
+                self.snapshot = load_credit_snapshot(pk)
+            else:
+                self.cache_version = (cache_version if cache_version is not None
+                                      else schedule_version(pk))
+                self.snapshot = snapshot
+            self.credit = self.snapshot.credit
             self.provision = (self.credit.provision
                               if isinstance(self.credit.provision,
                                             (int, float, decimal.Decimal))
@@ -1375,145 +1551,184 @@ class CreditSchedule():
                                  if isinstance(self.credit.grace_period, int)
                                     and self.credit.grace_period > 0
                                  else 0)
+            cached_results = (get_cached_schedule(self.credit.id, self.cache_version)
+                              if self.trace is None and use_cache else None)
+            self.from_cache = cached_results is not None
+            if self.from_cache:
+                self._memoized = dict(cached_results)
         except Credit.DoesNotExist:
             messages.error(request, _("Brak kredytu w bazie danych."))
 
+    def cache_schedule(self):
+        """Stores schedule table, column totals and XIRR in cache."""
+        if self.use_cache and not self.from_cache:
+            set_cached_schedule(
+                self.credit.id, self.cache_version,
+                {name: getattr(self, name)() for name in CACHED_SCHEDULE_RESULTS})
+            self.from_cache = True
+
+    def set_results(self, results: dict):
+        """Uses schedule results (method name: result, see
+        CACHED_SCHEDULE_RESULTS) calculated elsewhere, e.g. in another process."""
+        self.__dict__.setdefault("_memoized", {}).update(results)
+
+    def export_trace(self):
+        """Returns trace of credit balance calculation as JSON (None if
+        tracing is not enabled)."""
+        if self.trace is None:
+            return None
+        self.credit_balance_calculation()
+        return json.dumps(self.trace, cls=DjangoJSONEncoder, indent=2)
+
+    @memoized
     def credit_table(self):
-        df = pd.DataFrame(columns=["Liczba dni", "Data", "Zaciągnięcie kredytu",
-                                   "Wcześniejsza spłata", "Oprocentowanie pomostowe (%)",
-                                   "Łączne oprocentowanie kredytu (%)",
-                                   "Rata odsetkowa", "Rata kapitałowa", "Rata całkowita",
-                                   "Saldo", "LTV (%)", "Ubezpieczenie (niekredytowane)",
-                                   "Prowizje i inne", "Razem płatność"])
-
-        # df[_("Data")] = sorted((set(self.installment_dates()).union(set(self.payments_from_bank().keys()))))
-
-        df["Data"] = pd.to_datetime(self.dates_set())
-        df["Liczba dni"] = (df["Data"] - pd.Series(df["Data"]).shift(1)).dt.days
-        df["Zaciągnięcie kredytu"] = df["Data"].map(self.payments_from_bank_schedule()).fillna(0)
-        # df["Wcześniejsza spłata"] = df["Data"].map(self.early_repayments_schedule()).fillna(0)
-        df["Wcześniejsza spłata"] = df["Data"].map(self.early_repayment_modified_schedule()).fillna(0)
-        df["Data"] = [time.date() for time in df["Data"]]
-        if self.collateral_rate:
-            df["Oprocentowanie pomostowe (%)"] = (np.where(df["Data"]
-                                                           < self.collateral_set_date(),
-                                                           self.collateral_rate,
-                                                           df["Oprocentowanie pomostowe (%)"])
-                                                  )
-            df["Oprocentowanie pomostowe (%)"] = (np.where(df["Data"]
-                                                           >= self.collateral_set_date(),
-                                                           0,
-                                                           df["Oprocentowanie pomostowe (%)"])
-                                                  )
-        df["Łączne oprocentowanie kredytu (%)"] = df["Data"].map(self.interest_rates_schedule())
-        df["Rata odsetkowa"] = df["Data"].map(self.interest_installment_schedule())
-        df["Rata kapitałowa"] = df["Data"].map(self.capital_installments_schedule())
+        """Returns schedule table (one row for each date of cash flow).
+        Each column is built once as float array (nan if value is missing)
+        from schedules of amounts calculated by credit engine."""
+        import numpy as np
+        import pandas as pd
+
+        dates = self.dates_set()
+
+        def column(schedule):
+            return np.array([schedule.get(date) for date in dates], dtype=float)
+
+        def filled(values, value=0):
+            return np.where(np.isnan(values), value, values)
+
+        interest = column(self.interest_installment_schedule())
+        capital = column(self.capital_installments_schedule())
         if self.credit.installment_type == _("Raty równe"):
-            df["Rata całkowita"] = df["Rata odsetkowa"] + df["Rata kapitałowa"]
+            total = interest + capital
         else:
-            df["Rata całkowita"] = df["Data"].map(self.total_installments_schedule())
-        df["Saldo"] = df["Data"].map(self.credit_balance_schedule())
-        df["LTV (%)"] = ("n/a" if self.market_value == 0
-                         else (df["Saldo"].astype("float")/float(self.market_value)).round(2))
-        df["Ubezpieczenie (niekredytowane)"] = df["Data"].map(self.insurance_payments_schedule()).fillna(0)
-        df["Prowizje i inne"] = df["Data"].map(self.additional_payments_schedule()).fillna(0)
-        df["Razem płatność"] = ((df["Wcześniejsza spłata"].astype(float)
-                                 + df["Rata całkowita"].astype(float)
-                                 + df["Ubezpieczenie (niekredytowane)"].astype(float)
-                                 + df["Prowizje i inne"].astype(float)))
-
-        # Setting data types
-        df["Data"] = pd.to_datetime(self.dates_set()).date
-        # df["Liczba dni"] = df["Liczba dni"].dt.days
-        df["Liczba dni"] = df["Liczba dni"].fillna(0).astype("int")
-        df["Zaciągnięcie kredytu"] = df["Zaciągnięcie kredytu"].astype("float")
-        df["Wcześniejsza spłata"] = df["Wcześniejsza spłata"].astype("float")
-        df["Oprocentowanie pomostowe (%)"] = (df["Oprocentowanie pomostowe (%)"].astype("float")
-                                              if not df["Oprocentowanie pomostowe (%)"].isnull().values.any()
-                                              else df["Oprocentowanie pomostowe (%)"].fillna("n/a"))
-        df["Łączne oprocentowanie kredytu (%)"] = df["Łączne oprocentowanie kredytu (%)"].astype("float").fillna("---")
-        df["Rata odsetkowa"] = df["Rata odsetkowa"].astype("float").fillna(0)
-        df["Rata kapitałowa"] = df["Rata kapitałowa"].astype("float").fillna(0)
-        df["Rata całkowita"] = df["Rata całkowita"].astype("float").fillna(0)
-        df["Saldo"] = df["Saldo"].astype("float")
-        if self.market_value:
-            df["LTV (%)"] = df["LTV (%)"].astype("float")
-        df["Ubezpieczenie (niekredytowane)"] = df["Ubezpieczenie (niekredytowane)"].astype("float")
-        df["Prowizje i inne"] = df["Prowizje i inne"].astype("float")
-        df["Razem płatność"] = df["Razem płatność"].astype("float")
-
-        # Removing unnecessary rows from table
-        # df = df.replace(0, np.nan)
-        # df = df.dropna(subset=["Saldo", "Rata całkowita", "Razem płatność"], how="all")
-        # df = df.replace(np.nan, 0)
-
+            total = column(self.total_installments_schedule())
+        early_repayment = filled(column(self.early_repayment_modified_schedule()))
+        balance = column(self.credit_balance_schedule())
+        insurance = filled(column(self.insurance_payments_schedule()))
+        other_costs = filled(column(self.additional_payments_schedule()))
+
+        collateral_set_date = self.collateral_set_date() if self.collateral_rate else None
+        if collateral_set_date:
+            bridging_rate = np.array([self.collateral_rate if date < collateral_set_date else 0
+                                      for date in dates], dtype=float)
+        else:
+            bridging_rate = np.full(len(dates), "n/a", dtype=object)
+        interest_rates = pd.Series(column(self.interest_rates_schedule()))
+        if interest_rates.isnull().values.any():
+            interest_rates = interest_rates.astype(object).fillna("---")
+
+        ordinals = np.array([date.toordinal() for date in dates], dtype=int)
+
+        df = pd.DataFrame({
+            "Liczba dni": np.diff(ordinals, prepend=ordinals[:1]),
+            "Data": pd.Series(dates, dtype=object),
+            "Zaciągnięcie kredytu": filled(column(self.payments_from_bank_schedule())),
+            "Wcześniejsza spłata": early_repayment,
+            "Oprocentowanie pomostowe (%)": bridging_rate,
+            "Łączne oprocentowanie kredytu (%)": interest_rates,
+            "Rata odsetkowa": filled(interest),
+            "Rata kapitałowa": filled(capital),
+            "Rata całkowita": filled(total),
+            "Saldo": balance,
+            "LTV (%)": ("n/a" if self.market_value == 0
+                        else np.round(balance / float(self.market_value), 2)),
+            "Ubezpieczenie (niekredytowane)": insurance,
+            "Prowizje i inne": other_costs,
+            # Unknown total installment makes total payment unknown
+            "Razem płatność": early_repayment + total + insurance + other_costs,
+        })
         return df
 
-    def to_html(self):
+    def schedule_years(self) -> list:
+        """Years of schedule dates (pages of schedule table)."""
+        return sorted({date.year for date in self.credit_table()["Data"]})
+
+    def to_html(self, year=None):
+        """Returns schedule table in html (only rows of given year, if set,
+        numbered as in the whole table)."""
         df = self.credit_table()
-        df = df.style.format(precision=2, thousands=".", decimal=",")
-        df.set_table_styles({
-            ("Zaciągnięcie kredytu"): [
-                {"selector": "th", "props": "border-left: 1px solid white"},
-                {"selector": "td", "props": "border-left: 1px solid white"},
-            ],
-            ("Oprocentowanie pomostowe (%)"): [
-                {"selector": "th", "props": "border-left: 1px solid white"},
-                {"selector": "td", "props": "border-left: 1px solid white"},
-            ],
-            ("Rata odsetkowa"): [
-                {"selector": "th", "props": "border-left: 1px solid white"},
-                {"selector": "td", "props": "border-left: 1px solid white"},
-            ],
-            ("Rata całkowita"): [
-                {"selector": "th", "props": "border-left: 1px dashed white"},
-                {"selector": "td", "props": "border-left: 1px dashed white"},
-            ],
-            ("Razem płatność"): [
-                {"selector": "th", "props": "border-left: 1px solid white"},
-                {"selector": "td", "props": "border-left: 1px solid white"},
-            ],
-            ("Saldo"): [
-                {"selector": "th", "props": "border-left: 1px solid white"},
-                {"selector": "td", "props": "border-left: 1px solid white"},
-            ],
-            ("Ubezpieczenie (niekredytowane)"): [
-                {"selector": "th", "props": "border-left: 1px solid white"},
-                {"selector": "td", "props": "border-left: 1px solid white"},
-            ],
-            ("Razem płatność"): [
-                {"selector": "th", "props": "border-left: 2px solid white"},
-                {"selector": "td", "props": "border-left: 2px solid white"},
-            ],
-        })
-        df.set_table_styles([
-            {"selector": "th.col_heading",
-             "props": "font-size: 85%; "
-                      "max-width: 100%; "
-                      "line-height: 15px; "
-                      "inline-size: 100px; "
-                      "white-space: normal; overflow-wrap: break-word; "
-                      "padding: 10px 0px;"
-             },
-        ], overwrite=False)
-
-        return df.to_html()
+        if year is not None:
+            df = df[[date.year == year for date in df["Data"]]]
+        solid_border = "border-left: 1px solid white"
+        column_styles = {
+            "Zaciągnięcie kredytu": solid_border,
+            "Oprocentowanie pomostowe (%)": solid_border,
+            "Rata odsetkowa": solid_border,
+            "Rata całkowita": "border-left: 1px dashed white",
+            "Saldo": solid_border,
+            "Ubezpieczenie (niekredytowane)": solid_border,
+            "Razem płatność": "border-left: 2px solid white",
+        }
+        heading_style = ("font-size: 85%; "
+                         "max-width: 100%; "
+                         "line-height: 15px; "
+                         "inline-size: 100px; "
+                         "white-space: normal; overflow-wrap: break-word; "
+                         "padding: 10px 0px;")
+        return table_to_html(
+            columns=list(df.columns),
+            index=df.index.tolist(),
+            values=[df[column].tolist() for column in df.columns],
+            column_styles=column_styles,
+            heading_style=heading_style,
+        )
 
     def to_excel(self):
-        """Save dataframe as excel file on user's local path."""
-        user = self.credit.user
-        filename = "credit.xlsx"
-        file_path = f"{user.id}_credit/{filename}"
-        directory = os.path.join(settings.MEDIA_ROOT, f"{user.id}_credit")
-        if os.path.exists(directory):
-            shutil.rmtree(directory)  # to clean old files
-            os.mkdir(directory)
-        else:
-            os.mkdir(directory)
-        path = os.path.join(settings.MEDIA_ROOT, file_path)
+        """Returns schedule table as excel workbook in temporary file object
+        (kept in memory up to EXCEL_MEMORY_LIMIT bytes), ready for reading."""
+        import openpyxl
+        from openpyxl.cell import WriteOnlyCell
+        from openpyxl.styles import Font
+
+        df = self.credit_table()
+        workbook = openpyxl.Workbook(write_only=True)
+        worksheet = workbook.create_sheet("Sheet1")
+
+        header = []
+        for value in ["", *df.columns]:
+            cell = WriteOnlyCell(worksheet, value=value)
+            cell.font = Font(bold=True)
+            header.append(cell)
+        worksheet.append(header)
+        for row in df.itertuples(index=True, name=None):
+            worksheet.append([None if isinstance(value, float) and math.isnan(value)
+                              else value for value in row])
+
+        # Column totals with XIRR (calculated once with schedule, see cache_schedule)
+        totals_worksheet = workbook.create_sheet("Podsumowanie")
+        for key, value in self.sum_for_table_columns().items():
+            cell = WriteOnlyCell(totals_worksheet, value=key)
+            cell.font = Font(bold=True)
+            totals_worksheet.append([cell, value])
+
+        file = tempfile.SpooledTemporaryFile(max_size=EXCEL_MEMORY_LIMIT)
+        workbook.save(file)
+        file.seek(0)
+        return file
+
+    def to_columns(self):
+        """Returns schedule table as columns (column name: list of values,
+        dates in ISO format, missing values as None) with column totals."""
+        df = self.credit_table()
+        return {
+            "columns": list(df.columns),
+            "data": {column: export_column(df[column].tolist()) for column in df.columns},
+            "totals": {key: export_value(value)
+                       for key, value in self.sum_for_table_columns().items()},
+        }
 
-        self.credit_table().to_excel(path)
-        return path
+    def to_csv(self):
+        """Yields lines of schedule table in CSV format followed by column
+        totals (separated by empty line), e.g. for streaming response."""
+        df = self.credit_table()
+        totals = self.sum_for_table_columns()
+        writer = csv.writer(Echo())
+        yield writer.writerow(df.columns)
+        for row in zip(*(export_column(df[column].tolist()) for column in df.columns)):
+            yield writer.writerow(row)
+        yield writer.writerow([])
+        for key, value in totals.items():
+            yield writer.writerow([key, export_value(value)])
 
     # def attachment_file_path(self):
     #     """A method to download a file from it's upload path by using static"""
@@ -1522,6 +1737,7 @@ class CreditSchedule():
     #     file_path = os.path.join(settings.MEDIA_URL, name)
     #     return file_path
 
+    @memoized
     def sum_for_table_columns(self):
         df = self.credit_table()
         total_column_value = dict()
@@ -1538,19 +1754,29 @@ class CreditSchedule():
                                                                - total_column_value["Otrzymana kwota kredytu"],
                                                                2))
 
-        total_column_value["Szacunkowy XIRR (%)"] = round(self.xirr() * 100, 2) if self.xirr() else "n/a"
+        xirr = self.xirr()
+        total_column_value["Szacunkowy XIRR (%)"] = round(xirr * 100, 2) if xirr else "n/a"
 
         return total_column_value
 
+    @memoized
     def xirr(self):
+        """XIRR of credit cash flows (amounts received from bank less total
+        payments) or None if any payment is unknown or XIRR is not found
+        (within CREDIT_SCHEDULE_XIRR_MAX_ITERATIONS iterations of solver)."""
+        import numpy as np
+        from .engine import XIRR_MAX_ITERATIONS, solve_xirr
+
         df = self.credit_table()
-        if not df["Razem płatność"].isnull().values.any():
-            amounts = df["Zaciągnięcie kredytu"] - df["Razem płatność"]
-            dates = df["Data"]
-            irr = xirr(zip(dates, amounts))
-        else:
-            irr = None
-        return irr
+        payments = df["Razem płatność"].to_numpy(dtype=float)
+        if np.isnan(payments).any():
+            return None
+        amounts = df["Zaciągnięcie kredytu"].to_numpy(dtype=float) - payments
+        xirr = solve_xirr(df["Data"].tolist(), amounts, getattr(
+            settings, "CREDIT_SCHEDULE_XIRR_MAX_ITERATIONS", XIRR_MAX_ITERATIONS))
+        if xirr is None:
+            logger.warning("credit: %s - XIRR not found" % self.credit.id)
+        return xirr
 
     def frequency(self, variable):
         frequency = (
@@ -1562,6 +1788,7 @@ class CreditSchedule():
         )
         return frequency
 
+    @memoized
     def dates_set(self):
         list_of_dates = set(self.basic_installment_dates_list()).union(set(self.payments_from_bank_schedule().keys()))
         list_of_dates = (list_of_dates.union(set((self.insurance_payments_schedule().keys())))
@@ -1572,32 +1799,24 @@ class CreditSchedule():
                          if self.additional_payments_schedule() else list_of_dates)
         return sorted(list_of_dates)
 
+    @memoized
     def basic_installment_dates_list(self):
         """Returns list of dates of installment payments from the date of first
         installment to the date of last payment according to schedule from credit agreement."""
-        installment_dates = []
+        from .engine import payment_calendar
+
         start = self.credit.start_of_payment
-        installment_dates.append(start)
         frequency = self.frequency(self.credit.installment_frequency)
         if frequency:
-            i = 1
-            for period in range(1, self.credit.credit_period+1, frequency):
-                # +1 period to fully cover installment schedule in case of assumption with start of payment at the same date as start of credit
-                # (which is illogical and first payment of credit is usually set after payment of first tranche from bank)
-                if self.credit.payment_day == 0:
-                    installment_date = ((datetime.date(start.year, start.month, 1)
-                                         + relativedelta(months=frequency*i))
-                                        - datetime.timedelta(days=1))
-                    installment_dates.append(installment_date)
-                else:
-                    installment_dates.append((start
-                                              + relativedelta(months=frequency*i))
-                                             + relativedelta(day=self.credit.payment_day))
-                i += 1
+            # +1 period to fully cover installment schedule in case of assumption with start of payment at the same date as start of credit
+            # (which is illogical and first payment of credit is usually set after payment of first tranche from bank)
+            periods = len(range(1, self.credit.credit_period+1, frequency))
+            installment_dates = [start] + payment_calendar(
+                start, frequency, periods, self.credit.payment_day).tolist()
         else:
-            installment_dates.append((start
-                                      + relativedelta(months=frequency))
-                                     + relativedelta(day=self.credit.payment_day))
+            installment_dates = [start, (start
+                                         + relativedelta(months=frequency))
+                                 + relativedelta(day=self.credit.payment_day)]
         return sorted(installment_dates)
 
     def payments_from_bank_schedule(self):
@@ -1614,14 +1833,9 @@ class CreditSchedule():
         payments_from_bank[self.credit.start_of_credit] = initial_payments
 
         # If credit is paid in tranches
-        try:
-            tranches = CreditTranche.objects.filter(credit=self.credit)
-            tranche_dates = [tranche.tranche_date for tranche in tranches]
-            tranche_amounts = [tranche.tranche_amount for tranche in tranches]
-        except CreditTranche.DoesNotExist:
-            tranches = None
-            tranche_dates = self.credit.start_of_credit
-            tranche_amounts = [self.credit.credit_amount]
+        tranches = self.snapshot.tranches
+        tranche_dates = [tranche.tranche_date for tranche in tranches]
+        tranche_amounts = [tranche.tranche_amount for tranche in tranches]
 
         for date, amount in zip(tranche_dates, tranche_amounts):
             if date in payments_from_bank.keys():
@@ -1649,14 +1863,10 @@ class CreditSchedule():
         provided in early_repayment_modified_schedule method.
         """
         early_repayments = {}
-        try:
-            repayments = CreditEarlyRepayment.objects.filter(credit=self.credit)
-        except CreditEarlyRepayment.DoesNotExist:
-            repayments = None
+        repayments = self.snapshot.early_repayments
         if not repayments:
             return early_repayments
 
-        repayments = CreditEarlyRepayment.objects.filter(credit=self.credit)
         repayment_dates = [record.repayment_date for record in repayments]
         repayment_amounts = [record.repayment_amount for record in repayments]
         for date, amount in zip(repayment_dates, repayment_amounts):
@@ -1671,10 +1881,7 @@ class CreditSchedule():
             return None
 
         # Collateral required
-        try:
-            collateral = CreditCollateral.objects.get(credit=self.credit)
-        except CreditCollateral.DoesNotExist:
-            collateral = None
+        collateral = self.snapshot.collateral
 
         # No date of collateral set
         if not collateral:
@@ -1697,22 +1904,17 @@ class CreditSchedule():
             initial_interest_rate += self.collateral_rate
         interest_rates[self.credit.start_of_credit] = initial_interest_rate
 
-        try:
-            rates = CreditInterestRate.objects.filter(credit=self.credit)
-        except CreditInterestRate.DoesNotExist:
-            rates = None
+        all_rates = self.snapshot.interest_rates
+        collateral = self.snapshot.collateral
 
         # Without changes of interest rates during credit lifetime
-        if not rates:
-            try:
-                collateral = CreditCollateral.objects.get(credit=self.credit)
-            except CreditCollateral.DoesNotExist:
+        if not all_rates:
+            if not collateral:
                 for period in self.basic_installment_dates_list():
                     interest_rates[period] = initial_interest_rate
                 return interest_rates
             else:
                 # UWAGA!!!! Dodać, że jeśli zabezpieczenie jest ustanowione przed rozpoczęciem spłaty kredytu, to nie ma go w odsetkach
-                collateral = CreditCollateral.objects.get(credit=self.credit)
                 interest_rate_without_collateral_rate = initial_interest_rate - self.collateral_rate
                 interest_rates[collateral.collateral_set_date] = interest_rate_without_collateral_rate
                 for period in self.basic_installment_dates_list():
@@ -1723,7 +1925,6 @@ class CreditSchedule():
                 return interest_rates
 
         # With different interest rates during credit lifetime
-        all_rates = CreditInterestRate.objects.filter(credit=self.credit)
         dates = [record.interest_rate_start_date for record in all_rates]
         rates = [record.interest_rate for record in all_rates]
         for date, rate in zip(dates, rates):
@@ -1739,10 +1940,6 @@ class CreditSchedule():
         # If collateral will be set before first change in interest rate,
         # interest rate must be recalculated.
         collateral_change_in_rate = False
-        try:
-            collateral = CreditCollateral.objects.get(credit=self.credit)
-        except CreditCollateral.DoesNotExist:
-            collateral = None
         if collateral:
             if collateral.collateral_set_date < list(interest_rates.keys())[1]:
                 collateral_change_in_rate = True
@@ -1775,14 +1972,11 @@ class CreditSchedule():
         installments = {}
 
         # Interest rates (dates and installment amounts)
-        try:
-            installment_values = CreditInterestRate.objects.filter(credit=self.credit).filter(total_installment__gt=0)
-        except CreditInterestRate.DoesNotExist:
-            installment_values = None
+        installment_values = [record for record in self.snapshot.interest_rates
+                              if record.total_installment and record.total_installment > 0]
         if not installment_values:
             return
 
-        installment_values = CreditInterestRate.objects.filter(credit=self.credit).filter(total_installmentf__gt=0)
         dates = [record.interest_rate_start_date for record in installment_values]
         amounts = [record.total_installment for record in installment_values]
         for date, amount in zip(dates, amounts):
@@ -1801,14 +1995,11 @@ class CreditSchedule():
         installments = {}
 
         # Interest rates (dates and installment amounts)
-        try:
-            installment_values = CreditInterestRate.objects.filter(credit=self.credit).filter(capital_installment__gt=0)
-        except CreditInterestRate.DoesNotExist:
-            installment_values = None
+        installment_values = [record for record in self.snapshot.interest_rates
+                              if record.capital_installment and record.capital_installment > 0]
         if not installment_values:
             return
 
-        installment_values = CreditInterestRate.objects.filter(credit=self.credit).filter(capital_installment__gt=0)
         dates = [record.interest_rate_start_date for record in installment_values]
         amounts = [record.capital_installment for record in installment_values]
         for date, amount in zip(dates, amounts):
@@ -1822,14 +2013,11 @@ class CreditSchedule():
         installments = {}
 
         # Tranches (dates and installment amounts)
-        try:
-            installment_values = CreditTranche.objects.filter(credit=self.credit).filter(total_installment__gt=0)
-        except CreditTranche.DoesNotExist:
-            installment_values = None
+        installment_values = [record for record in self.snapshot.tranches
+                              if record.total_installment and record.total_installment > 0]
         if not installment_values:
             return
 
-        installment_values = CreditTranche.objects.filter(credit=self.credit).filter(total_installment__gt=0)
         dates = [record.tranche_date for record in installment_values]
         amounts = [record.total_installment for record in installment_values]
         for date, amount in zip(dates, amounts):
@@ -1843,14 +2031,11 @@ class CreditSchedule():
         installments = {}
 
         # Tranches (dates and installment amounts)
-        try:
-            installment_values = CreditTranche.objects.filter(credit=self.credit).filter(capital_installment__gt=0)
-        except CreditTranche.DoesNotExist:
-            installment_values = None
+        installment_values = [record for record in self.snapshot.tranches
+                              if record.capital_installment and record.capital_installment > 0]
         if not installment_values:
             return
 
-        installment_values = CreditTranche.objects.filter(credit=self.credit).filter(capital_installment__gt=0)
         dates = [record.tranche_date for record in installment_values]
         amounts = [record.capital_installment for record in installment_values]
         for date, amount in zip(dates, amounts):
@@ -1864,14 +2049,11 @@ class CreditSchedule():
         installments = {}
 
         # Early repayments (dates and installment amounts)
-        try:
-            installment_values = CreditEarlyRepayment.objects.filter(credit=self.credit).filter(total_installment__gt=0)
-        except CreditEarlyRepayment.DoesNotExist:
-            installment_values = None
+        installment_values = [record for record in self.snapshot.early_repayments
+                              if record.total_installment and record.total_installment > 0]
         if not installment_values:
             return
 
-        installment_values = CreditEarlyRepayment.objects.filter(credit=self.credit).filter(total_installment__gt=0)
         dates = [record.repayment_date for record in installment_values]
         amounts = [record.total_installment for record in installment_values]
 
@@ -1887,14 +2069,11 @@ class CreditSchedule():
         installments = {}
 
         # Early repayments (dates and installment amounts)
-        try:
-            installment_values = CreditEarlyRepayment.objects.filter(credit=self.credit).filter(capital_installment__gt=0)
-        except CreditEarlyRepayment.DoesNotExist:
-            installment_values = None
+        installment_values = [record for record in self.snapshot.early_repayments
+                              if record.capital_installment and record.capital_installment > 0]
         if not installment_values:
             return
 
-        installment_values = CreditEarlyRepayment.objects.filter(credit=self.credit).filter(capital_installment__gt=0)
         dates = [record.repayment_date for record in installment_values]
         amounts = [record.capital_installment for record in installment_values]
 
@@ -2014,16 +2193,11 @@ class CreditSchedule():
         else:
             initial_total_installment = list(tranches.values())[0]
 
-        try:
-            collateral = CreditCollateral.objects.get(credit=self.credit)
-        except CreditCollateral.DoesNotExist:
-            collateral = {}
+        collateral = self.snapshot.collateral
+        if collateral and collateral.total_installment:
+            collateral = {collateral.collateral_set_date: collateral.total_installment}
         else:
-            collateral = CreditCollateral.objects.get(credit=self.credit)
-            if collateral.total_installment:
-                collateral = {collateral.collateral_set_date: collateral.total_installment}
-            else:
-                collateral = {}
+            collateral = {}
         dictionaries = [tranches, repayments, collateral]
 
         # Fixed installments combined (note that installment changes caused by
@@ -2064,13 +2238,8 @@ class CreditSchedule():
             return total_installments
 
         # Decreasing installments
-        total_installments = {}
         full_cash_flows = self.credit_balance_calculation()
-
-        for element in full_cash_flows:
-            total_installments[element["date"]] = element["total installment"]
-
-        return total_installments
+        return dict(zip(full_cash_flows["date"], full_cash_flows["total installment"]))
 
     def capital_installments_schedule_for_decreasing_installments(self):
         """Returns dictionary of final dates and amounts of all changed capital installments during credit lifetime."""
@@ -2079,16 +2248,11 @@ class CreditSchedule():
         # Capital installments during credit lifetime
         tranches = self.capital_installments_for_tranches_schedule()
         repayments = self.capital_installments_for_repayments_schedule()
-        try:
-            collateral = CreditCollateral.objects.get(credit=self.credit)
-        except CreditCollateral.DoesNotExist:
-            collateral = {}
+        collateral = self.snapshot.collateral
+        if collateral and collateral.capital_installment:
+            collateral = {collateral.collateral_set_date: collateral.capital_installment}
         else:
-            collateral = CreditCollateral.objects.get(credit=self.credit)
-            if collateral.capital_installment:
-                collateral = {collateral.collateral_set_date: collateral.capital_installment}
-            else:
-                collateral = {}
+            collateral = {}
         dictionaries = [tranches, repayments, collateral]
 
         # Capital installments combined (installment changes caused by interest rate
@@ -2131,13 +2295,8 @@ class CreditSchedule():
             return capital_installments
 
         # Fixed (equal) installments
-        capital_installments = {}
         full_cash_flows = self.credit_balance_calculation()
-
-        for element in full_cash_flows:
-            capital_installments[element["date"]] = element["capital installment"]
-
-        return capital_installments
+        return dict(zip(full_cash_flows["date"], full_cash_flows["capital installment"]))
 
     def initial_credit_balance(self):
         """Returns dictionary of date and balance of debt at credit start date"""
@@ -2157,11 +2316,11 @@ class CreditSchedule():
         if self.credit.tranches_in_credit == _("Nie"):
             initial_balance = self.credit.credit_amount
         elif (self.credit.tranches_in_credit == _("Tak")
-              and not CreditTranche.objects.filter(credit=self.credit).exists()):
+              and not self.snapshot.tranches):
             raise ValueError(_("Brak możliwości wyznaczenia wartości początkowej kredytu."
                                    " Uzupełnij wpierw transze kredytu."))
         else:
-            first_tranche = CreditTranche.objects.filter(credit=self.credit).order_by("tranche_date")[0]
+            first_tranche = self.snapshot.tranches[0]
             if first_tranche:
                 initial_balance = first_tranche.tranche_amount
             else:
@@ -2169,13 +2328,9 @@ class CreditSchedule():
                                    " Uzupełnij wpierw transze kredytu."))
 
         # Repayment at initial date
-        try:
-            early_repayment = CreditEarlyRepayment.objects.filter(credit=self.credit)
-        except CreditEarlyRepayment.DoesNotExist:
-            early_repayment = None
-        if early_repayment:
-            early_repayment = CreditEarlyRepayment.objects.filter(credit=self.credit).order_by(
-                "repayment_date")[0]
+        early_repayments = self.snapshot.early_repayments
+        if early_repayments:
+            early_repayment = early_repayments[0]
             if early_repayment.repayment_date == credit_balance["date"]:
                 initial_balance -= early_repayment.repayment_amount
 
@@ -2183,438 +2338,103 @@ class CreditSchedule():
         return credit_balance
 
     def credit_cash_flows_without_interest(self):
-        """Returns list of dictionaries with all available information provided by user
+        """Returns dictionary of columns (lists with one value for each date of
+        cash flow, in order of dates) with all available information provided by user
         concerning changes in credit before calculating interest and balance of credit."""
         all_dates = self.dates_set()
+        date_positions = {date: position for position, date in enumerate(all_dates)}
+
+        schedules = {
+            "payment from bank": self.payments_from_bank_schedule(),
+            "early repayment": self.early_repayments_schedule(),
+            "interest rate": self.interest_rates_schedule(),
+            "capital installment": self.capital_installments_schedule_for_decreasing_installments(),
+            "total installment": self.total_installments_schedule_for_fixed_installments(),
+            "insurance": self.insurance_payments_schedule(),
+            "other costs": self.additional_payments_schedule(),
+        }
 
-        basic_installment_dates = self.basic_installment_dates_list()
-        payments_from_bank = self.payments_from_bank_schedule()
-        early_repayments = self.early_repayments_schedule()
-        interest_rates = self.interest_rates_schedule()
-        capital_installments = self.capital_installments_schedule_for_decreasing_installments()
-        total_installments = self.total_installments_schedule_for_fixed_installments()
-        insurance_payments = self.insurance_payments_schedule()
-        additional_costs = self.additional_payments_schedule()
-
-        # cf_list_of_dict_keys = ["date", "payment from bank", "early repayment", "interest rate",
-        #       "capital installment", "total installment", "insurance", "other costs"]
-        cash_flow = []
-        for record in all_dates:
-            cash_flow.append({"date": record, "payment from bank": 0, "early repayment": 0,
-                              "interest rate": 0, "capital installment": 0,
-                              "total installment": 0, "insurance": 0, "other costs": 0})
-
-        for element in cash_flow:
-            for key, value in payments_from_bank.items():
-                if key == element["date"]:
-                    element["payment from bank"] += value
-        for element in cash_flow:
-            for key, value in early_repayments.items():
-                if key == element["date"]:
-                    element["early repayment"] += value
-        for element in cash_flow:
-            for key, value in interest_rates.items():
-                if key == element["date"]:
-                    element["interest rate"] += value
-        for element in cash_flow:
-            for key, value in capital_installments.items():
-                if key == element["date"]:
-                    element["capital installment"] += value
-        for element in cash_flow:
-            for key, value in total_installments.items():
-                if key == element["date"]:
-                    element["total installment"] += value
-        for element in cash_flow:
-            for key, value in insurance_payments.items():
-                if key == element["date"]:
-                    element["insurance"] += value
-        for element in cash_flow:
-            for key, value in additional_costs.items():
-                if key == element["date"]:
-                    element["other costs"] += value
+        # Each schedule is merged into its column by date position (dates
+        # absent in all_dates are omitted)
+        cash_flow = {"date": list(all_dates)}
+        for column, schedule in schedules.items():
+            values = [0] * len(all_dates)
+            for key, value in schedule.items():
+                position = date_positions.get(key)
+                if position is not None:
+                    values[position] += value
+            cash_flow[column] = values
 
         return cash_flow
 
+    @memoized
     def credit_balance_calculation(self):
-        """Returns list of dictionaries of all credit dates and cash flows."""
+        """Returns dictionary of columns of all credit dates and cash flows
+        (see credit_cash_flows_without_interest) completed with interest
+        installments and credit balance."""
         # Note: All calculations are based on ACT/ACT day count convention.
+        from .engine import (KERNEL_RESULTS, amortization_kernel, kernel_inputs,
+                             resume_point)
 
         initial_balance = self.initial_credit_balance()
         cash_flows = self.credit_cash_flows_without_interest()
         basic_installment_dates = self.basic_installment_dates_list()
 
-        # Auxiliary variables (for calculating changes inbetween installment payment days)
-        changes = False
-        interest_installment_changes = 0
-        interest_rate = 0
-        periods_in_cash_flows = len(cash_flows)
-        additional_days = False
-        normal_days = 0
-        leap_days = 0
-        i = 0
-
-        # Temporary logger
-        user = self.credit.user
-        file_directory = str(user.id) + "_credit"
-        if not os.path.exists(os.path.join(settings.MEDIA_ROOT, file_directory)):
-            os.mkdir(os.path.join(settings.MEDIA_ROOT, file_directory))
-        if os.path.exists(os.path.join(settings.MEDIA_ROOT, file_directory, "credit_temp2.txt")):
-            os.remove(os.path.join(settings.MEDIA_ROOT, file_directory, "credit_temp2.txt"))
-        open(os.path.join(settings.MEDIA_ROOT, file_directory, "credit_temp2.txt"), "x").close()
-
-        with open(os.path.join(settings.MEDIA_ROOT, file_directory, "credit_temp.txt"), "w+") as file:
-            file.write(str(initial_balance)+"\n"+"\n")
-            file.write(str(cash_flows)+"\n"+"\n")
-            file.write(str(basic_installment_dates)+"\n"+"\n")
-
-        def interest_installment_payments_considering_turn_of_the_leap_year():
-            days_in_year = 366 if calendar.isleap(element["date"].year) else 365
-
-            if not calendar.isleap(cash_flows[i - 1]["date"].year) and calendar.isleap(element["date"].year):
-                change_of_days = int((element["date"] - cash_flows[i - 1]["date"]).days)
-                year = cash_flows[i - 1]["date"].year
-                days_in_regular_year = int((datetime.date(year=year, month=12, day=31) - cash_flows[i - 1]["date"]).days + 1)
-                days_in_leap_year = int((element["date"] - (datetime.date(year=year + 1, month=1, day=1))).days)
-                if (days_in_regular_year + days_in_leap_year) != change_of_days:
-                    logger.info("🛑 Number of days does not match", element["date"],
-                                cash_flows[i - 1]["date"], change_of_days, days_in_regular_year, days_in_leap_year)
-                    raise ValueError("Incorrect calculations of number of days for payment at turn of the leap year.")
-                regular_year_days = days_in_regular_year + (normal_days if additional_days is True else 0)
-                leap_year_days = days_in_leap_year + (leap_days if additional_days is True else 0)
-                interest_installment = (round(previous_balance * (interest_rate * regular_year_days / 365), 2)
-                                       + round(previous_balance * (interest_rate * leap_year_days / 366), 2)
-                                       + (interest_installment_changes if changes is True else 0))
-
-            elif calendar.isleap(cash_flows[i - 1]["date"].year) and not calendar.isleap(element["date"].year):
-                change_of_days = int((element["date"] - cash_flows[i - 1]["date"]).days)
-                year = cash_flows[i - 1]["date"].year
-                days_in_leap_year = int((datetime.date(year=year, month=12, day=31) - cash_flows[i - 1]["date"]).days + 1)
-                days_in_regular_year = int((element["date"] - (datetime.date(year=year + 1, month=1, day=1))).days)
-                if round(days_in_regular_year) + round(days_in_leap_year) != round(change_of_days):
-                    logger.info("🛑 Number of days does not match", element["date"],
-                                cash_flows[i - 1]["date"], change_of_days, days_in_regular_year, days_in_leap_year)
-                    raise ValueError("Incorrect calculations of number of days for payment at turn of the leap year.")
-                regular_year_days = days_in_regular_year + (normal_days if additional_days is True else 0)
-                leap_year_days = days_in_leap_year + (leap_days if additional_days is True else 0)
-                interest_installment = (round(previous_balance * (interest_rate * leap_year_days / 366), 2)
-                                       + round(previous_balance * (interest_rate * regular_year_days / 365), 2)
-                                       + (interest_installment_changes if changes is True else 0))
+        calculation_trace = None
+        if self.trace is not None:
+            self.trace["initial balance"] = dict(initial_balance)
+            self.trace["installment dates"] = list(basic_installment_dates)
+            self.trace["cash flows"] = {key: list(values) for key, values in cash_flows.items()}
+            calculation_trace = self.trace["calculation"] = []
 
-            else:
-                if additional_days:
-                    leap_year_days = leap_days
-                    regular_year_days = normal_days + int((element["date"] - cash_flows[i - 1]["date"]).days)
-                    interest_installment = (round(previous_balance * (interest_rate * leap_year_days / 366), 2)
-                                           + round(previous_balance * (interest_rate * regular_year_days / 365), 2)
-                                           + (interest_installment_changes if changes is True else 0))
-                else:
-                    installment_period = int((element["date"] - cash_flows[i - 1]["date"]).days)
-                    interest_installment = round(previous_balance * (interest_rate * installment_period / days_in_year),
-                                                 2) + (interest_installment_changes if changes is True else 0)
-
-            return interest_installment
-
-        # For decreasing installments
         if self.credit.installment_type == _("Raty malejące"):
-            for element in cash_flows:
-
-                with open(os.path.join(settings.MEDIA_ROOT, file_directory, "credit_temp2.txt"), "a+") as file:
-                    file.write(str(i) + "\n")
-                    file.write("element[date]: " + str(element["date"]) + "\n")
-                    file.write("cash_flows[i][date]: " + str(cash_flows[i]["date"]) + "\n")
-                    file.write("changes: " + str(changes) + "\n")
-                    file.write("additional_days: " + str(additional_days) + "\n")
-                    file.write("normal_days: " + str(normal_days) + " leap_days: " + str(leap_days) + "\n" + "\n")
-
-                # Initial balance
-                if element["date"] == initial_balance["date"]:
-                    element["interest installment"] = 0
-                    element["credit balance"] = initial_balance["credit balance"]
-                    i += 1
-
-                # Other cash flows
-                else:
-                    previous_balance = cash_flows[i - 1]["credit balance"]
-
-                    # All debt is paid scenario
-                    if round(previous_balance, 0) == 0:
-                        element["capital installment"] = 0
-                        element["interest installment"] = 0
-                        element["total installment"] = 0
-                        element["credit balance"] = 0
-
-                    # Last installment payment scenario
-                    elif element["capital installment"] >= (previous_balance + element["payment from bank"]):
-                        new_balance = 0
-                        # days_in_year = 366 if calendar.isleap(element["date"].year) else 365
-                        interest_rate = (element["interest rate"] / 100)
-
-                        interest_installment = interest_installment_payments_considering_turn_of_the_leap_year()
-                        # interest_installment = round(previous_balance * (interest_rate * installment_period / days_in_year), 2)
-
-                        element["capital installment"] = previous_balance
-                        total_installment = interest_installment + previous_balance
-                        element["interest installment"] = interest_installment
-                        element["total installment"] = total_installment
-                        element["credit balance"] = new_balance
-                        additional_days = False
-                        i += 1
-
-                    # No credit changes (other payments related to credit but not with credit balance) [additional_days settlement]
-                    elif element["payment from bank"] == 0 and element["early repayment"] == 0 and element["date"] not in basic_installment_dates:
-                        additional_days = True
-                        element["credit balance"] = previous_balance
-                        element["interest installment"] = None
-
-                        if not calendar.isleap(cash_flows[i - 1]["date"].year) and calendar.isleap(element["date"].year):
-                            change_of_days = int((element["date"] - cash_flows[i - 1]["date"]).days)
-                            year = cash_flows[i - 1]["date"].year
-                            days_in_regular_year = int((datetime.date(year=year, month=12, day=31) - cash_flows[i - 1]["date"]).days + 1)
-                            days_in_leap_year = int((element["date"] - (datetime.date(year=year + 1, month=1, day=1))).days)
-                            if days_in_regular_year + days_in_leap_year != change_of_days:
-                                logger.info("🛑 Number of days does not match", element["date"],
-                                            cash_flows[i - 1]["date"], change_of_days, days_in_regular_year, days_in_leap_year)
-                                raise ValueError("Incorrect calculations of number of days for payment at turn of the leap year.")
-                            normal_days = days_in_regular_year
-                            leap_days = days_in_leap_year
-
-                        elif calendar.isleap(cash_flows[i - 1]["date"].year) and not calendar.isleap(element["date"].year):
-                            change_of_days = int((element["date"] - cash_flows[i - 1]["date"]).days)
-                            year = cash_flows[i - 1]["date"].year
-                            days_in_leap_year = int((datetime.date(year=year, month=12, day=31) - cash_flows[i - 1]["date"]).days + 1)
-                            days_in_regular_year = int((element["date"] - (datetime.date(year=year + 1, month=1, day=1))).days)
-                            if days_in_regular_year + days_in_leap_year != change_of_days:
-                                logger.info("🛑 Number of days does not match", element["date"],
-                                            cash_flows[i - 1]["date"], change_of_days, days_in_regular_year,
-                                            days_in_leap_year)
-                                raise ValueError("Incorrect calculations of number of days for payment at turn of the leap year.")
-                            normal_days = days_in_regular_year
-                            leap_days = days_in_leap_year
-
-                        else:
-                            days_in_regular_year = int((element["date"] - cash_flows[i - 1]["date"]).days)
-                            normal_days = days_in_regular_year
-                            leap_days = 0
-
-                        with open(os.path.join(settings.MEDIA_ROOT, file_directory, "credit_temp2.txt"), "a+") as file:
-                            file.write("element[date]: " + str(element["date"]) + "\n")
-                            file.write("cash_flows[i - 1][date]: " + str(cash_flows[i - 1]["date"]) + "\n")
-                            file.write("NORMAL DAYS: " + str(normal_days) + "\n")
-                            file.write("LEAP DAYS: " + str(leap_days) + "\n")
-
-                        i += 1
-
-                    # Changes in credit between installment dates scenario
-                    elif ((element["payment from bank"] > 0 or element["early repayment"] > 0)
-                          and element["date"] not in basic_installment_dates and element["date"] > self.credit.start_of_credit):
-                        changes = True
-                        # If rate of interest changes after tranche payment or early repayment date, interest should be calculated at new interest rate
-                        if i + 1 < periods_in_cash_flows:
-                            if cash_flows[i]["interest rate"] != cash_flows[i+1]["interest rate"]:
-                                interest_rate = (cash_flows[i+1]["interest rate"] / 100)
-                        new_balance = previous_balance - element["capital installment"] + element["payment from bank"] - element["early repayment"]
-                        days_in_year = 366 if calendar.isleap(element["date"].year) else 365
-
-                        if additional_days:
-                            leap_year_days = leap_days
-                            regular_year_days = normal_days + int((element["date"] - cash_flows[i - 1]["date"]).days)
-                            interest_installment_changes = round(previous_balance * (interest_rate * leap_year_days / 366), 2) \
-                                                   + round(previous_balance * (interest_rate * regular_year_days / 365), 2)
-                            additional_days = False
-                        else:
-                            installment_period = int((element["date"] - cash_flows[i - 1]["date"]).days)
-                            interest_installment_changes = round(previous_balance * (interest_rate * installment_period / days_in_year), 2)
-
-                        element["credit balance"] = new_balance
-                        element["interest installment"] = None
-                        previous_balance = new_balance
-
-                        i += 1
-
-                    # Changes in credit at installment dates scenario
-                    elif element["payment from bank"] > 0 or element["early repayment"] > 0 or element["date"] in basic_installment_dates:
-                        new_balance = previous_balance - element["capital installment"] + element["payment from bank"] - element["early repayment"]
-                        # days_in_year = 366 if calendar.isleap(element["date"].year) else 365
-                        interest_rate = (element["interest rate"] / 100)
-
-                        interest_installment = interest_installment_payments_considering_turn_of_the_leap_year()
-
-                        total_installment = interest_installment + element["capital installment"]
-                        element["interest installment"] = interest_installment
-                        element["total installment"] = total_installment
-                        element["credit balance"] = new_balance
-                        previous_balance = new_balance
-
-                        changes = False
-                        additional_days = False
-                        interest_installment_changes = 0
-                        i += 1
-
-            return cash_flows
-
-        # For fixed installments
-        if self.credit.installment_type == _("Raty równe"):
-            for element in cash_flows:
-
-                with open(os.path.join(settings.MEDIA_ROOT, file_directory, "credit_temp2.txt"), "a+") as file:
-                    file.write(str(i) + "\n")
-                    file.write("element[date]: " + str(element["date"]) + "\n")
-                    file.write("cash_flows[i][date]: " + str(cash_flows[i]["date"]) + "\n")
-                    file.write("changes: " + str(changes) + "\n")
-                    file.write("additional_days: " + str(additional_days) + "\n")
-                    file.write("normal_days: " + str(normal_days) + " leap_days: " + str(leap_days) + "\n" + "\n")
-
-                # Initial balance
-                if element["date"] == initial_balance["date"]:
-                    element["interest installment"] = 0
-                    element["capital installment"] = 0
-                    element["credit balance"] = initial_balance["credit balance"]
-                    i += 1
-
-                # Other cash flows
-                else:
-                    previous_balance = cash_flows[i - 1]["credit balance"]
-                    element["interest installment"] = 0
-                    element["credit balance"] = previous_balance
-
-                    # All debt is paid scenario
-                    if round(previous_balance, 0) == 0:
-                        element["interest installment"] = 0
-                        element["capital installment"] = 0
-                        element["total installment"] = 0
-                        element["credit balance"] = 0
-
-                    # Last installment scenario
-                    elif (element["payment from bank"] == 0
-                          and element["total installment"] > 0
-                          and (previous_balance - element["early repayment"] - cash_flows[i - 1]["capital installment"] <= 0)):
-                        interest_installment = (interest_installment_payments_considering_turn_of_the_leap_year())
-                        element["credit balance"] = 0
-                        # element["capital installment"] = previous_balance
-                        element["capital installment"] = (element["total installment"] - interest_installment)
-                        element["interest installment"] = interest_installment
-                        # Correcting amount of early repayment to value of unpaid debt
-                        if (element["capital installment"] + element["early repayment"]) > previous_balance:
-                            element["early repayment"] = previous_balance - (element["total installment"] - interest_installment)
-                        # element["total installment"] = previous_balance + interest_installment
-
-                        additional_days = False
-                        i += 1
-
-                    # No credit changes (other payments related to credit but not with credit balance) [additional_days settlement]
-                    elif element["payment from bank"] == 0 and element["early repayment"] == 0 and element["date"] not in basic_installment_dates:
-                        additional_days = True
-                        element["credit balance"] = previous_balance
-                        element["interest installment"] = None
-
-                        if not calendar.isleap(cash_flows[i - 1]["date"].year) and calendar.isleap(element["date"].year):
-                            change_of_days = int((element["date"] - cash_flows[i - 1]["date"]).days)
-                            year = cash_flows[i - 1]["date"].year
-                            days_in_regular_year = int((datetime.date(year=year, month=12, day=31) - cash_flows[i - 1]["date"]).days + 1)
-                            days_in_leap_year = int((element["date"] - (datetime.date(year=year + 1, month=1, day=1))).days)
-                            if days_in_regular_year + days_in_leap_year != change_of_days:
-                                logger.info("🛑 Number of days does not match", element["date"],
-                                            cash_flows[i - 1]["date"], change_of_days, days_in_regular_year,
-                                            days_in_leap_year)
-                                raise ValueError("Incorrect calculations of number of days for payment at turn of the leap year.")
-                            normal_days = days_in_regular_year
-                            leap_days = days_in_leap_year
-
-                        elif calendar.isleap(cash_flows[i - 1]["date"].year) and not calendar.isleap(element["date"].year):
-                            change_of_days = int((element["date"] - cash_flows[i - 1]["date"]).days)
-                            year = cash_flows[i - 1]["date"].year
-                            days_in_leap_year = int((datetime.date(year=year, month=12, day=31) - cash_flows[i - 1]["date"]).days + 1)
-                            days_in_regular_year = int((element["date"] - (datetime.date(year=year + 1, month=1, day=1))).days)
-                            if days_in_regular_year + days_in_leap_year != change_of_days:
-                                logger.info("🛑 Number of days does not match", element["date"],
-                                            cash_flows[i - 1]["date"], change_of_days, days_in_regular_year,
-                                            days_in_leap_year)
-                                raise ValueError(
-                                    "Incorrect calculations of number of days for payment at turn of the leap year.")
-                            normal_days = days_in_regular_year
-                            leap_days = days_in_leap_year
-
-                        else:
-                            days_in_regular_year = int((element["date"] - cash_flows[i - 1]["date"]).days)
-                            normal_days = days_in_regular_year
-                            leap_days = 0
-
-                        with open(os.path.join(settings.MEDIA_ROOT, file_directory, "credit_temp2.txt"), "a+") as file:
-                            file.write("element[date]: " + str(element["date"]) + "\n")
-                            file.write("cash_flows[i - 1][date]: " + str(cash_flows[i - 1]["date"]) + "\n")
-                            file.write("NORMAL DAYS: " + str(normal_days) + "\n")
-                            file.write("LEAP DAYS: " + str(leap_days) + "\n")
-
-                        i += 1
-
-                    # Changes in credit between installment dates scenario
-                    elif ((element["payment from bank"] > 0 or element["early repayment"] > 0)
-                          and element["date"] not in basic_installment_dates and element["date"] > self.credit.start_of_credit):
-                        changes = True
-                        # If rate of interest changes after tranche payment or early repayment date, interest should be calculated at new interest rate
-                        if i + 1 < periods_in_cash_flows:
-                            if cash_flows[i]["interest rate"] != cash_flows[i + 1]["interest rate"]:
-                                interest_rate = (cash_flows[i + 1]["interest rate"] / 100)
-                        new_balance = previous_balance - element["capital installment"] + element["payment from bank"] - element["early repayment"]
-                        days_in_year = 366 if calendar.isleap(element["date"].year) else 365
-
-                        if additional_days:
-                            leap_year_days = leap_days
-                            regular_year_days = normal_days + int((element["date"] - cash_flows[i - 1]["date"]).days)
-                            interest_installment_changes = round(previous_balance * (interest_rate * leap_year_days / 366), 2) \
-                                                           + round(previous_balance * (interest_rate * regular_year_days / 365), 2)
-                            additional_days = False
-                        else:
-                            installment_period = int((element["date"] - cash_flows[i - 1]["date"]).days)
-                            interest_installment_changes = round(previous_balance * (interest_rate * installment_period / days_in_year), 2)
-
-                        element["interest installment"] = None
-                        element["capital installment"] = 0
-                        element["credit balance"] = new_balance
-
-                        previous_balance = new_balance
-                        i += 1
-
-                    # Changes in credit at installment dates scenario
-                    elif element["payment from bank"] > 0 or element["early repayment"] > 0 or element["date"] in basic_installment_dates:
-                        # days_in_year = 366 if calendar.isleap(element["date"].year) else 365
-                        interest_rate = (element["interest rate"] / 100)
-
-                        interest_installment = interest_installment_payments_considering_turn_of_the_leap_year()
-
-                        capital_installment = element["total installment"] - interest_installment
-                        new_balance = previous_balance - capital_installment + element["payment from bank"] - element["early repayment"]
-                        element["interest installment"] = interest_installment
-                        element["capital installment"] = capital_installment
-                        element["credit balance"] = new_balance
-
-                        previous_balance = new_balance
-                        additional_days = False
-                        i += 1
-                        changes = False
-                        interest_installment_changes = 0
+            decreasing_installments = True
+        elif self.credit.installment_type == _("Raty równe"):
+            decreasing_installments = False
+        else:
+            return None
 
-            return cash_flows
+        kernel_arguments = dict(
+            dates=cash_flows["date"],
+            payments_from_bank=cash_flows["payment from bank"],
+            early_repayments=cash_flows["early repayment"],
+            interest_rates=cash_flows["interest rate"],
+            capital_installments=cash_flows["capital installment"],
+            total_installments=cash_flows["total installment"],
+            installment_dates=set(basic_installment_dates),
+            initial_date=initial_balance["date"],
+            initial_balance=initial_balance["credit balance"],
+            start_of_credit=self.credit.start_of_credit,
+            decreasing_installments=decreasing_installments,
+        )
+        inputs = kernel_inputs(**kernel_arguments)
+        # Calculation resumed from the last checkpoint of previous calculation
+        # of the credit before the first changed cash flow (not when tracing
+        # or when cache is not used)
+        resume = (resume_point(get_kernel_checkpoints(self.credit.id), inputs)
+                  if calculation_trace is None and self.use_cache else None)
+        checkpoints = []
+        results = amortization_kernel(**kernel_arguments, trace=calculation_trace,
+                                      checkpoints=checkpoints, resume=resume)
+        self.resumed_from = resume["index"] if resume else None
+        if self.use_cache:
+            set_kernel_checkpoints(self.credit.id, {
+                "inputs": inputs,
+                "results": {name: results[name] for name in KERNEL_RESULTS},
+                "checkpoints": checkpoints,
+            })
+        cash_flows.update(results)
+        return cash_flows
 
     def credit_balance_schedule(self):
         """Returns dictionary of dates and credit balance during credit lifetime."""
         full_cash_flows = self.credit_balance_calculation()
-
-        credit_balance = {}
-        for element in full_cash_flows:
-            credit_balance[element["date"]] = element["credit balance"]
-
-        return credit_balance
+        return dict(zip(full_cash_flows["date"], full_cash_flows["credit balance"]))
 
     def interest_installment_schedule(self):
         """Returns dictionary of dates and interest installments during credit lifetime."""
         full_cash_flows = self.credit_balance_calculation()
-
-        interest_installment = {}
-        for element in full_cash_flows:
-            interest_installment[element["date"]] = element["interest installment"]
-
-        return interest_installment
+        return dict(zip(full_cash_flows["date"], full_cash_flows["interest installment"]))
 
     def early_repayment_modified_schedule(self):
         """Returns dictionary of dates and early repayments during credit lifetime modified
@@ -2627,37 +2447,31 @@ class CreditSchedule():
                   "są poprawne i czy model zawiera prawidłowe odniesienia w polach wyboru "
                   "(polskie znaki są wymagane)."))
 
-        early_repayment = {}
-        for element in full_cash_flows:
-            early_repayment[element["date"]] = element["early repayment"]
-        return early_repayment
+        return dict(zip(full_cash_flows["date"], full_cash_flows["early repayment"]))
 
+    @memoized
     def insurance_payments_schedule(self):
         """Returns dictionary of dates and amounts of all insurance payments
         except of credited insurances."""
-        insurance_payments = {}
+        from .engine import payment_calendar
 
-        try:
-            insurances = CreditInsurance.objects.filter(credit=self.credit)
-        except CreditInsurance.DoesNotExist:
-            insurances = None
+        insurance_payments = {}
 
         payments = []
-        for insurance in insurances:
+        for insurance in self.snapshot.insurances:
             if not insurance.amount:
                 continue
             if insurance.frequency == _("Jednorazowo"):
                 payments.append((insurance.start_date, insurance.amount))
             else:
                 payments.append((insurance.start_date, insurance.amount))
-                i = 1
                 if insurance.payment_period is not None:
                     frequency = self.frequency(insurance.frequency) if insurance.frequency else 0
-                    for number in range(1, insurance.payment_period):
-                        payments.append(((insurance.start_date + relativedelta(
-                            months=frequency * i)) + relativedelta(
-                            day=insurance.start_date.day), insurance.amount))
-                        i += 1
+                    for date in payment_calendar(
+                            insurance.start_date, frequency,
+                            max(insurance.payment_period - 1, 0),
+                            insurance.start_date.day).tolist():
+                        payments.append((date, insurance.amount))
 
         for payment in payments:
             if payment[0] in insurance_payments.keys():
@@ -2676,25 +2490,15 @@ class CreditSchedule():
             additional_payments[self.credit.start_of_credit] = self.provision
 
         # Additional costs during credit lifetime
-        try:
-            additional_costs = CreditAdditionalCost.objects.filter(credit=self.credit).values("cost_amount", "cost_payment_date")
-        except CreditAdditionalCost.DoesNotExist:
-            additional_costs = []
-
-        for element in additional_costs:
-            if element["cost_payment_date"] in additional_payments.keys():
-                additional_payments[element["cost_payment_date"]] += element["cost_amount"]
+        for cost in self.snapshot.additional_costs:
+            if cost.cost_payment_date in additional_payments.keys():
+                additional_payments[cost.cost_payment_date] += cost.cost_amount
             else:
-                additional_payments[element["cost_payment_date"]] = element["cost_amount"]
+                additional_payments[cost.cost_payment_date] = cost.cost_amount
 
         return additional_payments
 
     def all_payments_connected_with_credit(self):
         """Returns dictionary of all dates and payments during credit lifetime"""
-        all_payments_schedule = {}
         full_cash_flows = self.credit_balance_calculation()
-
-        for element in full_cash_flows:
-            all_payments_schedule[element["date"]] = element["interest installment"]
-
-        return all_payments_schedule
+        return dict(zip(full_cash_flows["date"], full_cash_flows["interest installment"]))
@@ -2,6 +2,8 @@ from __future__ import annotations
 import uuid
 
 from django.conf import settings
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVector
 from django.core.exceptions import ValidationError
 from django.core.validators import MinValueValidator
 from django.db import models
@@ -198,6 +200,11 @@ class Medicine(models.Model):
                 fields=["user", "drug_name_and_dose"], name="unique_drug_name"
             )
         ]
+        indexes = [
+            models.Index(fields=["user", "-updated"], name="medicine_user_updated_idx"),
+            GinIndex(SearchVector("drug_name_and_dose", "disease", config=settings.SEARCH_CONFIG),
+                     name="medicine_search_idx"),
+        ]
 
     @classmethod
     def field_names(cls) -> list:
@@ -308,6 +315,11 @@ class MedicalVisit(models.Model):
                 name="unique_specialization_visit_date_time",
             )
         ]
+        indexes = [
+            models.Index(fields=["user", "-updated"], name="medical_visit_user_updated_idx"),
+            GinIndex(SearchVector("specialization", "doctor", config=settings.SEARCH_CONFIG),
+                     name="medical_visit_search_idx"),
+        ]
 
     def save(self, *args, **kwargs):
         self.full_clean()
@@ -361,6 +373,11 @@ class HealthTestResult(models.Model):
                 name="unique_test_name_date"
             )
         ]
+        indexes = [
+            models.Index(fields=["user", "-updated"], name="test_result_user_updated_idx"),
+            GinIndex(SearchVector("name", "test_result", "disease", config=settings.SEARCH_CONFIG),
+                     name="test_result_search_idx"),
+        ]
 
     def save(self, *args, **kwargs):
         self.full_clean()
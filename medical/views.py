@@ -4,12 +4,12 @@ from django.shortcuts import redirect, render
 from django.contrib import messages
 from django.contrib.auth import logout
 from django.core.validators import ValidationError
-from django.db.models import Q
 from django.http import HttpResponse
 from django.utils.translation import gettext_lazy as _
 from django.contrib.auth.decorators import login_required
 
 from connection.models import Attachment
+from search.engine import search
 from .models import MedCard, Medicine, MedicalVisit, HealthTestResult
 from .forms import (MedCardForm, MedicineForm,
                     MedicalVisitForm, HealthTestResultForm)
@@ -186,12 +186,8 @@ def medicines(request):
     # If search engine is empty, queryset data is displayed in full
     search_query = request.GET.get("q")
     if search_query:
-        medicines = Medicine.objects.filter(
-            user=request.user).filter(
-                Q(drug_name_and_dose__icontains=search_query) |
-                # Q(medication_frequency__icontains=search_query) |
-                Q(disease__icontains=search_query)
-                ).order_by(order)
+        medicines = search(all_medicines, search_query,
+                           ordered_by_user="sort_data" in request.GET)
         if not medicines:
             medicines = all_medicines
             messages.info(request, _("Brak danych spełniających wyszukiwane kryteria."))
@@ -396,10 +392,8 @@ def medical_visits(request):
     # If search engine is empty, queryset data is displayed in full
     search_query = request.GET.get("q")
     if search_query:
-        visits = MedicalVisit.objects.filter(
-            user=request.user).filter(
-                Q(specialization__icontains=search_query) | Q(doctor__icontains=search_query)
-                ).order_by(order)
+        visits = search(all_visits, search_query,
+                        ordered_by_user="sort_data" in request.GET)
         if not visits:
             visits = all_visits
             messages.info(request, _("Brak danych spełniających wyszukiwane kryteria."))
@@ -619,12 +613,8 @@ def test_results(request):
     # If search engine is empty, queryset data is displayed in full
     search_query = request.GET.get("q")
     if search_query:
-        test_results = HealthTestResult.objects.filter(
-            user=request.user).filter(
-                Q(name__icontains=search_query) |
-                Q(test_result__icontains=search_query) |
-                Q(disease__icontains=search_query)
-                ).order_by(order)
+        test_results = search(all_test_results, search_query,
+                              ordered_by_user="sort_data" in request.GET)
         if not test_results:
             test_results = all_test_results
             messages.info(request, _("Brak danych spełniających wyszukiwane kryteria."))
@@ -0,0 +1,200 @@
+from __future__ import annotations
+import contextlib
+import contextvars
+import logging
+import random
+import threading
+import time
+import tracemalloc
+
+from django.conf import settings
+from django.db import connections
+from django.template.base import Template
+
+logger = logging.getLogger("all")
+
+# Measurements of current request (None outside of measured request)
+_current = contextvars.ContextVar("request_metrics", default=None)
+
+# Requests handled by process and measurement of request with traced memory
+# (tracemalloc traces allocations of all threads of process)
+_requests_lock = threading.Lock()
+_requests_in_progress = 0
+_memory_sample = None
+
+
+class RequestMetrics:
+    """Cost of requests aggregated per URL name (in memory of process):
+    wall time, number and time of database queries, template render time
+    and peak Python memory allocation (only sampled requests)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._views = {}
+
+    def record(self, view_name, measurement: dict) -> None:
+        with self._lock:
+            view = self._views.setdefault(view_name, {
+                "requests": 0, "time": 0.0, "max time": 0.0,
+                "queries": 0, "max queries": 0, "query time": 0.0,
+                "render time": 0.0, "memory samples": 0, "max peak memory": 0,
+                "over budget": 0,
+            })
+            view["requests"] += 1
+            view["time"] += measurement["time"]
+            view["max time"] = max(view["max time"], measurement["time"])
+            view["queries"] += measurement["queries"]
+            view["max queries"] = max(view["max queries"], measurement["queries"])
+            view["query time"] += measurement["query time"]
+            view["render time"] += measurement["render time"]
+            if measurement.get("peak memory") is not None:
+                view["memory samples"] += 1
+                view["max peak memory"] = max(view["max peak memory"],
+                                              measurement["peak memory"])
+            if measurement.get("over budget"):
+                view["over budget"] += 1
+
+    def summary(self) -> dict:
+        """Returns totals and averages per URL name (URL name: metrics),
+        the most expensive views (by total time) first."""
+        with self._lock:
+            views = {name: dict(view) for name, view in self._views.items()}
+        for view in views.values():
+            requests = view["requests"]
+            view["average time"] = view["time"] / requests
+            view["average queries"] = view["queries"] / requests
+            view["average query time"] = view["query time"] / requests
+            view["average render time"] = view["render time"] / requests
+        return dict(sorted(views.items(), key=lambda item: item[1]["time"], reverse=True))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._views.clear()
+
+
+request_metrics = RequestMetrics()
+
+
+def view_budget(view_name) -> dict:
+    """Query and latency budget of view (REQUEST_METRICS_BUDGETS setting for
+    URL name, default budgets otherwise)."""
+    budget = {
+        "queries": getattr(settings, "REQUEST_METRICS_QUERY_BUDGET", None),
+        "time": getattr(settings, "REQUEST_METRICS_TIME_BUDGET", None),
+    }
+    budget.update(getattr(settings, "REQUEST_METRICS_BUDGETS", {}).get(view_name, {}))
+    return budget
+
+
+def _measure_query(execute, sql, params, many, context):
+    measurement = _current.get()
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        if measurement is not None:
+            measurement["queries"] += 1
+            measurement["query time"] += time.perf_counter() - start
+
+
+_template_render = Template.render
+
+
+def _measured_template_render(self, context):
+    measurement = _current.get()
+    # Only top-level templates are timed (included templates are rendered
+    # within them, with template already bound to context)
+    if measurement is None or context.template is not None:
+        return _template_render(self, context)
+    start = time.perf_counter()
+    try:
+        return _template_render(self, context)
+    finally:
+        measurement["render time"] += time.perf_counter() - start
+
+
+def _start_request(measurement) -> bool:
+    """Registers request in progress and starts tracing memory allocation
+    if request is sampled. Returns True if memory is traced."""
+    global _requests_in_progress, _memory_sample
+    with _requests_lock:
+        _requests_in_progress += 1
+        if _memory_sample is not None:
+            # Allocations of this request would be counted in sampled one
+            _memory_sample["memory disturbed"] = True
+        sample_memory = (_requests_in_progress == 1
+                         and random.random()
+                         < getattr(settings, "REQUEST_METRICS_MEMORY_SAMPLE_RATE", 0)
+                         and not tracemalloc.is_tracing())
+        if sample_memory:
+            _memory_sample = measurement
+            tracemalloc.start()
+        return sample_memory
+
+
+def _finish_request(measurement, sample_memory) -> None:
+    """Unregisters request in progress and stops tracing memory allocation
+    of sampled request (peak is recorded only if no other request was
+    handled by process in the meantime)."""
+    global _requests_in_progress, _memory_sample
+    with _requests_lock:
+        _requests_in_progress -= 1
+        if sample_memory:
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            _memory_sample = None
+            if not measurement.pop("memory disturbed", False):
+                measurement["peak memory"] = peak
+
+
+class RequestMetricsMiddleware:
+    """Records cost of each request (see RequestMetrics) and logs requests
+    exceeding query or latency budget of view (see view_budget).
+
+    Render time of templates is measured by wrapper of Template.render
+    installed with middleware, which measures only templates rendered in
+    thread (or task) handling measured request (see _current).
+    Peak memory allocation is traced only for part of requests
+    (REQUEST_METRICS_MEMORY_SAMPLE_RATE setting), as tracemalloc slows
+    down the whole process while tracing. Tracing covers all threads of
+    process, so only requests started when no other request is in progress
+    are sampled (sample is dropped if another request starts meanwhile) -
+    with threaded server under load memory is rarely sampled, allocations
+    of background threads (e.g. credit.jobs) are included in peak."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if Template.render is _template_render:
+            Template.render = _measured_template_render
+
+    def __call__(self, request):
+        measurement = {"queries": 0, "query time": 0.0, "render time": 0.0}
+        token = _current.set(measurement)
+        sample_memory = _start_request(measurement)
+        start = time.perf_counter()
+        try:
+            with contextlib.ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(_measure_query))
+                response = self.get_response(request)
+        finally:
+            measurement["time"] = time.perf_counter() - start
+            _finish_request(measurement, sample_memory)
+            _current.reset(token)
+
+        match = request.resolver_match
+        view_name = match.view_name if match else None
+        if view_name:
+            budget = view_budget(view_name)
+            exceeded = [
+                f"{name}: {measurement[name]:.3f} (budget: {budget[name]})"
+                if name == "time" else
+                f"{name}: {measurement[name]} (budget: {budget[name]})"
+                for name in ("queries", "time")
+                if budget[name] is not None and measurement[name] > budget[name]]
+            if exceeded:
+                measurement["over budget"] = True
+                logger.warning("view: %s - request over budget - %s"
+                               % (view_name, ", ".join(exceeded)))
+            request_metrics.record(view_name, measurement)
+        return response
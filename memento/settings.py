@@ -37,11 +37,13 @@ INSTALLED_APPS = [
     "payment",
     "planner",
     "renovation",
+    "search",
     "trip",
     "user",
 ]
 
 MIDDLEWARE = [
+    "memento.metrics.RequestMetricsMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -93,6 +95,47 @@ DATABASES = {
     }
 }
 
+# Cache
+# (used among others for calculated credit repayment schedules, see credit/schedule_cache.py;
+# file based cache: "django.core.cache.backends.filebased.FileBasedCache")
+
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "memento",
+    }
+}
+CREDIT_SCHEDULE_CACHE_TIMEOUT = 60 * 60 * 24
+# Recording of credit balance calculation in memory (CreditSchedule.export_trace)
+CREDIT_SCHEDULE_TRACE = False
+# Limit of iterations of XIRR solver (XIRR is "n/a" if it is not found)
+CREDIT_SCHEDULE_XIRR_MAX_ITERATIONS = 100
+# Calculation of credit schedule (not found in cache) in background threads
+# of web server process - page polling status of calculation is returned
+# (cache shared between processes required with many web server processes)
+CREDIT_SCHEDULE_ASYNC = False
+CREDIT_SCHEDULE_ASYNC_WORKERS = 2
+
+# Text search configuration of PostgreSQL used in list views (search/engine.py),
+# e.g. "polish" if configuration with Polish dictionary is created on server
+# (it is part of GIN indexes of searched models - after changing it new
+# migration changing the indexes is needed)
+SEARCH_CONFIG = os.environ.get("POSTGRES_SEARCH_CONFIG", "simple")
+
+# Cost of requests per URL name (memento.metrics, admin page: admin/request-metrics/)
+# Requests exceeding budget (number of database queries, time in seconds) are
+# logged, budgets of single views (URL name: budget) override default ones
+REQUEST_METRICS_QUERY_BUDGET = 50
+REQUEST_METRICS_TIME_BUDGET = 1.0
+REQUEST_METRICS_BUDGETS = {
+    "credit:credit-repayment-schedule": {"time": 3.0},
+    "credit:access-to-credit-schedule": {"time": 3.0},
+    "credit:download-credit": {"time": 3.0},
+}
+# Part of requests with traced peak memory allocation (tracemalloc, only
+# requests not handled concurrently with other ones, see RequestMetricsMiddleware)
+REQUEST_METRICS_MEMORY_SAMPLE_RATE = 0.01
+
 # Password validation
 
 AUTH_PASSWORD_VALIDATORS = [
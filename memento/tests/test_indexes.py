@@ -0,0 +1,132 @@
+import unittest
+
+from django.db import connection
+from django.test import TestCase
+
+from access.enums import Access
+from connection.factories import AttachmentFactory, CounterpartyFactory
+from connection.models import Attachment, Counterparty
+from credit.factories import CreditFactory
+from credit.models import Credit
+from medical.factories import (HealthTestResultFactory, MedicalVisitFactory,
+                               MedicineFactory)
+from medical.models import HealthTestResult, MedicalVisit, Medicine
+from payment.factories import PaymentFactory
+from payment.models import Payment
+from planner.factories import ExpenseListFactory, ToDoListFactory
+from planner.models import ExpenseList, ToDoList
+from renovation.factories import RenovationFactory
+from renovation.models import Renovation
+from trip.factories import TripFactory
+from trip.models import Trip
+from user.factories import UserFactory
+from user.models import User
+
+# Models of list views (factory, fields unique for each record of user)
+LIST_MODELS = {
+    Credit: (CreditFactory, lambda n: {"name": f"Credit {n}", "slug": f"credit-{n}"}),
+    Payment: (PaymentFactory, lambda n: {"name": f"Payment {n}"}),
+    Trip: (TripFactory, lambda n: {"name": f"Trip {n}"}),
+    Renovation: (RenovationFactory, lambda n: {"name": f"Renovation {n}"}),
+    Counterparty: (CounterpartyFactory, lambda n: {"name": f"Counterparty {n}"}),
+    Attachment: (AttachmentFactory, lambda n: {
+        "attachment_name": f"Attachment {n}", "slug": f"attachment-{n}",
+        "attachment_path": ""}),
+    Medicine: (MedicineFactory, lambda n: {"drug_name_and_dose": f"Medicine {n}"}),
+    MedicalVisit: (MedicalVisitFactory, lambda n: {"specialization": f"Specialization {n}"}),
+    HealthTestResult: (HealthTestResultFactory, lambda n: {"name": f"Test {n}"}),
+    ExpenseList: (ExpenseListFactory, lambda n: {"name": f"Expense list {n}"}),
+    ToDoList: (ToDoListFactory, lambda n: {"name": f"To do list {n}"}),
+}
+
+# Models of records shared on access pages (filtered by access_granted)
+SHARED_MODELS = (Credit, Payment, Trip, Renovation, Counterparty, Attachment,
+                 ExpenseList, ToDoList)
+
+
+def access(model, n) -> dict:
+    """Access fields of record (every other record of shared models is shared)."""
+    if model not in SHARED_MODELS:
+        return {}
+    access = Access.ACCESS_GRANTED if n % 2 else Access.NO_ACCESS_GRANTED
+    if model is Credit:
+        return {"access_granted": access, "access_granted_for_schedule": access}
+    return {"access_granted": access}
+
+
+class ListIndexesTests(TestCase):
+    """Test indexes of queries of list views and access views."""
+
+    def test_list_models_have_user_indexes(self):
+        """Test if list models declare indexes of list and access queries."""
+        for model in LIST_MODELS:
+            fields = [index.fields for index in model._meta.indexes]
+            self.assertIn(["user", "-updated"], fields)
+            if model in SHARED_MODELS:
+                self.assertIn(["user", "access_granted", "-updated"], fields)
+        self.assertIn(["user", "access_granted_for_schedule", "-updated"],
+                      [index.fields for index in Credit._meta.indexes])
+
+    def test_indexes_are_created_in_database(self):
+        """Test if declared indexes of fields exist in database with their
+        columns (indexes of search vectors are tested in search app)."""
+        with connection.cursor() as cursor:
+            for model in LIST_MODELS:
+                constraints = connection.introspection.get_constraints(
+                    cursor, model._meta.db_table)
+                for index in model._meta.indexes:
+                    if not index.fields:
+                        continue
+                    columns = [model._meta.get_field(field.lstrip("-")).column
+                               for field in index.fields]
+                    self.assertEqual(constraints[index.name]["columns"], columns)
+
+
+@unittest.skipUnless(connection.vendor == "postgresql",
+                     "query plans are checked on PostgreSQL (production database)")
+class ListQueryPlansTests(TestCase):
+    """Test if list and access queries use index scans on dataset of
+    realistic size (many users with many records each)."""
+
+    USERS = 100
+    RECORDS = 50
+
+    @classmethod
+    def setUpTestData(cls):
+        users = User.objects.bulk_create([
+            UserFactory.build(username=f"user{n}", email=f"user{n}@example.com")
+            for n in range(cls.USERS)])
+        cls.user = users[0]
+        for model, (factory, unique_fields) in LIST_MODELS.items():
+            model.objects.bulk_create([
+                factory.build(user=user, **unique_fields(f"{u}-{n}"),
+                              **access(model, n))
+                for u, user in enumerate(users) for n in range(cls.RECORDS)])
+        with connection.cursor() as cursor:
+            for model in LIST_MODELS:
+                cursor.execute(f"ANALYZE {model._meta.db_table}")
+
+    def assertIndexScan(self, queryset):
+        plan = queryset.explain()
+        self.assertNotIn("Seq Scan", plan)
+        self.assertIn("Index", plan)
+
+    def test_list_queries_use_index_scan(self):
+        """Test if records of user sorted by update date are read by index."""
+        for model in LIST_MODELS:
+            with self.subTest(model=model.__name__):
+                self.assertIndexScan(
+                    model.objects.filter(user=self.user).order_by("-updated"))
+
+    def test_access_queries_use_index_scan(self):
+        """Test if records shared by user are read by index."""
+        for model in SHARED_MODELS:
+            with self.subTest(model=model.__name__):
+                self.assertIndexScan(
+                    model.objects.filter(user=self.user,
+                                         access_granted=Access.ACCESS_GRANTED)
+                    .order_by("-updated"))
+        self.assertIndexScan(
+            Credit.objects.filter(user=self.user,
+                                  access_granted_for_schedule=Access.ACCESS_GRANTED)
+            .order_by("-updated"))
@@ -0,0 +1,94 @@
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from credit.factories import CreditFactory
+from memento import metrics as request_metrics_module
+from memento.metrics import request_metrics, view_budget
+from user.factories import UserFactory
+
+
+class RequestMetricsTests(TestCase):
+    """Test measurement of cost of requests per URL name."""
+
+    def setUp(self):
+        request_metrics.clear()
+        self.user = UserFactory(
+            username="johndoe123", email="jd@example.com", password="testpass456")
+        CreditFactory(user=self.user)
+        self.staff_user = UserFactory(
+            username="staffuser123", email="staff@example.com",
+            password="testpass789", is_staff=True)
+
+    def tearDown(self):
+        request_metrics.clear()
+
+    @override_settings(REQUEST_METRICS_MEMORY_SAMPLE_RATE=1)
+    def test_request_cost_recorded_per_url_name(self):
+        """Test if time, queries, render time and memory are recorded."""
+        self.client.force_login(self.user)
+        self.client.get(reverse("credit:credits"))
+        self.client.get(reverse("credit:credits"))
+        metrics = request_metrics.summary()["credit:credits"]
+        self.assertEqual(metrics["requests"], 2)
+        self.assertGreater(metrics["queries"], 0)
+        self.assertEqual(metrics["max queries"] * 2, metrics["queries"])
+        self.assertGreater(metrics["render time"], 0)
+        self.assertLess(metrics["render time"], metrics["time"])
+        self.assertEqual(metrics["memory samples"], 2)
+        self.assertGreater(metrics["max peak memory"], 0)
+
+    def test_render_time_of_template_response(self):
+        """Test if render time of response rendered after view (admin page)
+        is recorded."""
+        self.client.force_login(self.staff_user)
+        self.client.get(reverse("admin:index"))
+        metrics = request_metrics.summary()["admin:index"]
+        self.assertGreater(metrics["render time"], 0)
+        self.assertLess(metrics["render time"], metrics["time"])
+
+    @override_settings(REQUEST_METRICS_MEMORY_SAMPLE_RATE=1)
+    def test_memory_not_sampled_with_concurrent_requests(self):
+        """Test if memory is not sampled when requests are handled
+        concurrently (tracemalloc traces the whole process)."""
+        self.client.force_login(self.user)
+        other_request = {}
+        sample_memory = request_metrics_module._start_request(other_request)
+        try:
+            self.client.get(reverse("credit:credits"))
+        finally:
+            request_metrics_module._finish_request(other_request, sample_memory)
+        self.assertTrue(sample_memory)
+        self.assertNotIn("peak memory", other_request)
+        self.assertEqual(request_metrics.summary()["credit:credits"]["memory samples"], 0)
+
+    @override_settings(REQUEST_METRICS_QUERY_BUDGET=1,
+                       REQUEST_METRICS_BUDGETS={"credit:credits": {"time": 0}})
+    def test_request_over_budget_logged(self):
+        """Test if request exceeding budget of view is logged."""
+        self.assertEqual(view_budget("credit:credits"), {"queries": 1, "time": 0})
+        self.client.force_login(self.user)
+        with self.assertLogs("all", level="WARNING") as logs:
+            self.client.get(reverse("credit:credits"))
+        self.assertIn("view: credit:credits - request over budget - queries:", logs.output[0])
+        self.assertIn("time:", logs.output[0])
+        self.assertEqual(request_metrics.summary()["credit:credits"]["over budget"], 1)
+
+    def test_metrics_available_to_staff(self):
+        """Test if metrics page and JSON data are available to staff users."""
+        self.client.force_login(self.user)
+        self.client.get(reverse("credit:credits"))
+        self.client.force_login(self.staff_user)
+        response = self.client.get(reverse("request-metrics-data"))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["credit:credits"]["requests"], 1)
+        response = self.client.get(reverse("request-metrics"))
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, "credit:credits")
+
+    def test_metrics_not_available_to_other_users(self):
+        """Test if user who is not staff member is redirected to admin login."""
+        self.client.force_login(self.user)
+        for name in ("request-metrics", "request-metrics-data"):
+            response = self.client.get(reverse(name))
+            self.assertEqual(response.status_code, 302)
+            self.assertIn(reverse("admin:login"), response.url)
@@ -5,7 +5,12 @@ from django.conf.urls.static import \
 from django.contrib import admin
 from django.urls import include, path
 
+from . import views
+
 urlpatterns = [
+    path("admin/request-metrics/", views.request_metrics_admin, name="request-metrics"),
+    path("admin/request-metrics/data/", views.request_metrics_data,
+         name="request-metrics-data"),
     path("admin/", admin.site.urls),
     path("", include("user.urls")),
     path("", include("connection.urls")),
@@ -16,6 +21,7 @@ urlpatterns = [
     path("", include("trip.urls")),
     path("", include("planner.urls")),
     path("", include("medical.urls")),
+    path("", include("search.urls")),
 ]
 
 
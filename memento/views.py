@@ -0,0 +1,41 @@
+from django.contrib import admin
+from django.contrib.admin.views.decorators import staff_member_required
+from django.http import JsonResponse
+from django.shortcuts import render
+from django.utils.translation import gettext_lazy as _
+
+from .metrics import request_metrics
+
+# Columns of admin page (heading, metric, number of decimal places)
+METRICS_COLUMNS = (
+    (_("Liczba żądań"), "requests", 0),
+    (_("Średni czas"), "average time", 3),
+    (_("Maks. czas"), "max time", 3),
+    (_("Średnia liczba zapytań SQL"), "average queries", 1),
+    (_("Maks. liczba zapytań SQL"), "max queries", 0),
+    (_("Średni czas zapytań SQL"), "average query time", 3),
+    (_("Średni czas renderowania"), "average render time", 3),
+    (_("Maks. pamięć (próbki)"), "max peak memory", 0),
+    (_("Przekroczony budżet"), "over budget", 0),
+)
+
+
+@staff_member_required
+def request_metrics_admin(request):
+    # Cost of requests per URL name measured by RequestMetricsMiddleware
+    # (in memory of current process)
+    rows = [(view_name, [round(view[metric], places) if places else view[metric]
+                         for _heading, metric, places in METRICS_COLUMNS])
+            for view_name, view in request_metrics.summary().items()]
+    context = {
+        **admin.site.each_context(request),
+        "title": _("Koszt żądań"),
+        "headings": [heading for heading, _metric, _places in METRICS_COLUMNS],
+        "rows": rows,
+    }
+    return render(request, "admin/request_metrics.html", context)
+
+
+@staff_member_required
+def request_metrics_data(request):
+    return JsonResponse(request_metrics.summary(), json_dumps_params={"ensure_ascii": False})
@@ -2,6 +2,8 @@ from __future__ import annotations
 import uuid
 
 from django.conf import settings
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVector
 from django.core.exceptions import ValidationError
 from django.core.validators import MinValueValidator
 from django.db import models
@@ -100,6 +102,14 @@ class Payment(models.Model):
                 fields=["user", "name"],
                 name="unique_payment_name")
             ]
+        indexes = [
+            models.Index(fields=["user", "-updated"], name="payment_user_updated_idx"),
+            models.Index(fields=["user", "access_granted", "-updated"],
+                         name="payment_user_access_idx"),
+            GinIndex(SearchVector("name", "payment_type", "payment_frequency",
+                                  config=settings.SEARCH_CONFIG),
+                     name="payment_search_idx"),
+        ]
 
     @classmethod
     def field_names(cls) -> list:
@@ -4,7 +4,6 @@ from django.contrib import messages
 from django.contrib.auth import logout
 from django.contrib.auth.decorators import login_required
 from django.core.exceptions import ValidationError
-from django.db.models import Q
 from django.http import HttpResponse
 from django.utils.translation import gettext_lazy as _
 from django.shortcuts import redirect, render
@@ -12,6 +11,7 @@ from django.shortcuts import redirect, render
 from connection.models import Attachment
 from payment.forms import PaymentForm
 from payment.models import Payment
+from search.engine import search
 
 logger = logging.getLogger("all")
 
@@ -40,16 +40,9 @@ def payments(request):
     # Searching engine - search through selected fields
     # If search engine is empty, queryset data is displayed in full
     search_query = request.GET.get("q")
-    if search_query and (search_query.isdigit() or search_query.isdecimal()):
-        search_query = float(search_query)
-    if isinstance(search_query, float):
-        payments = Payment.objects.filter(
-            user=request.user).filter(payment_value__gte=search_query).order_by(order)
-    elif search_query:
-        payments = Payment.objects.filter(
-            user=request.user).filter(Q(name__icontains=search_query) |
-                                      Q(payment_type__icontains=search_query) |
-                                      Q(payment_frequency__icontains=search_query)).order_by(order)
+    if search_query:
+        payments = search(all_payments, search_query, number_field="payment_value",
+                          ordered_by_user="sort_data" in request.GET)
     else:
         payments = None
     if not payments:
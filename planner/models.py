@@ -2,6 +2,8 @@ from __future__ import annotations
 import uuid
 
 from django.conf import settings
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVector
 from django.db import models
 from django.core.exceptions import ValidationError
 from django.core.validators import MinValueValidator
@@ -71,6 +73,13 @@ class ExpenseList(models.Model):
                 name="unique_expense_list_title"
                 )
             ]
+        indexes = [
+            models.Index(fields=["user", "-updated"], name="expense_list_user_updated_idx"),
+            models.Index(fields=["user", "access_granted", "-updated"],
+                         name="expense_list_user_access_idx"),
+            GinIndex(SearchVector("name", config=settings.SEARCH_CONFIG),
+                     name="expense_list_search_idx"),
+        ]
 
     def clean(self):
         if self.access_granted not in Access.values:
@@ -147,6 +156,12 @@ class ExpenseItem(models.Model):
         for field in self._meta.fields:
             yield (field.verbose_name, field.value_to_string(self))
 
+    class Meta:
+        indexes = [
+            GinIndex(SearchVector("name", "description", config=settings.SEARCH_CONFIG),
+                     name="expense_item_search_idx"),
+        ]
+
     def clean(self):
         if self.execution_status and self.execution_status not in ExecutionStatus.values:
             raise ValidationError(_("Błędna wartość pola 'Status wykonania' (%s). Sprawdź czy "
@@ -206,6 +221,13 @@ class ToDoList(models.Model):
                 name="unique_todo_list_title"
                 )
         ]
+        indexes = [
+            models.Index(fields=["user", "-updated"], name="todo_list_user_updated_idx"),
+            models.Index(fields=["user", "access_granted", "-updated"],
+                         name="todo_list_user_access_idx"),
+            GinIndex(SearchVector("name", config=settings.SEARCH_CONFIG),
+                     name="todo_list_search_idx"),
+        ]
 
     def clean(self):
         if self.access_granted not in Access.values:
@@ -276,6 +298,10 @@ class ToDoItem(models.Model):
 
     class Meta:
         ordering = ["due_date"]
+        indexes = [
+            GinIndex(SearchVector("name", "description", "notes", config=settings.SEARCH_CONFIG),
+                     name="todo_item_search_idx"),
+        ]
 
     def clean(self):
         if self.execution_status and self.execution_status not in ExecutionStatus.values:
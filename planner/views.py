@@ -5,12 +5,12 @@ from django.contrib.auth import logout
 from django.contrib.auth.decorators import login_required
 from django.core.exceptions import ValidationError
 from django.core.paginator import Paginator
-from django.db.models import Q
 from django.db.models.functions import Lower
 from django.http import HttpResponse
 from django.shortcuts import render, redirect
 from django.utils.translation import gettext_lazy as _
 
+from search.engine import search
 from .forms import ExpenseListForm, ExpenseItemForm, ToDoListForm, ToDoItemForm
 from .models import ExpenseList, ExpenseItem, ToDoList, ToDoItem
 
@@ -62,9 +62,7 @@ def expense_lists(request):
 
     search_query = request.GET.get("q")
     if search_query:
-        expense_list = ExpenseList.objects.filter(
-            user=request.user).filter(
-            name__icontains=search_query).order_by("-updated")
+        expense_list = search(full_expense_list, search_query)
     else:
         expense_list = full_expense_list
 
@@ -108,14 +106,11 @@ def single_expense_list(request, pk):
         estimated_costs = 0
         paid_costs = 0
 
-    # Searching engine - search through selected fields
+    # Searching engine - search through selected fields of items of list
     # If search engine is empty, queryset data is displayed in full
     search_query = request.GET.get("q")
     if search_query:
-        expense_items_search = ExpenseItem.objects.filter(
-            user=request.user).filter(Q(name__icontains=search_query) |
-                                      Q(description__icontains=search_query)).order_by(
-                                          Lower("name"))
+        expense_items_search = search(expense_items, search_query)
     else:
         expense_items_search = None
     if not expense_items_search:
@@ -423,9 +418,7 @@ def todo_lists(request,):
 
     search_query = request.GET.get("q")
     if search_query:
-        todo_list = ToDoList.objects.filter(
-            user=request.user).filter(
-            name__icontains=search_query).order_by("-updated")
+        todo_list = search(full_todo_list, search_query)
     else:
         todo_list = full_todo_list
 
@@ -465,14 +458,11 @@ def single_todo_list(request, pk):
     except ToDoItem.DoesNotExist:
         todo_items = None
 
-    # Searching engine - search through selected fields
+    # Searching engine - search through selected fields of items of list
     # If search engine is empty, queryset data is displayed in full
     search_query = request.GET.get("q")
     if search_query:
-        todo_items_search = ToDoItem.objects.filter(
-            user=request.user).filter(Q(name__icontains=search_query) |
-                                      Q(description__icontains=search_query) |
-                                      Q(notes__icontains=search_query)).order_by(Lower("name"))
+        todo_items_search = search(todo_items, search_query)
     else:
         todo_items_search = None
     if not todo_items_search:
@@ -2,6 +2,8 @@ from __future__ import annotations
 import uuid
 
 from django.conf import settings
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVector
 from django.db import models
 from django.core.exceptions import ValidationError
 from django.core.validators import MinValueValidator
@@ -51,6 +53,13 @@ class Renovation(models.Model):
                 fields=["user", "name"], name="unique_renovation_name"
             )
         ]
+        indexes = [
+            models.Index(fields=["user", "-updated"], name="renovation_user_updated_idx"),
+            models.Index(fields=["user", "access_granted", "-updated"],
+                         name="renovation_user_access_idx"),
+            GinIndex(SearchVector("name", config=settings.SEARCH_CONFIG),
+                     name="renovation_search_idx"),
+        ]
 
     @classmethod
     def field_names(cls) -> list:
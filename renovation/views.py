@@ -4,12 +4,12 @@ from django.contrib import messages
 from django.contrib.auth import logout
 from django.contrib.auth.decorators import login_required
 from django.core.exceptions import ValidationError
-from django.db.models import Q
 from django.http import HttpResponse
 from django.shortcuts import redirect, render
 from django.utils.translation import gettext_lazy as _
 
 from connection.models import Attachment
+from search.engine import search
 from .forms import RenovationForm, RenovationCostForm
 from .models import Renovation, RenovationCost
 
@@ -40,14 +40,9 @@ def renovations(request):
     # Searching engine - search by name or value of estimated cost (gte)
     # If search engine is empty, queryset data is displayed in full
     search_query = request.GET.get("q")
-    if search_query and (search_query.isdigit() or search_query.isdecimal()):
-        search_query = float(search_query)
-    if isinstance(search_query, float):
-        renovations = Renovation.objects.filter(
-            user=request.user).filter(estimated_cost__gte=search_query).order_by(order)
-    elif search_query:
-        renovations = Renovation.objects.filter(
-            user=request.user).filter(name__icontains=search_query).order_by(order)
+    if search_query:
+        renovations = search(all_renovations, search_query, number_field="estimated_cost",
+                             ordered_by_user="sort_data" in request.GET)
     else:
         renovations = None
     if not renovations:
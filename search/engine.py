@@ -0,0 +1,65 @@
+from __future__ import annotations
+import re
+
+from django.conf import settings
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector
+
+NUMBER = re.compile(r"\d+([.,]\d+)?")
+
+
+def search_vector(fields) -> SearchVector:
+    """Search vector of fields (the same expression as in GIN indexes of
+    models, text search configuration from SEARCH_CONFIG setting)."""
+    return SearchVector(*fields, config=settings.SEARCH_CONFIG)
+
+
+def search_fields(model) -> list:
+    """Text fields searched in model (fields of search vector of GIN index
+    declared in Meta.indexes of model)."""
+    for index in model._meta.indexes:
+        if isinstance(index, GinIndex):
+            return [expression.name
+                    for expression in index.expressions[0].get_source_expressions()]
+    raise ValueError("Model %s has no search index" % model._meta.label)
+
+
+def parse_query(query) -> list:
+    """Returns words of search query as (word, excluded) pairs.
+
+    Query syntax: words separated by spaces, all of them must be found
+    (beginning of word is enough), words preceded by "-" must not be found,
+    e.g. "kredyt -samochodowy"."""
+    words = []
+    for term in query.split():
+        excluded = term.startswith("-")
+        words.extend((word, excluded) for word in re.findall(r"\w+", term))
+    return words
+
+
+def search(queryset, query, number_field=None, ordered_by_user=False):
+    """Returns records of queryset matching search query (see parse_query)
+    in text fields of model (see search_fields).
+
+    Number (e.g. "1500" or "1500,50") matches records with value of
+    number_field greater than or equal to it (if number_field is given).
+    Words are matched by full text search of PostgreSQL (using GIN index of
+    model). The most relevant records come first, unless user selected
+    sorting of records (ordered_by_user) - then ordering of queryset is kept
+    and relevance only orders records equal in it."""
+    query = query.strip()
+    if number_field and NUMBER.fullmatch(query):
+        return queryset.filter(**{f"{number_field}__gte": float(query.replace(",", "."))})
+
+    words = parse_query(query)
+    if not words:
+        return queryset.none()
+    vector = search_vector(search_fields(queryset.model))
+    search_query = SearchQuery(
+        " & ".join(f"{'!' if excluded else ''}{word}:*" for word, excluded in words),
+        search_type="raw", config=settings.SEARCH_CONFIG)
+    order = queryset.query.order_by
+    order = (*order, "-rank") if ordered_by_user else ("-rank", *order)
+    return (queryset.annotate(search=vector, rank=SearchRank(vector, search_query))
+            .filter(search=search_query)
+            .order_by(*order))
@@ -0,0 +1,94 @@
+from django.apps import apps
+from django.db import transaction
+from django.urls import reverse
+from django.utils.translation import gettext_lazy as _
+
+from .models import SearchEntry
+
+# Models in global search index (model label: kind of data, title field,
+# text fields, date field, address of page of record)
+INDEXED = {
+    "payment.Payment": (
+        _("Płatność"), "name", ("payment_type", "payment_frequency", "notes"),
+        "start_of_agreement",
+        lambda payment: reverse("payment:single-payment", args=[payment.id])),
+    "credit.Credit": (
+        _("Kredyt"), "name", ("type", "credit_number", "notes"), "date_of_agreement",
+        lambda credit: reverse("credit:single-credit", args=[credit.id])),
+    "connection.Counterparty": (
+        _("Kontrahent"), "name", ("address", "email", "client_number", "notes"), None,
+        lambda counterparty: reverse("connection:single-counterparty",
+                                     args=[counterparty.id])),
+    "connection.Attachment": (
+        _("Załącznik"), "attachment_name", ("file_info",), "file_date",
+        lambda attachment: reverse("connection:attachments")),
+    "trip.Trip": (
+        _("Wyjazd"), "name", ("type", "destination", "participants", "notes"), "start_date",
+        lambda trip: reverse("trip:single-trip", args=[trip.id])),
+    "renovation.Renovation": (
+        _("Remont"), "name", ("description",), "start_date",
+        lambda renovation: reverse("renovation:single-renovation", args=[renovation.id])),
+    "planner.ExpenseItem": (
+        _("Wydatek"), "name", ("description",), "purchase_date",
+        lambda item: reverse("planner:single-expense-list", args=[item.expense_list_id])),
+    "planner.ToDoItem": (
+        _("Zadanie"), "name", ("description", "notes"), "due_date",
+        lambda item: reverse("planner:single-todo-list", args=[item.todo_list_id])),
+    "medical.Medicine": (
+        _("Lek"), "drug_name_and_dose", ("disease", "notes"), "start_date",
+        lambda medicine: reverse("medical:single-medicine", args=[medicine.id])),
+    "medical.MedicalVisit": (
+        _("Wizyta lekarska"), "specialization", ("doctor", "visit_location", "notes"),
+        "visit_date",
+        lambda visit: reverse("medical:single-visit", args=[visit.id])),
+    "medical.HealthTestResult": (
+        _("Wynik badania"), "name", ("test_result", "disease", "notes"), "test_date",
+        lambda result: reverse("medical:single-test-result", args=[result.id])),
+}
+
+
+def indexed_models() -> list:
+    return [apps.get_model(label) for label in INDEXED]
+
+
+def kind(label) -> str:
+    """Kind of data of entries of model (e.g. "Kredyt")."""
+    return INDEXED[label][0]
+
+
+def entry_values(instance) -> dict:
+    _kind, title_field, text_fields, date_field, url = INDEXED[instance._meta.label]
+    return {
+        "user_id": instance.user_id,
+        "title": getattr(instance, title_field),
+        "text": " ".join(str(getattr(instance, field)) for field in text_fields
+                         if getattr(instance, field)),
+        "date": getattr(instance, date_field) if date_field else None,
+        "url": url(instance),
+    }
+
+
+def update_entry(instance) -> None:
+    SearchEntry.objects.update_or_create(
+        model=instance._meta.label, object_id=instance.pk,
+        defaults=entry_values(instance))
+
+
+def delete_entry(instance) -> None:
+    SearchEntry.objects.filter(model=instance._meta.label, object_id=instance.pk).delete()
+
+
+def rebuild_index(user=None) -> int:
+    """Replaces entries (of given user or all users) with entries of all
+    indexed records. Returns number of entries."""
+    new_entries = []
+    for model in indexed_models():
+        records = model.objects.all() if user is None else model.objects.filter(user=user)
+        new_entries.extend(
+            SearchEntry(model=model._meta.label, object_id=record.pk, **entry_values(record))
+            for record in records.iterator())
+    entries = SearchEntry.objects.all() if user is None else SearchEntry.objects.filter(user=user)
+    with transaction.atomic():
+        entries.delete()
+        SearchEntry.objects.bulk_create(new_entries, batch_size=1000)
+    return len(new_entries)
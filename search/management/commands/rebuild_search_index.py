@@ -0,0 +1,23 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from search.index import rebuild_index
+
+
+class Command(BaseCommand):
+    help = ("Rebuilds global search index from all indexed records (e.g. after "
+            "creating search index table or after bulk changes of data, which "
+            "do not send signals updating the index).")
+
+    def add_arguments(self, parser):
+        parser.add_argument("--user", help="Email of user whose entries are rebuilt.")
+
+    def handle(self, *args, **options):
+        user = None
+        if options["user"]:
+            try:
+                user = get_user_model().objects.get(email=options["user"])
+            except get_user_model().DoesNotExist:
+                raise CommandError(f"User {options['user']} does not exist.")
+        entries = rebuild_index(user)
+        self.stdout.write(f"Search index rebuilt: {entries} entries.")
@@ -0,0 +1,43 @@
+import uuid
+
+from django.conf import settings
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVector
+from django.db import models
+from django.utils.translation import gettext_lazy as _
+
+
+class SearchEntry(models.Model):
+    """Record of user data in global search index (one entry for each
+    indexed record, kept in sync by signals, see search/index.py)."""
+
+    id = models.UUIDField(
+        default=uuid.uuid4, unique=True, primary_key=True, editable=False
+    )
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        verbose_name=_("Użytkownik"),
+    )
+    model = models.CharField(_("Rodzaj danych"), max_length=100)
+    object_id = models.UUIDField(_("Identyfikator danych"))
+    title = models.CharField(_("Nazwa"), max_length=255)
+    text = models.TextField(_("Treść"), blank=True)
+    date = models.DateField(_("Data"), null=True, blank=True)
+    url = models.CharField(_("Adres strony"), max_length=255)
+    updated = models.DateField(_("Data aktualizacji"), auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["model", "object_id"], name="unique_search_entry"
+            )
+        ]
+        indexes = [
+            models.Index(fields=["user", "-date"], name="search_entry_user_date_idx"),
+            GinIndex(SearchVector("title", "text", config=settings.SEARCH_CONFIG),
+                     name="search_entry_search_idx"),
+        ]
+
+    def __str__(self):
+        return str(self.title)
@@ -0,0 +1,21 @@
+from django.db.models.signals import post_delete, post_save
+
+from .index import delete_entry, indexed_models, update_entry
+
+
+def index_saved_record(sender, instance, **kwargs):
+    # Records loaded from fixtures are indexed by rebuild_search_index command
+    if kwargs.get("raw"):
+        return
+    update_entry(instance)
+
+
+def unindex_deleted_record(sender, instance, **kwargs):
+    if kwargs.get("raw"):
+        return
+    delete_entry(instance)
+
+
+for model in indexed_models():
+    post_save.connect(index_saved_record, sender=model)
+    post_delete.connect(unindex_deleted_record, sender=model)
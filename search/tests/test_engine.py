@@ -0,0 +1,148 @@
+import unittest
+
+from django.apps import apps
+from django.contrib.postgres.indexes import GinIndex
+from django.db import connection
+from django.test import TestCase
+from django.urls import reverse
+
+from credit.models import CreditTranche
+from payment.factories import PaymentFactory
+from payment.models import Payment
+from planner.factories import ExpenseItemFactory, ExpenseListFactory
+from planner.models import ExpenseItem
+from search.engine import parse_query, search, search_fields
+from user.factories import UserFactory
+
+
+class SearchEngineTests(TestCase):
+    """Test search engine shared by list views."""
+
+    def setUp(self):
+        self.user = UserFactory(
+            username="johndoe123", email="jd@example.com", password="testpass456")
+        self.rent = PaymentFactory(user=self.user, name="Czynsz za mieszkanie",
+                                   payment_type="Media", payment_value=1500)
+        self.internet = PaymentFactory(user=self.user, name="Internet domowy",
+                                       payment_type="Media", payment_value=80.5)
+        self.insurance = PaymentFactory(user=self.user, name="Ubezpieczenie mieszkania",
+                                        payment_type="Ubezpieczenie", payment_value=600)
+        self.payments = Payment.objects.filter(user=self.user).order_by("name")
+
+    def test_parse_query(self):
+        """Test if query is split into required and excluded words."""
+        self.assertEqual(parse_query("czynsz  -media"),
+                         [("czynsz", False), ("media", True)])
+        self.assertEqual(parse_query("e-mail (dom)"),
+                         [("e", False), ("mail", False), ("dom", False)])
+
+    def test_search_fields_of_search_index(self):
+        """Test if searched fields are read from GIN index of model."""
+        self.assertEqual(search_fields(Payment),
+                         ["name", "payment_type", "payment_frequency"])
+        self.assertEqual(search_fields(ExpenseItem), ["name", "description"])
+        with self.assertRaises(ValueError):
+            search_fields(CreditTranche)
+
+    def test_number_matches_records_with_greater_or_equal_value(self):
+        """Test if number matches values of number field (gte)."""
+        self.assertQuerySetEqual(
+            search(self.payments, "600", number_field="payment_value"),
+            [self.rent, self.insurance], ordered=False)
+        self.assertQuerySetEqual(
+            search(self.payments, "80,5", number_field="payment_value"),
+            [self.rent, self.internet, self.insurance], ordered=False)
+
+    def test_query_without_words_returns_no_records(self):
+        self.assertFalse(search(self.payments, " - ? ").exists())
+
+
+@unittest.skipUnless(connection.vendor == "postgresql",
+                     "full text search is used on PostgreSQL")
+class FullTextSearchTests(TestCase):
+    """Test full text search on PostgreSQL."""
+
+    def setUp(self):
+        self.user = UserFactory(
+            username="johndoe123", email="jd@example.com", password="testpass456")
+        self.other_user = UserFactory(
+            username="janedoe123", email="jane@example.com", password="testpass789")
+        self.rent = PaymentFactory(user=self.user, name="Czynsz za mieszkanie",
+                                   payment_type="Media")
+        self.internet = PaymentFactory(user=self.user, name="Internet domowy",
+                                       payment_type="Media")
+        self.insurance = PaymentFactory(user=self.user, name="Ubezpieczenie mieszkania",
+                                        payment_type="Ubezpieczenie")
+        self.flat = PaymentFactory(user=self.user, name="Mieszkanie - opłaty za mieszkanie",
+                                   payment_type="Czynsz")
+        PaymentFactory(user=self.other_user, name="Czynsz za mieszkanie")
+        self.payments = Payment.objects.filter(user=self.user).order_by("name")
+
+    def test_all_words_must_be_found(self):
+        """Test if records matching all words (in any searched field) are returned."""
+        self.assertQuerySetEqual(search(self.payments, "mieszkani"),
+                                 [self.rent, self.insurance, self.flat], ordered=False)
+        self.assertQuerySetEqual(search(self.payments, "MIESZKANIE media"), [self.rent])
+
+    def test_excluded_words_must_not_be_found(self):
+        """Test if records matching words preceded by "-" are excluded."""
+        self.assertQuerySetEqual(search(self.payments, "mieszkani -czynsz"),
+                                 [self.insurance])
+
+    def test_search_is_limited_to_queryset(self):
+        """Test if records of other users are not searched."""
+        self.assertQuerySetEqual(search(self.payments, "internet"), [self.internet])
+
+    def test_most_relevant_records_first(self):
+        """Test if records are ordered by relevance, then by ordering of
+        queryset."""
+        self.assertEqual(list(search(self.payments, "mieszkanie"))[0], self.flat)
+
+    def test_ordering_selected_by_user_kept(self):
+        """Test if ordering selected by user is not changed by relevance."""
+        searched = search(self.payments, "mieszkanie", ordered_by_user=True)
+        self.assertQuerySetEqual(searched, [self.rent, self.flat])
+
+    def test_payments_page_ordered_by_relevance(self):
+        """Test if list view orders search results by relevance unless
+        user selected sorting."""
+        self.client.force_login(self.user)
+        response = self.client.get(reverse("payment:payments"), {"q": "mieszkanie"})
+        self.assertEqual(list(response.context["payments"])[0], self.flat)
+        response = self.client.get(reverse("payment:payments"),
+                                   {"q": "mieszkanie", "sort_data": "name"})
+        self.assertQuerySetEqual(response.context["payments"], [self.rent, self.flat])
+
+    def test_single_expense_list_searches_only_items_of_list(self):
+        """Test if items of other lists of user are not searched."""
+        expense_list = ExpenseListFactory(user=self.user, name="Remont")
+        other_list = ExpenseListFactory(user=self.user, name="Wakacje")
+        paint = ExpenseItemFactory(user=self.user, expense_list=expense_list,
+                                   name="Farba", description="Biała do kuchni")
+        ExpenseItemFactory(user=self.user, expense_list=expense_list,
+                           name="Panele", description="Do salonu")
+        ExpenseItemFactory(user=self.user, expense_list=other_list,
+                           name="Farba", description="Do kuchni letniej")
+        self.client.force_login(self.user)
+        response = self.client.get(
+            reverse("planner:single-expense-list", args=[str(expense_list.id)]),
+            {"q": "kuchni"})
+        self.assertQuerySetEqual(response.context["expense_items_search"], [paint])
+
+    def test_search_indexes_created(self):
+        """Test if GIN indexes declared by searched models exist in database."""
+        with connection.cursor() as cursor:
+            for model in apps.get_models():
+                for index in model._meta.indexes:
+                    if isinstance(index, GinIndex):
+                        constraints = connection.introspection.get_constraints(
+                            cursor, model._meta.db_table)
+                        self.assertIn(index.name, constraints)
+
+    def test_search_uses_index(self):
+        """Test if searched text matches expression of GIN index."""
+        with connection.cursor() as cursor:
+            cursor.execute("SET enable_seqscan = off")
+        plan = search(Payment.objects.all(), "mieszk").explain()
+        self.assertIn("payment_search_idx", plan)
+        self.assertNotIn("Seq Scan", plan)
@@ -0,0 +1,85 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+
+from credit.factories import CreditFactory
+from credit.models import Credit
+from payment.factories import PaymentFactory
+from planner.factories import ToDoItemFactory, ToDoListFactory
+from search.index import rebuild_index
+from search.models import SearchEntry
+from user.factories import UserFactory
+
+
+class SearchIndexTests(TestCase):
+    """Test synchronization of global search index with indexed records."""
+
+    def setUp(self):
+        self.user = UserFactory(
+            username="johndoe123", email="jd@example.com", password="testpass456")
+        self.other_user = UserFactory(
+            username="janedoe123", email="jane@example.com", password="testpass789")
+
+    def test_entry_created_with_record(self):
+        credit = CreditFactory(user=self.user, name="Kredyt hipoteczny",
+                               credit_number="KH-1", notes="Mieszkanie w Gdańsku")
+        entry = SearchEntry.objects.get(model="credit.Credit", object_id=credit.id)
+        self.assertEqual(entry.user, self.user)
+        self.assertEqual(entry.title, "Kredyt hipoteczny")
+        self.assertIn("Mieszkanie w Gdańsku", entry.text)
+        self.assertIn("KH-1", entry.text)
+        self.assertEqual(entry.date, credit.date_of_agreement)
+        self.assertEqual(entry.url, f"/single-credit/{credit.id}/")
+
+    def test_entry_updated_with_record(self):
+        payment = PaymentFactory(user=self.user, name="Czynsz")
+        payment.name = "Czynsz za mieszkanie"
+        payment.save()
+        entries = SearchEntry.objects.filter(model="payment.Payment", object_id=payment.id)
+        self.assertEqual([entry.title for entry in entries], ["Czynsz za mieszkanie"])
+
+    def test_entry_deleted_with_record(self):
+        payment = PaymentFactory(user=self.user)
+        payment.delete()
+        self.assertFalse(SearchEntry.objects.filter(object_id=payment.id).exists())
+
+    def test_entries_of_items_deleted_with_list(self):
+        todo_list = ToDoListFactory(user=self.user)
+        item = ToDoItemFactory(user=self.user, todo_list=todo_list)
+        self.assertEqual(SearchEntry.objects.get(object_id=item.id).url,
+                         f"/single-todo-list/{todo_list.id}/")
+        todo_list.delete()
+        self.assertFalse(SearchEntry.objects.filter(object_id=item.id).exists())
+
+    def test_records_loaded_from_fixtures_not_indexed(self):
+        """Test if raw saves (loaddata) are skipped - index is rebuilt by
+        rebuild_search_index command."""
+        payment = PaymentFactory.build(user=self.user)
+        payment.save_base(raw=True)
+        self.assertFalse(SearchEntry.objects.filter(object_id=payment.id).exists())
+        rebuild_index(self.user)
+        self.assertTrue(SearchEntry.objects.filter(object_id=payment.id).exists())
+
+    def test_rebuild_index(self):
+        """Test if entries of records changed without signals are rebuilt."""
+        credit = CreditFactory(user=self.user, name="Kredyt")
+        PaymentFactory(user=self.other_user)
+        Credit.objects.filter(id=credit.id).update(name="Kredyt gotówkowy")
+        PaymentFactory(user=self.user, name="Internet")
+        SearchEntry.objects.filter(model="payment.Payment", user=self.user).delete()
+
+        self.assertEqual(rebuild_index(self.user), 2)
+        self.assertEqual(
+            sorted(SearchEntry.objects.filter(user=self.user).values_list("title", flat=True)),
+            ["Internet", "Kredyt gotówkowy"])
+        self.assertEqual(SearchEntry.objects.filter(user=self.other_user).count(), 1)
+
+    def test_rebuild_search_index_command(self):
+        CreditFactory(user=self.user)
+        PaymentFactory(user=self.other_user)
+        SearchEntry.objects.all().delete()
+        output = StringIO()
+        call_command("rebuild_search_index", stdout=output)
+        self.assertEqual(SearchEntry.objects.count(), 2)
+        self.assertIn("2 entries", output.getvalue())
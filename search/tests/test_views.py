@@ -0,0 +1,67 @@
+import unittest
+
+from django.db import connection
+from django.test import TestCase
+from django.urls import reverse
+
+from credit.factories import CreditFactory
+from medical.factories import MedicineFactory
+from payment.factories import PaymentFactory
+from user.factories import UserFactory
+
+full_text_search = unittest.skipUnless(connection.vendor == "postgresql",
+                                       "full text search is used on PostgreSQL")
+
+
+class GlobalSearchViewTests(TestCase):
+    """Test global search through all data of user."""
+
+    def setUp(self):
+        self.user = UserFactory(
+            username="johndoe123", email="jd@example.com", password="testpass456")
+        self.other_user = UserFactory(
+            username="janedoe123", email="jane@example.com", password="testpass789")
+        self.credit = CreditFactory(user=self.user, name="Kredyt na mieszkanie")
+        self.payment = PaymentFactory(user=self.user, name="Czynsz za mieszkanie")
+        self.medicine = MedicineFactory(user=self.user, drug_name_and_dose="Apap",
+                                        disease="Ból głowy")
+        PaymentFactory(user=self.other_user, name="Czynsz za mieszkanie")
+
+    def test_login_required(self):
+        response = self.client.get(reverse("search:search"), {"q": "mieszkanie"})
+        self.assertEqual(response.status_code, 302)
+        self.assertIn("login", response.url)
+
+    @full_text_search
+    def test_search_in_all_modules_of_user(self):
+        self.client.force_login(self.user)
+        response = self.client.get(reverse("search:search"), {"q": "mieszkani"})
+        self.assertEqual(response.status_code, 200)
+        self.assertTemplateUsed(response, "search/search.html")
+        entries = list(response.context["page_obj"])
+        self.assertEqual(sorted(entry.object_id for entry in entries),
+                         sorted([self.credit.id, self.payment.id]))
+        self.assertEqual(sorted(entry.kind for entry in entries), ["Kredyt", "Płatność"])
+        self.assertContains(response, f"/single-credit/{self.credit.id}/")
+
+    @full_text_search
+    def test_search_in_text_of_records(self):
+        self.client.force_login(self.user)
+        response = self.client.get(reverse("search:search"), {"q": "głowy"})
+        self.assertEqual([entry.object_id for entry in response.context["page_obj"]],
+                         [self.medicine.id])
+
+    @full_text_search
+    def test_search_in_one_query(self):
+        """Test if number of queries does not depend on number of modules."""
+        self.client.force_login(self.user)
+        self.client.get(reverse("search:search"), {"q": "mieszkanie"})
+        with self.assertNumQueries(4):
+            # session, user, count of results, page of results
+            self.client.get(reverse("search:search"), {"q": "mieszkanie"})
+
+    def test_empty_query(self):
+        self.client.force_login(self.user)
+        response = self.client.get(reverse("search:search"))
+        self.assertEqual(len(response.context["page_obj"]), 0)
+        self.assertNotContains(response, "Szukana fraza")
@@ -0,0 +1,32 @@
+from django.contrib.auth.decorators import login_required
+from django.core.paginator import Paginator
+from django.shortcuts import render
+
+from .engine import search
+from .index import kind
+from .models import SearchEntry
+
+
+@login_required(login_url="login")
+def global_search(request):
+    # Search through all data of user (one query of global search index,
+    # see search/index.py) - query syntax of list views (see search/engine.py)
+    search_query = request.GET.get("q")
+    if search_query:
+        entries = search(SearchEntry.objects.filter(user=request.user).order_by(
+            "-date", "title"), search_query)
+    else:
+        entries = SearchEntry.objects.none()
+
+    page_number = request.GET.get("page")
+    paginator = Paginator(entries, per_page=20)
+    page_object = paginator.get_page(page_number)
+    for entry in page_object:
+        entry.kind = kind(entry.model)
+
+    context = {
+        "paginator": paginator,
+        "page_obj": page_object,
+        "search_query": search_query,
+    }
+    return render(request, "search/search.html", context)
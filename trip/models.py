@@ -3,6 +3,8 @@ import uuid
 
 from django.conf import settings
 from django.contrib.postgres.fields import ArrayField
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVector
 from django.core.exceptions import ValidationError
 from django.core.validators import MinValueValidator
 from django.db import models
@@ -101,6 +103,13 @@ class Trip(models.Model):
                 fields=["user", "name"], name="unique_trip_name"
             )
         ]
+        indexes = [
+            models.Index(fields=["user", "-updated"], name="trip_user_updated_idx"),
+            models.Index(fields=["user", "access_granted", "-updated"],
+                         name="trip_user_access_idx"),
+            GinIndex(SearchVector("name", "type", "destination", config=settings.SEARCH_CONFIG),
+                     name="trip_search_idx"),
+        ]
 
     @classmethod
     def field_names(cls) -> list:
@@ -4,12 +4,12 @@ from django.contrib import messages
 from django.contrib.auth import logout
 from django.contrib.auth.decorators import login_required
 from django.core.exceptions import ValidationError
-from django.db.models import Q
 from django.http import HttpResponse
 from django.shortcuts import redirect, render
 from django.utils.translation import gettext_lazy as _
 
 from connection.models import Attachment
+from search.engine import search
 from .forms import (TripForm, TripReportForm, TripCostForm,
                     TripPersonalChecklistForm, TripBasicChecklistForm,
                     TripAdvancedChecklistForm, TripAdditionalInfoForm)
@@ -43,16 +43,9 @@ def trips(request):
     # Searching engine - search through selected fields
     # If search engine is empty, queryset data is displayed in full
     search_query = request.GET.get("q")
-    if search_query and (search_query.isdigit() or search_query.isdecimal()):
-        search_query = float(search_query)
-    if isinstance(search_query, float):
-        trips = Trip.objects.filter(
-            user=request.user).filter(estimated_cost__gte=search_query).order_by(order)
-    elif search_query:
-        trips = Trip.objects.filter(
-            user=request.user).filter(Q(name__icontains=search_query) |
-                                      Q(type__icontains=search_query) |
-                                      Q(destination__icontains=search_query)).order_by(order)
+    if search_query:
+        trips = search(all_trips, search_query, number_field="estimated_cost",
+                       ordered_by_user="sort_data" in request.GET)
     else:
         trips = None
     if not trips:
@@ -179,9 +179,10 @@ class Profile(models.Model):
         _("Kraj zamieszkania"), max_length=100,
         null=True, blank=True
     )
+    # Indexed, as users who shared data with given user are looked up by it
     access_granted_to = models.EmailField(
         _("Adres email osoby z dostępem do danych"),
-        max_length=250, null=True, blank=True
+        max_length=250, null=True, blank=True, db_index=True
     )
     created = models.DateTimeField(_("Data dodania"), auto_now_add=True)
     updated = models.DateTimeField(_("Data aktualizacji"), auto_now=True)
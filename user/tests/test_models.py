@@ -4,6 +4,7 @@ import uuid
 
 from django.contrib.auth import get_user_model
 from django.core.exceptions import ValidationError
+from django.db import connection
 from django.db.utils import IntegrityError
 from django.test import TestCase
 from parameterized import parameterized
@@ -186,6 +187,17 @@ class ProfileModelTest(TestCase):
         self.assertEqual(field_label_created, "Data dodania")
         self.assertEqual(field_label_updated, "Data aktualizacji")
 
+    def test_access_granted_to_field_is_indexed(self):
+        """Test if access_granted_to field (users who shared data with given
+        user are looked up by it) has database index."""
+        column = Profile._meta.get_field("access_granted_to").column
+        with connection.cursor() as cursor:
+            constraints = connection.introspection.get_constraints(
+                cursor, Profile._meta.db_table)
+        self.assertTrue(any(
+            constraint["index"] and constraint["columns"] == [column]
+            for constraint in constraints.values()))
+
     def test_profile_id_is_uuid(self):
         """Test if id is represented as uuid."""
         profile = Profile.objects.get(username="johndoe123")